@@ -0,0 +1,86 @@
+"""Журнал баланса: transactions.balance_after, снимки balance_snapshots, запрет правок журнала.
+
+balance_after существующих записей заполняется нарастающим итогом по
+пользователю (в порядке id). Если итог журнала не совпадает с
+users.balance (начисления без транзакций), пользователю добавляется
+запись correction на разницу — после миграции журнал сходится с балансом.
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "b8c9d0e1f2a3"
+down_revision = "a7b8c9d0e1f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("transactions", sa.Column("balance_after", sa.Integer(), nullable=True))
+    op.execute(
+        """
+        UPDATE transactions
+        SET balance_after = running.total
+        FROM (
+            SELECT id, SUM(amount) OVER (PARTITION BY user_id ORDER BY id) AS total
+            FROM transactions
+        ) AS running
+        WHERE transactions.id = running.id
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO transactions (user_id, type, amount, balance_after, description, created_at)
+        SELECT users.id, 'correction', users.balance - COALESCE(ledger.total, 0), users.balance,
+               'Выравнивание журнала с балансом', now() AT TIME ZONE 'utc'
+        FROM users
+        LEFT JOIN (
+            SELECT user_id, SUM(amount) AS total FROM transactions GROUP BY user_id
+        ) AS ledger ON ledger.user_id = users.id
+        WHERE users.balance <> COALESCE(ledger.total, 0)
+        """
+    )
+    op.alter_column("transactions", "balance_after", nullable=False)
+
+    # Журнал только дополняется — и для кода в обход ORM
+    op.execute(
+        """
+        CREATE FUNCTION transactions_append_only() RETURNS trigger AS $$
+        BEGIN
+            RAISE EXCEPTION 'transactions: журнал только дополняется';
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER transactions_append_only
+        BEFORE UPDATE OR DELETE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_append_only()
+        """
+    )
+
+    op.create_table(
+        "balance_snapshots",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("period", sa.Date(), nullable=False),
+        sa.Column("balance", sa.Integer(), nullable=False),
+        sa.Column("last_transaction_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.ForeignKeyConstraint(["last_transaction_id"], ["transactions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "period", name="uq_balance_snapshot_user_period"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("balance_snapshots")
+    op.execute("DROP TRIGGER transactions_append_only ON transactions")
+    op.execute("DROP FUNCTION transactions_append_only()")
+    op.drop_column("transactions", "balance_after")
@@ -0,0 +1,31 @@
+"""Таблица исходящих доменных событий event_outbox.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c9d0e1f2a3b4"
+down_revision = "b8c9d0e1f2a3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.String(50), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_event_outbox_occurred_at", "event_outbox", ["occurred_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_outbox_occurred_at", table_name="event_outbox")
+    op.drop_table("event_outbox")
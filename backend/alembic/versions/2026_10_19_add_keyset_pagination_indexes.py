@@ -0,0 +1,27 @@
+"""Индексы для курсорной пагинации: история транзакций, записи, ученики.
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+revision = "a7b8c9d0e1f2"
+down_revision = "f6a7b8c9d0e1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transactions_user_created_id", "transactions", ["user_id", "created_at", "id"]
+    )
+    op.create_index("ix_bookings_user_booked_id", "bookings", ["user_id", "booked_at", "id"])
+    op.create_index("ix_users_created_id", "users", ["created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_created_id", table_name="users")
+    op.drop_index("ix_bookings_user_booked_id", table_name="bookings")
+    op.drop_index("ix_transactions_user_created_id", table_name="transactions")
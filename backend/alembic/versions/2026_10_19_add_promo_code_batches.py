@@ -0,0 +1,54 @@
+"""Добавляем партии одноразовых промокодов: таблицы promo_code_batches и promo_codes.
+
+Revision ID: c3d4e5f6a7b8
+Revises: b2c3d4e5f6a7
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "c3d4e5f6a7b8"
+down_revision = "b2c3d4e5f6a7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "promo_code_batches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("promotion_id", sa.Integer(), nullable=False),
+        sa.Column("prefix", sa.String(12), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["promotion_id"], ["promotions.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_promo_code_batches_promotion_id", "promo_code_batches", ["promotion_id"])
+
+    op.create_table(
+        "promo_codes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("batch_id", sa.Integer(), nullable=False),
+        sa.Column("promotion_id", sa.Integer(), nullable=False),
+        sa.Column("code", sa.String(32), nullable=False),
+        sa.Column("used_at", sa.DateTime(), nullable=True),
+        sa.Column("used_by_user_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["batch_id"], ["promo_code_batches.id"]),
+        sa.ForeignKeyConstraint(["promotion_id"], ["promotions.id"]),
+        sa.ForeignKeyConstraint(["used_by_user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_promo_codes_code", "promo_codes", ["code"], unique=True)
+    op.create_index("ix_promo_codes_batch_id", "promo_codes", ["batch_id"])
+    op.create_index("ix_promo_codes_promotion_id", "promo_codes", ["promotion_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_promo_codes_promotion_id", table_name="promo_codes")
+    op.drop_index("ix_promo_codes_batch_id", table_name="promo_codes")
+    op.drop_index("ix_promo_codes_code", table_name="promo_codes")
+    op.drop_table("promo_codes")
+    op.drop_index("ix_promo_code_batches_promotion_id", table_name="promo_code_batches")
+    op.drop_table("promo_code_batches")
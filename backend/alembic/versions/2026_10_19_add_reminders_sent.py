@@ -0,0 +1,35 @@
+"""Добавляем таблицу дедупликации напоминаний reminders_sent и индекс lessons(date, start_time).
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "d4e5f6a7b8c9"
+down_revision = "c3d4e5f6a7b8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "reminders_sent",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(30), nullable=False),
+        sa.Column("ref_id", sa.Integer(), nullable=False),
+        sa.Column("ref_date", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("sent_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("kind", "ref_id", "ref_date", name="uq_reminder_kind_ref"),
+    )
+    op.create_index("ix_lessons_date_start_time", "lessons", ["date", "start_time"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_lessons_date_start_time", table_name="lessons")
+    op.drop_table("reminders_sent")
@@ -0,0 +1,35 @@
+"""Добавляем флаг доступности пользователя в Telegram (users.telegram_reachable)
+и частичный индекс по недоступным пользователям.
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "f6a7b8c9d0e1"
+down_revision = "e5f6a7b8c9d0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "users",
+        sa.Column("telegram_reachable", sa.Boolean(), server_default=sa.true(), nullable=False),
+    )
+    op.add_column("users", sa.Column("telegram_unreachable_at", sa.DateTime(), nullable=True))
+    op.create_index(
+        "ix_users_telegram_unreachable",
+        "users",
+        ["telegram_id"],
+        postgresql_where=sa.text("telegram_reachable = false"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_telegram_unreachable", table_name="users")
+    op.drop_column("users", "telegram_unreachable_at")
+    op.drop_column("users", "telegram_reachable")
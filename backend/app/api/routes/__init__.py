@@ -8,9 +8,12 @@ from fastapi import APIRouter
 from app.api.routes.admin import router as admin_router
 from app.api.routes.auth import router as auth_router
 from app.api.routes.bookings import router as bookings_router
+from app.api.routes.bootstrap import router as bootstrap_router
 from app.api.routes.courses import router as courses_router
 from app.api.routes.directions import router as directions_router
+from app.api.routes.health import router as health_router
 from app.api.routes.lessons import router as lessons_router
+from app.api.routes.metrics import router as metrics_router
 from app.api.routes.payments import router as payments_router
 from app.api.routes.promos import router as promos_router
 from app.api.routes.teachers import router as teachers_router
@@ -20,7 +23,10 @@ from app.api.routes.webhook import router as webhook_router
 # Главный роутер API — объединяет все модули
 api_router = APIRouter()
 
+api_router.include_router(health_router)
+api_router.include_router(metrics_router)
 api_router.include_router(auth_router)
+api_router.include_router(bootstrap_router)
 api_router.include_router(lessons_router)
 api_router.include_router(bookings_router)
 api_router.include_router(directions_router)
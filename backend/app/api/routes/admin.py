@@ -8,28 +8,34 @@
 - Управление учениками
 - Отметка посещений
 - Деактивация просроченных подписок
+- Журнал баланса: баланс на дату, сверка
 - Рассылка
+- Расписание периодических задач
 """
 
+import asyncio
 import logging
+from dataclasses import asdict
 from datetime import date, datetime, time, timedelta, timezone
+from zoneinfo import ZoneInfo
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.core.dependencies import get_current_admin
-
-# Rate limiter для admin write-эндпоинтов (30 запросов/минуту)
-limiter = Limiter(key_func=get_remote_address)
-from app.database import get_db
+from app.core.pagination import check_cursor_offset, next_cursor, paginate
+from app.core.rate_limit import limiter
+from app.core.responses import model_response
+from app.database import get_db, get_read_db, get_read_session_factory
 from app.models.booking import Booking
 from app.models.direction import Direction
 from app.models.lesson import Lesson
+from app.models.periodic_task import PeriodicTaskConfig
 from app.models.promotion import Promotion
 from app.models.special_course import SpecialCourse
 from app.models.subscription import Subscription, SubscriptionPlan
@@ -37,8 +43,13 @@ from app.models.teacher import Teacher, teacher_direction
 from app.models.transaction import Transaction
 from app.models.user import User
 from app.schemas.user import UserResponse
+from app.services.promo_codes import MAX_BATCH_SIZE, create_code_batch, iter_codes_csv
 from app.services.subscription_deactivation import deactivate_expired_subscriptions
-from app.services.notification import notify_lesson_cancelled
+from app.services.bot_schedule import invalidate_day_schedule
+from app.services.live_updates import publish_lesson_update
+from app.services.catalog_cache import bump_catalog_version
+from app.services.domain_events import record_event
+from app.services.ledger import balance_at, post_entry, reconcile_ledger
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +113,7 @@ class BroadcastRequest(BaseModel):
     message: str
     target: str = "all"  # all / active_subs / by_direction
     direction_id: int | None = None  # обязателен при target="by_direction"
-    schedule_at: str | None = None  # ISO datetime для отложенной отправки (пока не реализовано)
+    schedule_at: str | None = None  # ISO datetime для отложенной отправки (время студии)
 
 
 class BroadcastResponse(BaseModel):
@@ -244,6 +255,12 @@ class PromotionUpdateRequest(BaseModel):
     is_active: bool | None = None
 
 
+class PromoCodeBatchCreateRequest(BaseModel):
+    """Запрос на выпуск партии одноразовых промокодов."""
+    count: int
+    prefix: str = ""
+
+
 # ---------- Схемы: Тарифные планы ----------
 
 class SubscriptionPlanCreateRequest(BaseModel):
@@ -270,11 +287,18 @@ class SubscriptionPlanUpdateRequest(BaseModel):
     sort_order: int | None = None
 
 
+class PeriodicTaskUpdateRequest(BaseModel):
+    """Запрос на изменение расписания периодической задачи (все поля опциональны)."""
+    crontab: str | None = None  # "минута час день месяц день_недели"
+    kwargs: dict[str, int] | None = None  # например {"window_minutes": 90}
+    enabled: bool | None = None
+
+
 # ---------- Эндпоинты ----------
 
 @router.get("/dashboard", response_model=DashboardResponse)
 async def get_dashboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _admin: User = Depends(get_current_admin),
 ) -> DashboardResponse:
     """
@@ -375,6 +399,8 @@ async def create_lesson(
     )
     db.add(lesson)
     await db.commit()
+    await invalidate_day_schedule(lesson.date, lessons_changed=True)
+    await publish_lesson_update(db, lesson)
 
     return {
         "id": lesson.id,
@@ -407,6 +433,9 @@ async def update_lesson(
             detail="Занятие не найдено",
         )
 
+    # Дата до изменения — кеш расписания сбрасываем и для неё
+    previous_date = lesson.date
+
     # Обновляем только переданные поля
     if body.direction_id is not None:
         lesson.direction_id = body.direction_id
@@ -435,6 +464,8 @@ async def update_lesson(
         lesson.level = body.level
 
     await db.commit()
+    await invalidate_day_schedule(previous_date, lesson.date, lessons_changed=True)
+    await publish_lesson_update(db, lesson, previous_date)
 
     return {"id": lesson.id, "message": "Занятие обновлено"}
 
@@ -456,7 +487,7 @@ async def cancel_lesson(
     result = await db.execute(
         select(Lesson)
         .where(Lesson.id == lesson_id)
-        .options(selectinload(Lesson.bookings))
+        .options(selectinload(Lesson.bookings).selectinload(Booking.user))
     )
     lesson = result.scalar_one_or_none()
 
@@ -478,67 +509,64 @@ async def cancel_lesson(
     lesson.cancel_reason = reason
 
     # Отменяем все активные бронирования и возвращаем занятия на баланс
-    refunded_count = 0
+    refunded: list[User] = []
     for booking in lesson.bookings:
         if booking.status == "active":
             booking.status = "cancelled"
             booking.cancelled_at = datetime.now(timezone.utc)
 
             # Возвращаем занятие на баланс пользователя
-            user_result = await db.execute(
-                select(User).where(User.id == booking.user_id)
-            )
-            booked_user = user_result.scalar_one_or_none()
+            # (пользователи загружены вместе с бронированиями одним запросом)
+            booked_user = booking.user
             if booked_user:
-                booked_user.balance += 1
-
-                # Создаём транзакцию возврата
-                transaction = Transaction(
-                    user_id=booked_user.id,
-                    type="refund",
-                    amount=1,
-                    description=f"Возврат за отменённое занятие: {reason}",
-                    booking_id=booking.id,
+                await post_entry(
+                    db,
+                    booked_user,
+                    "refund",
+                    1,
+                    f"Возврат за отменённое занятие: {reason}",
+                    booking=booking,
                 )
-                db.add(transaction)
-                refunded_count += 1
+                refunded.append(booked_user)
+
+    # Уведомления записанным — потребитель события после commit
+    record_event(
+        db,
+        "lesson.cancelled",
+        lesson_id=lesson.id,
+        lesson_date=lesson.date.isoformat(),
+        start_time=lesson.start_time.strftime("%H:%M"),
+        reason=reason,
+        user_ids=[u.id for u in refunded],
+        telegram_ids=[u.telegram_id for u in refunded],
+    )
 
     await db.commit()
-
-    # Уведомляем пользователей об отмене занятия через Telegram-бота
-    lesson_info = f"{lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}"
-    for booking in lesson.bookings:
-        if booking.status == "cancelled":
-            user_result = await db.execute(
-                select(User).where(User.id == booking.user_id)
-            )
-            booked_user = user_result.scalar_one_or_none()
-            if booked_user:
-                await notify_lesson_cancelled(
-                    user_telegram_id=booked_user.telegram_id,
-                    lesson_info=lesson_info,
-                    reason=reason,
-                )
+    await invalidate_day_schedule(lesson.date, lessons_changed=True)
+    await publish_lesson_update(db, lesson)
 
     return {
         "id": lesson.id,
         "message": "Занятие отменено",
-        "refunded_bookings": refunded_count,
+        "refunded_bookings": len(refunded),
     }
 
 
 @router.get("/students", response_model=list[UserResponse])
 async def get_students(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _admin: User = Depends(get_current_admin),
     search: str | None = Query(None, description="Поиск по имени, фамилии или username"),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Смещение (устаревшее — используйте cursor)"),
     limit: int = Query(20, ge=1, le=100),
-) -> list[UserResponse]:
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+) -> Response:
     """
     Получить список учеников с поиском и пагинацией.
     Поиск работает по имени, фамилии и username (регистронезависимый).
+    Курсор следующей страницы — в заголовке X-Next-Cursor.
     """
+    check_cursor_offset(cursor, offset)
     query = select(User).where(User.is_admin == False)  # noqa: E712
 
     # Фильтр поиска
@@ -550,17 +578,15 @@ async def get_students(
             | (func.lower(User.username).like(search_pattern))
         )
 
-    query = query.order_by(User.created_at.desc()).offset(offset).limit(limit)
-
-    result = await db.execute(query)
-    users = result.scalars().all()
-    return [UserResponse.model_validate(u) for u in users]
+    result = await db.execute(paginate(query, User.created_at, User.id, limit, cursor, offset))
+    users, headers = next_cursor(result.scalars().all(), limit, lambda u: (u.created_at, u.id))
+    return model_response(list[UserResponse], users, headers=headers)
 
 
 @router.get("/students/{student_id}", response_model=StudentDetailResponse)
 async def get_student_detail(
     student_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _admin: User = Depends(get_current_admin),
 ) -> StudentDetailResponse:
     """
@@ -628,24 +654,22 @@ async def adjust_balance(
             detail="Ученик не найден",
         )
 
-    # Корректируем баланс
-    student.balance += body.amount
-
     # Не допускаем отрицательный баланс
-    if student.balance < 0:
+    # (параллельные списания дополнительно проверяет post_entry)
+    if student.balance + body.amount < 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Баланс не может быть отрицательным",
         )
 
-    # Создаём транзакцию корректировки
-    transaction = Transaction(
-        user_id=student.id,
-        type="manual",
-        amount=body.amount,
-        description=f"Корректировка администратором ({admin.first_name}): {body.reason}",
+    # Корректируем баланс и пишем транзакцию корректировки
+    await post_entry(
+        db,
+        student,
+        "manual",
+        body.amount,
+        f"Корректировка администратором ({admin.first_name}): {body.reason}",
     )
-    db.add(transaction)
 
     await db.commit()
 
@@ -657,6 +681,23 @@ async def adjust_balance(
     }
 
 
+@router.get("/students/{student_id}/balance-at")
+async def get_balance_at(
+    student_id: int,
+    at: datetime = Query(..., description="Момент времени (без часового пояса — UTC)"),
+    db: AsyncSession = Depends(get_read_db),
+    _admin: User = Depends(get_current_admin),
+) -> dict:
+    """Баланс ученика на заданный момент — по журналу транзакций."""
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc).replace(tzinfo=None)
+    return {
+        "student_id": student_id,
+        "at": at.isoformat(),
+        "balance": await balance_at(db, student_id, at),
+    }
+
+
 @router.post("/bookings/{booking_id}/attend")
 @limiter.limit("30/minute")
 async def mark_attendance(
@@ -688,6 +729,12 @@ async def mark_attendance(
 
     await db.commit()
 
+    # Посещённая запись больше не активна — меняется заполненность занятия
+    lesson = await db.get(Lesson, booking.lesson_id)
+    if lesson is not None:
+        await invalidate_day_schedule(lesson.date, lessons_changed=True)
+        await publish_lesson_update(db, lesson)
+
     return {
         "booking_id": booking.id,
         "status": "attended",
@@ -704,15 +751,16 @@ async def send_broadcast(
     _admin: User = Depends(get_current_admin),
 ) -> BroadcastResponse:
     """
-    Отправить рассылку сообщения пользователям через Telegram Bot.
+    Поставить рассылку сообщения пользователям в очередь bulk.
+
+    Сообщения отправляет Celery-воркер пачками; schedule_at — время
+    отложенной отправки (в часовом поясе студии, если не указан).
 
     Поддерживаемые target:
     - all: все пользователи
     - active_subs: пользователи с балансом > 0
     - by_direction: пользователи с записями на указанное направление
     """
-    from app.core.bot import bot as tg_bot
-
     # Валидация: target=by_direction требует direction_id
     if body.target == "by_direction" and body.direction_id is None:
         raise HTTPException(
@@ -720,15 +768,28 @@ async def send_broadcast(
             detail="Для рассылки по направлению необходимо указать direction_id",
         )
 
-    # Собираем список telegram_id в зависимости от target
+    # Отложенная отправка: время в часовом поясе студии
+    eta = None
+    if body.schedule_at:
+        try:
+            eta = datetime.fromisoformat(body.schedule_at)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Некорректный формат schedule_at, ожидается ISO datetime",
+            )
+        if eta.tzinfo is None:
+            eta = eta.replace(tzinfo=ZoneInfo(settings.STUDIO_TIMEZONE))
+
+    # Собираем список telegram_id в зависимости от target;
+    # пользователи, заблокировавшие бота, исключаются
+    recipients = select(User.telegram_id).where(User.telegram_reachable == True)  # noqa: E712
     if body.target == "active_subs":
-        result = await db.execute(
-            select(User.telegram_id).where(User.balance > 0)
-        )
+        result = await db.execute(recipients.where(User.balance > 0))
     elif body.target == "by_direction":
         # Пользователи, у которых есть бронирования на занятия этого направления
         result = await db.execute(
-            select(User.telegram_id)
+            recipients
             .distinct()
             .join(Booking, Booking.user_id == User.id)
             .join(Lesson, Booking.lesson_id == Lesson.id)
@@ -736,32 +797,41 @@ async def send_broadcast(
         )
     else:
         # all: все зарегистрированные пользователи
-        result = await db.execute(select(User.telegram_id))
+        result = await db.execute(recipients)
 
     telegram_ids = [row[0] for row in result.all()]
     total_users = len(telegram_ids)
 
-    # TODO: schedule_at — отложенная отправка (Celery task)
-    if body.schedule_at:
-        logger.info("Запланированная рассылка на %s (пока отправляем сразу)", body.schedule_at)
+    # Рассылка уходит в очередь bulk пачками — не занимает воркер API
+    # и не задерживает точечные уведомления в очереди notifications.
+    # Celery импортируется здесь, а не на уровне модуля: он нужен только
+    # для рассылки и расписания и не должен замедлять холодный старт.
+    if telegram_ids:
+        from celery import group
+        from kombu.exceptions import OperationalError
 
-    # Отправляем сообщение каждому пользователю
-    sent = 0
-    failed = 0
-    for tg_id in telegram_ids:
+        from celery_app.tasks.bulk import BROADCAST_CHUNK_SIZE, send_broadcast_batch
+
+        batches = group(
+            send_broadcast_batch.s(telegram_ids[start:start + BROADCAST_CHUNK_SIZE], body.message)
+            for start in range(0, total_users, BROADCAST_CHUNK_SIZE)
+        )
+        # Публикация в брокер синхронная — в пуле потоков, не блокируя event loop
         try:
-            await tg_bot.send_message(chat_id=tg_id, text=body.message)
-            sent += 1
-        except Exception:
-            logger.warning("Не удалось отправить сообщение пользователю tg_id=%s", tg_id, exc_info=True)
-            failed += 1
+            await asyncio.to_thread(batches.apply_async, eta=eta)
+        except OperationalError:
+            logger.exception("Брокер Celery недоступен, рассылка не поставлена")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Очередь рассылок недоступна, попробуйте позже",
+            )
 
     return BroadcastResponse(
-        status="completed",
+        status="scheduled" if eta else "queued",
         target=body.target,
         total_users=total_users,
-        sent=sent,
-        failed=failed,
+        sent=0,
+        failed=0,
         message_preview=body.message[:100],
     )
 
@@ -809,6 +879,7 @@ async def create_direction(
     )
     db.add(direction)
     await db.commit()
+    await bump_catalog_version("directions")
 
     return {
         "id": direction.id,
@@ -856,6 +927,7 @@ async def update_direction(
         setattr(direction, field, value)
 
     await db.commit()
+    await bump_catalog_version("directions")
 
     return {"id": direction.id, "message": "Направление обновлено"}
 
@@ -883,6 +955,7 @@ async def delete_direction(
 
     direction.is_active = False
     await db.commit()
+    await bump_catalog_version("directions")
 
     return {"id": direction.id, "message": "Направление деактивировано"}
 
@@ -941,6 +1014,7 @@ async def create_teacher(
 
     db.add(teacher)
     await db.commit()
+    await bump_catalog_version("teachers")
 
     return {
         "id": teacher.id,
@@ -1006,6 +1080,7 @@ async def update_teacher(
         teacher.directions = directions
 
     await db.commit()
+    await bump_catalog_version("teachers")
 
     return {"id": teacher.id, "message": "Преподаватель обновлён"}
 
@@ -1032,6 +1107,7 @@ async def delete_teacher(
 
     teacher.is_active = False
     await db.commit()
+    await bump_catalog_version("teachers")
 
     return {"id": teacher.id, "message": "Преподаватель деактивирован"}
 
@@ -1075,6 +1151,7 @@ async def create_special_course(
     )
     db.add(course)
     await db.commit()
+    await bump_catalog_version("courses")
 
     return {
         "id": course.id,
@@ -1123,6 +1200,7 @@ async def update_special_course(
         setattr(course, field, value)
 
     await db.commit()
+    await bump_catalog_version("courses")
 
     return {"id": course.id, "message": "Спецкурс обновлён"}
 
@@ -1151,6 +1229,7 @@ async def delete_special_course(
 
     course.is_active = False
     await db.commit()
+    await bump_catalog_version("courses")
 
     return {"id": course.id, "message": "Спецкурс деактивирован"}
 
@@ -1213,6 +1292,7 @@ async def create_promotion(
     )
     db.add(promotion)
     await db.commit()
+    await bump_catalog_version("promos")
 
     return {
         "id": promotion.id,
@@ -1294,6 +1374,7 @@ async def update_promotion(
         setattr(promotion, field, value)
 
     await db.commit()
+    await bump_catalog_version("promos")
 
     return {"id": promotion.id, "message": "Акция обновлена"}
 
@@ -1322,10 +1403,85 @@ async def delete_promotion(
 
     promotion.is_active = False
     await db.commit()
+    await bump_catalog_version("promos")
 
     return {"id": promotion.id, "message": "Акция деактивирована"}
 
 
+@router.post("/promos/{promotion_id}/codes", status_code=status.HTTP_201_CREATED)
+@limiter.limit("10/minute")
+async def create_promo_code_batch(
+    request: Request,
+    promotion_id: int,
+    body: PromoCodeBatchCreateRequest,
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(get_current_admin),
+) -> dict:
+    """
+    Выпустить партию одноразовых промокодов для акции.
+    Коды генерируются и вставляются одной bulk-операцией (COPY на PostgreSQL).
+    """
+    if not 1 <= body.count <= MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Количество кодов должно быть от 1 до {MAX_BATCH_SIZE}",
+        )
+
+    prefix = body.prefix.replace("-", "")
+    if len(prefix) > 12 or (prefix and not (prefix.isascii() and prefix.isalnum())):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Префикс: до 12 символов, только буквы и цифры",
+        )
+
+    result = await db.execute(
+        select(Promotion).where(Promotion.id == promotion_id)
+    )
+    promotion = result.scalar_one_or_none()
+
+    if promotion is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Акция не найдена",
+        )
+
+    batch = await create_code_batch(db, promotion, body.count, prefix)
+    await db.commit()
+
+    return {
+        "batch_id": batch.id,
+        "promotion_id": promotion.id,
+        "size": batch.size,
+        "message": "Партия промокодов выпущена",
+    }
+
+
+@router.get("/promos/{promotion_id}/codes/export")
+async def export_promo_codes(
+    promotion_id: int,
+    batch_id: int | None = Query(None, description="ID партии (по умолчанию — все партии акции)"),
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+    _admin: User = Depends(get_current_admin),
+) -> StreamingResponse:
+    """
+    Потоковая выгрузка одноразовых промокодов акции в CSV.
+    Коды читаются из БД порциями и сразу отдаются клиенту.
+    """
+
+    async def stream_csv():
+        # Собственная сессия: ответ стримится уже после выхода из зависимостей запроса
+        async with session_factory() as db:
+            async for chunk in iter_codes_csv(db, promotion_id, batch_id):
+                yield chunk
+
+    filename = f"promo_{promotion_id}" + (f"_batch_{batch_id}" if batch_id else "") + ".csv"
+    return StreamingResponse(
+        stream_csv(),
+        media_type="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # =====================================================================
 # CRUD: Тарифные планы (Subscription Plans)
 # =====================================================================
@@ -1355,6 +1511,7 @@ async def create_subscription_plan(
     )
     db.add(plan)
     await db.commit()
+    await bump_catalog_version("plans")
 
     return {
         "id": plan.id,
@@ -1392,6 +1549,7 @@ async def update_subscription_plan(
         setattr(plan, field, value)
 
     await db.commit()
+    await bump_catalog_version("plans")
 
     return {"id": plan.id, "message": "Тарифный план обновлён"}
 
@@ -1421,6 +1579,7 @@ async def delete_subscription_plan(
 
     plan.is_active = False
     await db.commit()
+    await bump_catalog_version("plans")
 
     return {"id": plan.id, "message": "Тарифный план деактивирован"}
 
@@ -1447,3 +1606,155 @@ async def deactivate_expired(
         "deactivated_count": count,
         "message": f"Деактивировано просроченных подписок: {count}",
     }
+
+
+# =====================================================================
+# Сверка журнала баланса
+# =====================================================================
+
+
+@router.get("/ledger/reconcile")
+@limiter.limit("5/minute")
+async def reconcile_balances(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    _admin: User = Depends(get_current_admin),
+) -> dict:
+    """
+    Вручную сверить балансы учеников с журналом транзакций
+    (от последнего месячного снимка). По расписанию сверка идёт ежедневно.
+    """
+    report = await reconcile_ledger(db)
+
+    return {
+        "ok": report.ok,
+        "users_checked": report.users_checked,
+        "entries_checked": report.entries_checked,
+        "mismatches": [asdict(mismatch) for mismatch in report.mismatches],
+        "broken_entries": report.broken_entries,
+    }
+
+
+# =====================================================================
+# Расписание периодических задач
+# =====================================================================
+
+
+def _periodic_task_to_dict(name: str, row: PeriodicTaskConfig | None) -> dict:
+    """Итоговое расписание задачи: значения по умолчанию + переопределение из БД."""
+    from celery_app.schedule import DEFAULT_SCHEDULE
+
+    default = DEFAULT_SCHEDULE[name]
+    kwargs = dict(default["kwargs"])
+    if row is not None:
+        kwargs.update(row.kwargs or {})
+    return {
+        "name": name,
+        "task": default["task"],
+        "crontab": row.crontab if row is not None else default["crontab"],
+        "kwargs": kwargs,
+        "enabled": row.enabled if row is not None else True,
+        "is_default": row is None,
+    }
+
+
+@router.get("/schedule")
+async def list_periodic_tasks(
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(get_current_admin),
+) -> list[dict]:
+    """
+    Расписание периодических задач.
+
+    Изменения применяются планировщиком Beat (DatabaseScheduler)
+    в течение минуты, без передеплоя.
+    """
+    from celery_app.schedule import DEFAULT_SCHEDULE
+
+    result = await db.execute(select(PeriodicTaskConfig))
+    rows = {row.name: row for row in result.scalars().all()}
+
+    return [_periodic_task_to_dict(name, rows.get(name)) for name in DEFAULT_SCHEDULE]
+
+
+@router.put("/schedule/{name}")
+@limiter.limit("30/minute")
+async def update_periodic_task(
+    request: Request,
+    name: str,
+    body: PeriodicTaskUpdateRequest,
+    db: AsyncSession = Depends(get_db),
+    _admin: User = Depends(get_current_admin),
+) -> dict:
+    """
+    Изменить crontab, параметры или активность периодической задачи.
+    Допустимы только параметры, объявленные в расписании по умолчанию.
+    """
+    from celery_app.schedule import (
+        DEFAULT_SCHEDULE,
+        min_interval_seconds,
+        parse_crontab,
+        task_slot_seconds,
+    )
+
+    if name not in DEFAULT_SCHEDULE:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Периодическая задача не найдена",
+        )
+    default = DEFAULT_SCHEDULE[name]
+
+    if body.crontab is not None:
+        try:
+            schedule = parse_crontab(body.crontab)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Некорректный crontab: {exc}",
+            )
+        # Задача выполняется не чаще раза за слот блокировки (periodic_singleton):
+        # более частые запуски молча пропускались бы
+        slot_seconds = task_slot_seconds(default["task"])
+        if slot_seconds is not None and min_interval_seconds(schedule) < slot_seconds:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Задача запускается не чаще раза в {slot_seconds // 60} мин",
+            )
+
+    if body.kwargs is not None:
+        unknown = set(body.kwargs) - set(default["kwargs"])
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Неизвестные параметры задачи: {', '.join(sorted(unknown))}",
+            )
+        if any(value <= 0 for value in body.kwargs.values()):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Параметры задачи должны быть положительными",
+            )
+
+    result = await db.execute(
+        select(PeriodicTaskConfig).where(PeriodicTaskConfig.name == name)
+    )
+    row = result.scalar_one_or_none()
+    if row is None:
+        row = PeriodicTaskConfig(
+            name=name,
+            crontab=default["crontab"],
+            kwargs={},
+            enabled=True,
+        )
+        db.add(row)
+
+    if body.crontab is not None:
+        row.crontab = " ".join(body.crontab.split())
+    if body.kwargs is not None:
+        row.kwargs = {**(row.kwargs or {}), **body.kwargs}
+    if body.enabled is not None:
+        row.enabled = body.enabled
+
+    await db.commit()
+    await db.refresh(row)
+
+    return _periodic_task_to_dict(name, row)
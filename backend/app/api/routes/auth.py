@@ -7,12 +7,14 @@
 - Выдача JWT-токена
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.dependencies import get_current_user
+from app.core.rate_limit import limiter
+from app.core.responses import conditional_response, make_etag, model_response
 from app.core.security import create_access_token
 from app.core.telegram import validate_init_data
 from app.database import get_db
@@ -24,6 +26,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/telegram", response_model=AuthResponse)
+@limiter.cost(3)
 async def telegram_auth(
     body: TelegramAuthRequest,
     db: AsyncSession = Depends(get_db),
@@ -80,6 +83,9 @@ async def telegram_auth(
         user.username = username
         if photo_url:
             user.photo_url = photo_url
+        # Пользователь открыл Mini App — снова доступен для сообщений бота
+        user.telegram_reachable = True
+        user.telegram_unreachable_at = None
         await db.commit()
 
     # Шаг 4: Генерируем JWT-токен (sub = telegram_id)
@@ -94,10 +100,15 @@ async def telegram_auth(
 
 @router.get("/me", response_model=UserResponse)
 async def get_me(
+    request: Request,
     user: User = Depends(get_current_user),
-) -> UserResponse:
+) -> Response:
     """
     Получить данные текущего авторизованного пользователя.
     Используется для проверки валидности токена и получения актуальных данных.
     """
-    return UserResponse.model_validate(user)
+
+    async def build() -> Response:
+        return model_response(UserResponse, user)
+
+    return await conditional_response(request, make_etag(user.id, user.updated_at), build, private=True)
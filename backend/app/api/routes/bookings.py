@@ -9,71 +9,53 @@
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.core.dependencies import get_current_user
+from app.core.metrics import BOOKINGS
+from app.core.pagination import next_cursor, paginate
+from app.core.rate_limit import limiter
+from app.core.responses import conditional_response, model_response
 from app.database import get_db
 from app.models.booking import Booking
 from app.models.lesson import Lesson
-from app.models.transaction import Transaction
 from app.models.user import User
 from app.schemas.booking import BookingCreateRequest, BookingResponse
-from app.schemas.direction import DirectionListResponse
-from app.schemas.lesson import LessonResponse
-from app.schemas.teacher import TeacherListResponse
-from app.services.notification import notify_booking_created, notify_booking_cancelled
+from app.services.bot_schedule import invalidate_day_schedule
+from app.services.domain_events import record_event
+from app.services.ledger import post_entry
+from app.services.lesson_projection import project_bookings, user_etag
+from app.services.live_updates import publish_lesson_update
 
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
+# Размер страницы /bookings/my, если передан только cursor
+DEFAULT_PAGE_SIZE = 20
 
-def _build_booking_response(booking: Booking, user_id: int) -> BookingResponse:
-    """Сформировать ответ бронирования с вложенным занятием."""
-    lesson = booking.lesson
-    active_bookings = [b for b in lesson.bookings if b.status == "active"]
-    current_spots = len(active_bookings)
-    is_booked = any(b.user_id == user_id and b.status == "active" for b in lesson.bookings)
-
-    lesson_response = LessonResponse(
-        id=lesson.id,
-        direction=DirectionListResponse.model_validate(lesson.direction),
-        teacher=TeacherListResponse(
-            id=lesson.teacher.id,
-            name=lesson.teacher.name,
-            slug=lesson.teacher.slug,
-            photo_url=lesson.teacher.photo_url,
-            experience_years=lesson.teacher.experience_years,
-            specializations=[d.name for d in lesson.teacher.directions],
-        ),
-        date=lesson.date.isoformat(),
-        start_time=lesson.start_time.strftime("%H:%M"),
-        end_time=lesson.end_time.strftime("%H:%M"),
-        room=lesson.room,
-        max_spots=lesson.max_spots,
-        current_spots=current_spots,
-        level=lesson.level,
-        is_cancelled=lesson.is_cancelled,
-        cancel_reason=lesson.cancel_reason,
-        is_booked=is_booked,
-    )
 
-    return BookingResponse(
-        id=booking.id,
-        lesson=lesson_response,
-        status=booking.status,
-        booked_at=booking.booked_at,
-        cancelled_at=booking.cancelled_at,
-    )
+def _booking_event(booking: Booking, lesson: Lesson, user: User) -> dict:
+    """Данные событий booking.created / booking.cancelled."""
+    return {
+        "booking_id": booking.id,
+        "user_id": user.id,
+        "telegram_id": user.telegram_id,
+        "lesson_id": lesson.id,
+        "lesson_date": lesson.date.isoformat(),
+        "start_time": lesson.start_time.strftime("%H:%M"),
+        "direction": lesson.direction.name,
+    }
 
 
 @router.post("", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+@limiter.cost(5)
 async def create_booking(
     body: BookingCreateRequest,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> BookingResponse:
+) -> dict:
     """
     Записаться на занятие.
 
@@ -99,7 +81,6 @@ async def create_booking(
         .where(Lesson.id == body.lesson_id)
         .options(
             selectinload(Lesson.direction),
-            selectinload(Lesson.teacher),
             selectinload(Lesson.bookings),
         )
     )
@@ -143,32 +124,26 @@ async def create_booking(
     )
     db.add(booking)
 
-    # Шаг 6: Списываем 1 занятие с баланса
-    user.balance -= 1
-
-    # Шаг 7: Создаём транзакцию списания
-    transaction = Transaction(
-        user_id=user.id,
-        type="deduction",
-        amount=-1,
-        description=f"Запись на занятие: {lesson.direction.name}, {lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}",
-        booking_id=booking.id,
+    # Шаги 6-7: Списываем 1 занятие с баланса и пишем транзакцию списания
+    await post_entry(
+        db,
+        user,
+        "deduction",
+        -1,
+        f"Запись на занятие: {lesson.direction.name}, {lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}",
+        booking=booking,
     )
-    db.add(transaction)
 
-    await db.commit()
+    # Уведомление и статистика — потребители события после commit
+    await db.flush()
+    record_event(db, "booking.created", **_booking_event(booking, lesson, user))
 
-    # Уведомляем пользователя о записи через Telegram-бота
-    lesson_info = (
-        f"{lesson.direction.name}\n"
-        f"{lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}"
-    )
-    await notify_booking_created(
-        user_telegram_id=user.telegram_id,
-        lesson_info=lesson_info,
-    )
+    await db.commit()
+    await invalidate_day_schedule(lesson.date)
+    await publish_lesson_update(db, lesson)
+    BOOKINGS.labels("created").inc()
 
-    return _build_booking_response(booking, user.id)
+    return (await project_bookings(db, [booking], user.id))[0]
 
 
 @router.delete("/{booking_id}", response_model=BookingResponse)
@@ -176,7 +151,7 @@ async def cancel_booking(
     booking_id: int,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> BookingResponse:
+) -> dict:
     """
     Отменить запись на занятие.
 
@@ -193,8 +168,6 @@ async def cancel_booking(
         .where(Booking.id == booking_id, Booking.user_id == user.id)
         .options(
             selectinload(Booking.lesson).selectinload(Lesson.direction),
-            selectinload(Booking.lesson).selectinload(Lesson.teacher),
-            selectinload(Booking.lesson).selectinload(Lesson.bookings),
         )
     )
     booking = result.scalar_one_or_none()
@@ -216,63 +189,68 @@ async def cancel_booking(
     booking.status = "cancelled"
     booking.cancelled_at = datetime.now(timezone.utc)
 
-    # Шаг 4: Возвращаем занятие на баланс
-    user.balance += 1
-
-    # Шаг 5: Создаём транзакцию возврата
+    # Шаги 4-5: Возвращаем занятие на баланс и пишем транзакцию возврата
     lesson = booking.lesson
-    transaction = Transaction(
-        user_id=user.id,
-        type="refund",
-        amount=1,
-        description=f"Отмена записи: {lesson.direction.name}, {lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}",
-        booking_id=booking.id,
+    await post_entry(
+        db,
+        user,
+        "refund",
+        1,
+        f"Отмена записи: {lesson.direction.name}, {lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}",
+        booking=booking,
     )
-    db.add(transaction)
+    record_event(db, "booking.cancelled", **_booking_event(booking, lesson, user))
 
     await db.commit()
+    await invalidate_day_schedule(lesson.date)
+    await publish_lesson_update(db, lesson)
+    BOOKINGS.labels("cancelled").inc()
 
-    # Уведомляем пользователя об отмене записи через Telegram-бота
-    lesson_info = (
-        f"{lesson.direction.name}\n"
-        f"{lesson.date.isoformat()} {lesson.start_time.strftime('%H:%M')}"
-    )
-    await notify_booking_cancelled(
-        user_telegram_id=user.telegram_id,
-        lesson_info=lesson_info,
-    )
-
-    return _build_booking_response(booking, user.id)
+    return (await project_bookings(db, [booking], user.id))[0]
 
 
 @router.get("/my", response_model=list[BookingResponse])
 async def get_my_bookings(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
     status_filter: str | None = Query(None, alias="status", description="Фильтр по статусу: active, cancelled, attended"),
-) -> list[BookingResponse]:
+    limit: int | None = Query(None, ge=1, le=100, description="Количество записей на странице (по умолчанию — все)"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+) -> Response:
     """
     Получить список бронирований текущего пользователя.
     Можно фильтровать по статусу. По умолчанию возвращает все.
-    Сортировка: сначала ближайшие по дате занятия.
+    Сортировка: сначала последние созданные записи.
+    С limit или cursor — постранично, курсор следующей страницы
+    в заголовке X-Next-Cursor.
     """
-    query = (
-        select(Booking)
-        .where(Booking.user_id == user.id)
-        .options(
-            selectinload(Booking.lesson).selectinload(Lesson.direction),
-            selectinload(Booking.lesson).selectinload(Lesson.teacher),
-            selectinload(Booking.lesson).selectinload(Lesson.bookings),
-        )
-    )
+    page_size = limit or (DEFAULT_PAGE_SIZE if cursor is not None else None)
+
+    async def build() -> Response:
+        query = select(Booking).where(Booking.user_id == user.id)
 
-    if status_filter is not None:
-        query = query.where(Booking.status == status_filter)
+        if status_filter is not None:
+            query = query.where(Booking.status == status_filter)
 
-    # Сортируем по дате занятия (ближайшие сверху)
-    query = query.order_by(Booking.booked_at.desc())
+        if page_size is None:
+            query = query.order_by(Booking.booked_at.desc(), Booking.id.desc())
+        else:
+            query = paginate(query, Booking.booked_at, Booking.id, page_size, cursor)
 
-    result = await db.execute(query)
-    bookings = result.scalars().all()
+        result = await db.execute(query)
+        bookings = result.scalars().all()
+        headers: dict[str, str] = {}
+        if page_size is not None:
+            bookings, headers = next_cursor(bookings, page_size, lambda b: (b.booked_at, b.id))
+
+        return model_response(
+            list[BookingResponse],
+            await project_bookings(db, bookings, user.id),
+            headers=headers,
+        )
 
-    return [_build_booking_response(b, user.id) for b in bookings]
+    # Свои запись и отмена меняют баланс (updated_at), отметка посещения
+    # и отмена занятия админом — версию "lessons"
+    etag = await user_etag(user, status_filter, page_size, cursor)
+    return await conditional_response(request, etag, build, private=True)
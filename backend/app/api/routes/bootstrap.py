@@ -0,0 +1,150 @@
+"""
+Роутер стартовых данных Mini App.
+
+При запуске Mini App раньше делал около шести запросов (/auth/me,
+/users/balance, расписание на сегодня, направления, записи пользователя),
+и каждый заново проверял токен и загружал пользователя. GET /bootstrap
+отдаёт всё это одним ответом:
+- пользователь загружается один раз (get_current_user);
+- запросы к БД идут параллельно, каждый в своей сессии (AsyncSession
+  нельзя использовать из нескольких задач одновременно);
+- направления и преподаватели берутся из снимка lesson_projection,
+  версии каталога — одним MGET из Redis;
+- повторный запуск без изменений получает 304 до запросов к БД.
+
+Каталог (направления, тарифы) клиент по-прежнему берёт из кешируемых
+эндпоинтов — catalog_version подсказывает, изменился ли он.
+"""
+
+import asyncio
+from datetime import date
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import selectinload
+
+from app.core.dependencies import get_current_user
+from app.core.responses import conditional_response, make_etag, model_response
+from app.database import get_read_session_factory
+from app.models.booking import Booking
+from app.models.lesson import Lesson
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.schemas.bootstrap import BootstrapResponse
+from app.services.catalog_cache import CATALOG_TAGS, catalog_versions
+from app.services.lesson_projection import USER_TAGS, project_bookings, project_lessons
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+
+async def _active_subscriptions(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: int,
+    today: date,
+) -> list[dict]:
+    """Активные абонементы пользователя (dict по схеме SubscriptionResponse)."""
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Subscription)
+            .options(selectinload(Subscription.plan))
+            .where(
+                Subscription.user_id == user_id,
+                Subscription.is_active == True,  # noqa: E712
+                Subscription.expires_at >= today,
+            )
+            .order_by(Subscription.expires_at)
+        )
+        return [
+            {
+                "id": subscription.id,
+                "plan": {
+                    "id": subscription.plan.id,
+                    "name": subscription.plan.name,
+                    "lessons_count": subscription.plan.lessons_count,
+                    "validity_days": subscription.plan.validity_days,
+                    "price": subscription.plan.price,
+                    "description": subscription.plan.description,
+                    "is_popular": subscription.plan.is_popular,
+                    "price_per_lesson": (
+                        subscription.plan.price // subscription.plan.lessons_count
+                        if subscription.plan.lessons_count > 0
+                        else 0
+                    ),
+                },
+                "lessons_remaining": subscription.lessons_remaining,
+                "starts_at": subscription.starts_at.isoformat(),
+                "expires_at": subscription.expires_at.isoformat(),
+                "is_active": subscription.is_active,
+            }
+            for subscription in result.scalars()
+        ]
+
+
+async def _today_lessons(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: int,
+    today: date,
+) -> list[dict]:
+    """Расписание на сегодня с отметками записи пользователя."""
+    async with session_factory() as db:
+        return await project_lessons(db, Lesson.date == today, user_id=user_id)
+
+
+async def _upcoming_bookings(
+    session_factory: async_sessionmaker[AsyncSession],
+    user_id: int,
+    today: date,
+) -> list[dict]:
+    """Активные записи пользователя на сегодня и позже, ближайшие первыми."""
+    async with session_factory() as db:
+        result = await db.execute(
+            select(Booking)
+            .join(Lesson, Lesson.id == Booking.lesson_id)
+            .where(
+                Booking.user_id == user_id,
+                Booking.status == "active",
+                Lesson.date >= today,
+            )
+            .order_by(Lesson.date, Lesson.start_time)
+        )
+        return await project_bookings(db, result.scalars().all(), user_id)
+
+
+@router.get("", response_model=BootstrapResponse)
+async def get_bootstrap(
+    request: Request,
+    session_factory: async_sessionmaker[AsyncSession] = Depends(get_read_session_factory),
+    user: User = Depends(get_current_user),
+) -> Response:
+    """
+    Стартовые данные Mini App: профиль, баланс, активные абонементы,
+    расписание на сегодня, предстоящие записи и версия каталога.
+    """
+    today = date.today()
+    # Версии занятий и каталога — один MGET
+    versions = await catalog_versions(*USER_TAGS, *CATALOG_TAGS)
+    catalog_version = make_etag(versions[len(USER_TAGS):]).strip('"')
+
+    async def build() -> Response:
+        subscriptions, lessons, bookings = await asyncio.gather(
+            _active_subscriptions(session_factory, user.id, today),
+            _today_lessons(session_factory, user.id, today),
+            _upcoming_bookings(session_factory, user.id, today),
+        )
+        return model_response(
+            BootstrapResponse,
+            {
+                "profile": user,
+                "balance": user.balance,
+                "active_subscriptions": subscriptions,
+                "today_lessons": lessons,
+                "upcoming_bookings": bookings,
+                "catalog_version": catalog_version,
+            },
+        )
+
+    # Абонементы, баланс и свои записи меняются вместе с updated_at
+    # пользователя, занятия — с версией "lessons"; чужие записи ETag не меняют
+    etag = make_etag(versions, user.id, user.updated_at, today)
+    return await conditional_response(request, etag, build, private=True)
@@ -8,16 +8,18 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.database import get_db
+from app.core.responses import dump_json
+from app.database import get_db, get_read_db
 from app.models.special_course import SpecialCourse
 from app.schemas.course import SpecialCourseResponse
 from app.schemas.direction import DirectionListResponse
 from app.schemas.teacher import TeacherListResponse
+from app.services.catalog_cache import catalog_response
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
@@ -58,31 +60,37 @@ def _build_course_response(course: SpecialCourse) -> SpecialCourseResponse:
 
 @router.get("", response_model=list[SpecialCourseResponse])
 async def get_courses(
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> list[SpecialCourseResponse]:
+) -> Response:
     """
     Получить список активных специальных курсов.
     Возвращает только курсы с датой старта >= сегодня или текущие активные.
+    Ответ из кеша каталога, с ETag.
     """
-    result = await db.execute(
-        select(SpecialCourse)
-        .where(
-            SpecialCourse.is_active == True,  # noqa: E712
-        )
-        .options(
-            selectinload(SpecialCourse.direction),
-            selectinload(SpecialCourse.teacher),
+
+    async def build() -> bytes:
+        result = await db.execute(
+            select(SpecialCourse)
+            .where(
+                SpecialCourse.is_active == True,  # noqa: E712
+            )
+            .options(
+                selectinload(SpecialCourse.direction),
+                selectinload(SpecialCourse.teacher),
+            )
+            .order_by(SpecialCourse.start_date)
         )
-        .order_by(SpecialCourse.start_date)
-    )
-    courses = result.scalars().all()
-    return [_build_course_response(c) for c in courses]
+        courses = result.scalars().all()
+        return dump_json(list[SpecialCourseResponse], [_build_course_response(c) for c in courses])
+
+    return await catalog_response(request, "courses", ("courses", "directions", "teachers"), build)
 
 
 @router.get("/{course_id}", response_model=SpecialCourseResponse)
 async def get_course_detail(
     course_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> SpecialCourseResponse:
     """Получить детальную информацию о специальном курсе."""
     result = await db.execute(
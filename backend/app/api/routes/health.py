@@ -0,0 +1,40 @@
+"""
+Роутер проверки работоспособности.
+
+Эндпоинты:
+    GET /health — доступность БД и метрики пула подключений
+"""
+
+import logging
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.rate_limit import limiter
+from app.database import get_db, pool_stats
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/health")
+@limiter.exempt
+async def health(db: AsyncSession = Depends(get_db)) -> JSONResponse:
+    """
+    Проверка доступности БД (SELECT 1) и состояние пула подключений.
+
+    503 — БД недоступна (балансировщик/мониторинг снимает инстанс).
+    """
+    body: dict[str, Any] = {"status": "ok", "database": pool_stats()}
+    try:
+        await db.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        logger.warning("Health check: БД недоступна", exc_info=True)
+        body["status"] = "unavailable"
+        return JSONResponse(body, status_code=503)
+    return JSONResponse(body)
@@ -4,213 +4,177 @@
 Эндпоинты для работы с расписанием занятий:
 - Получение расписания по дате, направлению, преподавателю
 - Детали занятия с количеством свободных мест
+- Живые обновления заполненности (Server-Sent Events)
 """
 
+import asyncio
+import json
+from collections.abc import AsyncIterator
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from starlette.background import BackgroundTask
 
+from app.core.config import settings
 from app.core.dependencies import get_optional_user
-from app.database import get_db
+from app.core.rate_limit import client_identity
+from app.core.responses import conditional_response, model_response
+from app.database import get_read_db
 from app.models.lesson import Lesson
 from app.models.user import User
-from app.schemas.direction import DirectionListResponse, DirectionResponse
 from app.schemas.lesson import LessonDetailResponse, LessonResponse
-from app.schemas.teacher import TeacherListResponse, TeacherResponse
+from app.services.lesson_projection import project_lessons, schedule_etag
+from app.services.live_updates import get_hub
 
 router = APIRouter(prefix="/lessons", tags=["lessons"])
 
-
-def _build_teacher_list(teacher) -> TeacherListResponse:
-    """Сформировать краткую информацию о преподавателе с названиями направлений."""
-    return TeacherListResponse(
-        id=teacher.id,
-        name=teacher.name,
-        slug=teacher.slug,
-        photo_url=teacher.photo_url,
-        experience_years=teacher.experience_years,
-        specializations=[d.name for d in teacher.directions],
-    )
-
-
-def _build_lesson_response(lesson: Lesson, user_id: int | None) -> LessonResponse:
-    """
-    Сформировать ответ для занятия.
-    Вычисляет current_spots (количество активных записей) и is_booked (записан ли текущий пользователь).
-    """
-    # Количество активных записей на занятие
-    active_bookings = [b for b in lesson.bookings if b.status == "active"]
-    current_spots = len(active_bookings)
-
-    # Проверяем, записан ли текущий пользователь, и находим ID бронирования
-    is_booked = False
-    booking_id = None
-    if user_id is not None:
-        for b in lesson.bookings:
-            if b.user_id == user_id and b.status == "active":
-                is_booked = True
-                booking_id = b.id
-                break
-
-    return LessonResponse(
-        id=lesson.id,
-        direction=DirectionListResponse.model_validate(lesson.direction),
-        teacher=_build_teacher_list(lesson.teacher),
-        date=lesson.date.isoformat(),
-        start_time=lesson.start_time.strftime("%H:%M"),
-        end_time=lesson.end_time.strftime("%H:%M"),
-        room=lesson.room,
-        max_spots=lesson.max_spots,
-        current_spots=current_spots,
-        level=lesson.level,
-        is_cancelled=lesson.is_cancelled,
-        cancel_reason=lesson.cancel_reason,
-        is_booked=is_booked,
-        booking_id=booking_id,
-    )
+# Комментарий-пинг в потоке SSE, чтобы прокси не закрывали простаивающее соединение
+HEARTBEAT_SECONDS = 15
 
 
 @router.get("/today", response_model=list[LessonResponse])
 async def get_today_lessons(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     user: User | None = Depends(get_optional_user),
-) -> list[LessonResponse]:
+) -> Response:
     """
     Получить занятия на сегодня.
     Сортировка по времени начала.
     """
     today = date.today()
-    result = await db.execute(
-        select(Lesson)
-        .where(Lesson.date == today)
-        .options(
-            selectinload(Lesson.direction),
-            selectinload(Lesson.teacher),
-            selectinload(Lesson.bookings),
-        )
-        .order_by(Lesson.start_time)
-    )
-    lessons = result.scalars().all()
     user_id = user.id if user else None
-    return [_build_lesson_response(lesson, user_id) for lesson in lessons]
+
+    async def build() -> Response:
+        lessons = await project_lessons(db, Lesson.date == today, user_id=user_id)
+        return model_response(list[LessonResponse], lessons)
+
+    etag = await schedule_etag(user_id, today)
+    return await conditional_response(request, etag, build, private=True)
 
 
 @router.get("", response_model=list[LessonResponse])
 async def get_lessons(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     user: User | None = Depends(get_optional_user),
     date_filter: date | None = Query(None, alias="date", description="Дата в формате YYYY-MM-DD"),
     direction_id: int | None = Query(None, description="ID направления"),
     teacher_id: int | None = Query(None, description="ID преподавателя"),
     level: str | None = Query(None, description="Уровень: beginner, intermediate, advanced, all"),
-) -> list[LessonResponse]:
+) -> Response:
     """
     Получить список занятий с фильтрами.
     По умолчанию возвращает занятия на сегодня.
     Поддерживает фильтрацию по дате, направлению, преподавателю и уровню.
     """
-    query = select(Lesson).options(
-        selectinload(Lesson.direction),
-        selectinload(Lesson.teacher),
-        selectinload(Lesson.bookings),
-    )
-
     # Фильтр по дате (по умолчанию — сегодня)
-    if date_filter is not None:
-        query = query.where(Lesson.date == date_filter)
-    else:
-        query = query.where(Lesson.date == date.today())
+    day = date_filter if date_filter is not None else date.today()
+    criteria = [Lesson.date == day]
 
     # Фильтр по направлению
     if direction_id is not None:
-        query = query.where(Lesson.direction_id == direction_id)
+        criteria.append(Lesson.direction_id == direction_id)
 
     # Фильтр по преподавателю
     if teacher_id is not None:
-        query = query.where(Lesson.teacher_id == teacher_id)
+        criteria.append(Lesson.teacher_id == teacher_id)
 
     # Фильтр по уровню сложности
     if level is not None:
-        query = query.where(Lesson.level == level)
-
-    # Сортировка по времени начала
-    query = query.order_by(Lesson.start_time)
+        criteria.append(Lesson.level == level)
 
-    result = await db.execute(query)
-    lessons = result.scalars().all()
     user_id = user.id if user else None
-    return [_build_lesson_response(lesson, user_id) for lesson in lessons]
+
+    async def build() -> Response:
+        lessons = await project_lessons(db, *criteria, user_id=user_id)
+        return model_response(list[LessonResponse], lessons)
+
+    etag = await schedule_etag(user_id, day, direction_id, teacher_id, level)
+    return await conditional_response(request, etag, build, private=True)
+
+
+@router.get("/live")
+async def stream_lesson_updates(
+    request: Request,
+    date_filter: date | None = Query(None, alias="date", description="Дата в формате YYYY-MM-DD"),
+    lesson_ids: list[int] = Query([], description="ID занятий (вместо даты)"),
+) -> StreamingResponse:
+    """
+    Поток Server-Sent Events с изменениями заполненности и отменами занятий.
+
+    Подписка на дату (по умолчанию — сегодня) или на набор занятий.
+    События: "lesson" — текущие current_spots, max_spots, is_cancelled;
+    "resync" — часть изменений пропущена, расписание нужно перечитать.
+
+    Эндпоинт без авторизации, поэтому потоков одного клиента (пользователя
+    или IP) в процессе не больше LIVE_STREAMS_PER_CLIENT — сверх лимита 429.
+    """
+    day = date_filter if date_filter is not None else date.today()
+
+    # Проверка и регистрация без await между ними — параллельные запросы
+    # того же клиента не проскочат лимит
+    hub = get_hub()
+    client = client_identity(request)
+    if hub.client_streams(client) >= settings.LIVE_STREAMS_PER_CLIENT:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Слишком много открытых потоков обновлений",
+        )
+    subscriber = hub.open(day, lesson_ids, client=client)
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            hub.close(subscriber)
+
+    async def close() -> None:
+        # Поток мог не начаться (клиент отключился до первого chunk)
+        hub.close(subscriber)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(close),
+    )
 
 
 @router.get("/{lesson_id}", response_model=LessonDetailResponse)
 async def get_lesson_detail(
+    request: Request,
     lesson_id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     user: User | None = Depends(get_optional_user),
-) -> LessonDetailResponse:
+) -> Response:
     """
     Получить детальную информацию о занятии.
     Включает полные данные направления и преподавателя.
     """
-    result = await db.execute(
-        select(Lesson)
-        .where(Lesson.id == lesson_id)
-        .options(
-            selectinload(Lesson.direction),
-            selectinload(Lesson.teacher),
-            selectinload(Lesson.bookings),
-        )
-    )
-    lesson = result.scalar_one_or_none()
+    user_id = user.id if user else None
 
-    if lesson is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Занятие не найдено",
-        )
+    async def build() -> Response:
+        lessons = await project_lessons(db, Lesson.id == lesson_id, user_id=user_id)
 
-    # Вычисляем количество занятых мест
-    active_bookings = [b for b in lesson.bookings if b.status == "active"]
-    current_spots = len(active_bookings)
+        if not lessons:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Занятие не найдено",
+            )
 
-    # Проверяем запись текущего пользователя и находим ID бронирования
-    user_id = user.id if user else None
-    is_booked = False
-    booking_id = None
-    if user_id is not None:
-        for b in lesson.bookings:
-            if b.user_id == user_id and b.status == "active":
-                is_booked = True
-                booking_id = b.id
-                break
-
-    return LessonDetailResponse(
-        id=lesson.id,
-        direction=DirectionResponse.model_validate(lesson.direction),
-        teacher=TeacherResponse(
-            id=lesson.teacher.id,
-            name=lesson.teacher.name,
-            slug=lesson.teacher.slug,
-            bio=lesson.teacher.bio,
-            photo_url=lesson.teacher.photo_url,
-            experience_years=lesson.teacher.experience_years,
-            directions=[
-                DirectionListResponse.model_validate(d)
-                for d in lesson.teacher.directions
-            ],
-        ),
-        date=lesson.date.isoformat(),
-        start_time=lesson.start_time.strftime("%H:%M"),
-        end_time=lesson.end_time.strftime("%H:%M"),
-        room=lesson.room,
-        max_spots=lesson.max_spots,
-        current_spots=current_spots,
-        level=lesson.level,
-        is_cancelled=lesson.is_cancelled,
-        cancel_reason=lesson.cancel_reason,
-        is_booked=is_booked,
-        booking_id=booking_id,
-    )
+        # Полные данные направления и преподавателя — в снимке каталога,
+        # схема LessonDetailResponse берёт из них все поля
+        return model_response(LessonDetailResponse, lessons[0])
+
+    etag = await schedule_etag(user_id, lesson_id)
+    return await conditional_response(request, etag, build, private=True)
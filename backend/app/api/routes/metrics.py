@@ -0,0 +1,41 @@
+"""
+Роутер метрик Prometheus.
+
+Эндпоинты:
+    GET /metrics — метрики в текстовом формате Prometheus
+"""
+
+import hmac
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app.core.config import settings
+from app.core.metrics import render_metrics
+from app.core.rate_limit import limiter
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+@limiter.exempt
+async def metrics(request: Request) -> Response:
+    """
+    Метрики процесса (или всех процессов инстанса при PROMETHEUS_MULTIPROC_DIR).
+
+    Требуется заголовок Authorization: Bearer <METRICS_TOKEN>; без
+    настроенного токена эндпоинт отключён (404) — метрики не публичны.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Метрики отключены: не задан METRICS_TOKEN",
+        )
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not hmac.compare_digest(request.headers.get("Authorization", ""), expected):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Неверный токен доступа к метрикам",
+        )
+
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -12,27 +12,38 @@ import logging
 import uuid
 from datetime import date, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from yookassa import Configuration, Payment
 
 from app.core.config import settings
 from app.core.dependencies import get_current_user
+from app.core.metrics import PAYMENTS
+from app.core.rate_limit import limiter
+from app.core.responses import dump_json
 from app.database import get_db, async_session
 from app.models.subscription import Subscription, SubscriptionPlan
-from app.models.transaction import Transaction
 from app.models.user import User
 from app.schemas.subscription import PurchaseRequest, SubscriptionPlanResponse, SubscriptionResponse
+from app.services.catalog_cache import catalog_response
+from app.services.domain_events import record_event
+from app.services.ledger import post_entry
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
 def _init_yookassa() -> None:
-    """Инициализируем ЮКассу перед каждым вызовом — на Vercel env может подгружаться позже."""
+    """Инициализируем ЮКассу перед каждым вызовом — на Vercel env может подгружаться позже.
+
+    SDK импортируется здесь, а не на уровне модуля: он нужен только при
+    создании платежа и не должен замедлять холодный старт.
+    """
     import os
+
+    from yookassa import Configuration
+
     # Берём напрямую из os.environ если settings пустой
     shop_id = settings.YOOKASSA_SHOP_ID or os.environ.get("YOOKASSA_SHOP_ID", "")
     secret_key = settings.YOOKASSA_SECRET_KEY or os.environ.get("YOOKASSA_SECRET_KEY", "")
@@ -53,6 +64,7 @@ class CreatePaymentResponse(BaseModel):
 
 
 @router.post("/create-invoice", response_model=CreatePaymentResponse)
+@limiter.cost(10)
 async def create_invoice(
     body: CreatePaymentRequest,
     db: AsyncSession = Depends(get_db),
@@ -109,6 +121,8 @@ async def create_invoice(
     return_url = f"{settings.TELEGRAM_WEBAPP_URL}/profile"
 
     # Создаём платёж через ЮКассу
+    from yookassa import Payment
+
     payment = Payment.create({
         "amount": {
             "value": amount_rub,
@@ -132,6 +146,7 @@ async def create_invoice(
 
 
 @router.post("/webhook")
+@limiter.exempt
 async def payment_webhook(request: Request) -> dict:
     """
     Webhook от ЮКассы — вызывается при изменении статуса платежа.
@@ -158,6 +173,7 @@ async def payment_webhook(request: Request) -> dict:
 
     if not user_id or not plan_id:
         logger.error("Webhook без user_id/plan_id: payment=%s", payment_id)
+        PAYMENTS.labels("invalid").inc()
         return {"status": "error", "message": "missing metadata"}
 
     logger.info(
@@ -173,6 +189,7 @@ async def payment_webhook(request: Request) -> dict:
         user = result.scalar_one_or_none()
         if user is None:
             logger.error("Пользователь id=%s не найден", user_id)
+            PAYMENTS.labels("invalid").inc()
             return {"status": "error"}
 
         # Находим тарифный план
@@ -182,6 +199,7 @@ async def payment_webhook(request: Request) -> dict:
         plan = result.scalar_one_or_none()
         if plan is None:
             logger.error("План id=%s не найден", plan_id)
+            PAYMENTS.labels("invalid").inc()
             return {"status": "error"}
 
         # Создаём подписку
@@ -196,72 +214,76 @@ async def payment_webhook(request: Request) -> dict:
         )
         db.add(subscription)
 
-        # Зачисляем занятия на баланс
-        user.balance += plan.lessons_count
+        # Зачисляем занятия на баланс и пишем транзакцию покупки
+        await post_entry(
+            db,
+            user,
+            "purchase",
+            plan.lessons_count,
+            f'Покупка абонемента "{plan.name}" ({plan.lessons_count} занятий)',
+            subscription=subscription,
+        )
 
-        # Транзакция покупки
-        transaction = Transaction(
+        # Уведомление пользователя — потребитель события после commit
+        record_event(
+            db,
+            "payment.succeeded",
+            provider="yookassa",
+            payment_id=payment_id,
             user_id=user.id,
-            type="purchase",
-            amount=plan.lessons_count,
-            description=(
-                f'Покупка абонемента "{plan.name}" '
-                f'({plan.lessons_count} занятий)'
-            ),
+            telegram_id=user.telegram_id,
+            plan_id=plan.id,
+            plan_name=plan.name,
+            subscription_id=subscription.id,
+            balance=user.balance,
         )
-        db.add(transaction)
 
         await db.commit()
-
-    # Уведомляем пользователя через Telegram
-    try:
-        from app.core.bot import bot
-        await bot.send_message(
-            chat_id=user.telegram_id,
-            text=(
-                f"<b>Оплата прошла!</b>\n\n"
-                f'Абонемент «{plan.name}» активирован.\n'
-                f"На балансе: <b>{user.balance}</b> занятий.\n\n"
-                f"Открывайте приложение и записывайтесь!"
-            ),
-        )
-    except Exception as exc:
-        logger.warning("Не удалось отправить уведомление: %s", exc)
+    PAYMENTS.labels("credited").inc()
 
     return {"status": "ok"}
 
 
 @router.get("/plans", response_model=list[SubscriptionPlanResponse])
 async def get_plans(
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> list[SubscriptionPlanResponse]:
+) -> Response:
     """
     Получить список доступных тарифных планов абонементов.
-    Сортировка по sort_order. Только активные планы.
+    Сортировка по sort_order. Только активные планы. Ответ из кеша каталога, с ETag.
     """
-    result = await db.execute(
-        select(SubscriptionPlan)
-        .where(SubscriptionPlan.is_active == True)  # noqa: E712
-        .order_by(SubscriptionPlan.sort_order)
-    )
-    plans = result.scalars().all()
-
-    return [
-        SubscriptionPlanResponse(
-            id=p.id,
-            name=p.name,
-            lessons_count=p.lessons_count,
-            validity_days=p.validity_days,
-            price=p.price,
-            description=p.description,
-            is_popular=p.is_popular,
-            price_per_lesson=p.price // p.lessons_count if p.lessons_count > 0 else 0,
+
+    async def build() -> bytes:
+        result = await db.execute(
+            select(SubscriptionPlan)
+            .where(SubscriptionPlan.is_active == True)  # noqa: E712
+            .order_by(SubscriptionPlan.sort_order)
         )
-        for p in plans
-    ]
+        plans = result.scalars().all()
+
+        return dump_json(
+            list[SubscriptionPlanResponse],
+            [
+                {
+                    "id": p.id,
+                    "name": p.name,
+                    "lessons_count": p.lessons_count,
+                    "validity_days": p.validity_days,
+                    "price": p.price,
+                    "description": p.description,
+                    "is_popular": p.is_popular,
+                    "price_per_lesson": p.price // p.lessons_count if p.lessons_count > 0 else 0,
+                }
+                for p in plans
+            ],
+        )
+
+    return await catalog_response(request, "plans", ("plans",), build)
 
 
 @router.post("/create", response_model=SubscriptionResponse)
+@limiter.cost(10)
 async def create_payment(
     body: PurchaseRequest,
     db: AsyncSession = Depends(get_db),
@@ -292,16 +314,14 @@ async def create_payment(
         is_active=True,
     )
     db.add(subscription)
-    user.balance += plan.lessons_count
-
-    transaction = Transaction(
-        user_id=user.id,
-        type="purchase",
-        amount=plan.lessons_count,
-        description=f'Покупка абонемента "{plan.name}" ({plan.lessons_count} занятий)',
-        subscription_id=subscription.id,
+    await post_entry(
+        db,
+        user,
+        "purchase",
+        plan.lessons_count,
+        f'Покупка абонемента "{plan.name}" ({plan.lessons_count} занятий)',
+        subscription=subscription,
     )
-    db.add(transaction)
     await db.commit()
 
     return SubscriptionResponse(
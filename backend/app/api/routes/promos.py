@@ -3,15 +3,17 @@
 
 Эндпоинты для работы с акциями:
 - Список активных акций (без промокодов в ответе)
-- Проверка и применение промо-кода
+- Проверка и применение промо-кода (общего или одноразового из партии)
 """
 
 from datetime import date
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.rate_limit import limiter
+from app.core.responses import dump_json
 from app.database import get_db
 from app.models.promotion import Promotion
 from app.schemas.promotion import (
@@ -19,45 +21,58 @@ from app.schemas.promotion import (
     PromoValidateResponse,
     PromotionResponse,
 )
+from app.services.catalog_cache import catalog_response
+from app.services.promo_codes import find_batch_code
 
 router = APIRouter(prefix="/promos", tags=["promos"])
 
 
 @router.get("", response_model=list[PromotionResponse])
 async def get_promotions(
+    request: Request,
     db: AsyncSession = Depends(get_db),
-) -> list[PromotionResponse]:
+) -> Response:
     """
     Получить список активных акций.
     Промокоды скрыты в ответе (promo_code = None) — пользователь вводит их вручную.
+    Ответ из кеша каталога (ключ — по дате: акции начинаются и заканчиваются), с ETag.
     """
-    result = await db.execute(
-        select(Promotion).where(
-            Promotion.is_active == True,  # noqa: E712
-            Promotion.valid_from <= date.today(),
-            Promotion.valid_until >= date.today(),
+    today = date.today()
+
+    async def build() -> bytes:
+        result = await db.execute(
+            select(Promotion).where(
+                Promotion.is_active == True,  # noqa: E712
+                Promotion.valid_from <= today,
+                Promotion.valid_until >= today,
+            )
         )
-    )
-    promotions = result.scalars().all()
-
-    # Скрываем промокоды в публичном API — пользователи вводят их вручную
-    return [
-        PromotionResponse(
-            id=p.id,
-            title=p.title,
-            description=p.description,
-            image_url=p.image_url,
-            promo_code=None,  # Не показываем промокод в списке акций
-            discount_percent=p.discount_percent,
-            discount_amount=p.discount_amount,
-            valid_from=p.valid_from.isoformat(),
-            valid_until=p.valid_until.isoformat(),
+        promotions = result.scalars().all()
+
+        # Скрываем промокоды в публичном API — пользователи вводят их вручную
+        return dump_json(
+            list[PromotionResponse],
+            [
+                {
+                    "id": p.id,
+                    "title": p.title,
+                    "description": p.description,
+                    "image_url": p.image_url,
+                    "promo_code": None,  # Не показываем промокод в списке акций
+                    "discount_percent": p.discount_percent,
+                    "discount_amount": p.discount_amount,
+                    "valid_from": p.valid_from.isoformat(),
+                    "valid_until": p.valid_until.isoformat(),
+                }
+                for p in promotions
+            ],
         )
-        for p in promotions
-    ]
+
+    return await catalog_response(request, f"promos:{today.isoformat()}", ("promos",), build)
 
 
 @router.post("/validate", response_model=PromoValidateResponse)
+@limiter.cost(5)
 async def validate_promo_code(
     body: PromoValidateRequest,
     db: AsyncSession = Depends(get_db),
@@ -66,9 +81,9 @@ async def validate_promo_code(
     Валидация промокода перед покупкой абонемента.
 
     Проверки:
-    1. Промокод существует и активен
+    1. Промокод существует и активен (общий код акции или одноразовый из партии)
     2. Промокод в периоде действия
-    3. Не исчерпан лимит использований
+    3. Не исчерпан лимит использований / одноразовый код ещё не погашен
     """
     result = await db.execute(
         select(Promotion).where(
@@ -78,6 +93,19 @@ async def validate_promo_code(
     )
     promo = result.scalar_one_or_none()
 
+    # Не общий код — ищем среди одноразовых (один запрос по уникальному индексу)
+    if promo is None:
+        found = await find_batch_code(db, body.code)
+        if found is not None:
+            batch_code, promo = found
+            if not promo.is_active:
+                promo = None
+            elif batch_code.used_at is not None:
+                return PromoValidateResponse(
+                    valid=False,
+                    message="Промокод уже использован",
+                )
+
     # Промокод не найден
     if promo is None:
         return PromoValidateResponse(
@@ -9,11 +9,13 @@
 
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_current_user
+from app.core.pagination import check_cursor_offset, next_cursor, paginate
+from app.core.responses import conditional_response, make_etag, model_response
 from app.database import get_db
 from app.models.subscription import Subscription
 from app.models.transaction import Transaction
@@ -26,10 +28,15 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/profile", response_model=UserResponse)
 async def get_profile(
+    request: Request,
     user: User = Depends(get_current_user),
-) -> UserResponse:
+) -> Response:
     """Получить профиль текущего пользователя."""
-    return UserResponse.model_validate(user)
+
+    async def build() -> Response:
+        return model_response(UserResponse, user)
+
+    return await conditional_response(request, make_etag(user.id, user.updated_at), build, private=True)
 
 
 @router.put("/real-name", response_model=UserResponse)
@@ -62,46 +69,69 @@ async def set_real_name(
 
 @router.get("/balance", response_model=UserBalanceResponse)
 async def get_balance(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
-) -> UserBalanceResponse:
+) -> Response:
     """
     Получить баланс пользователя и количество активных абонементов.
     Активный абонемент — это абонемент с is_active=True и expires_at >= сегодня.
     """
-    # Считаем количество активных абонементов
-    result = await db.execute(
-        select(func.count(Subscription.id)).where(
-            Subscription.user_id == user.id,
-            Subscription.is_active == True,  # noqa: E712
-            Subscription.expires_at >= date.today(),
+    today = date.today()
+
+    async def build() -> Response:
+        # Считаем количество активных абонементов
+        result = await db.execute(
+            select(func.count(Subscription.id)).where(
+                Subscription.user_id == user.id,
+                Subscription.is_active == True,  # noqa: E712
+                Subscription.expires_at >= today,
+            )
         )
-    )
-    active_count = result.scalar() or 0
+        active_count = result.scalar() or 0
 
-    return UserBalanceResponse(
-        balance=user.balance,
-        active_subscriptions=active_count,
-    )
+        return model_response(
+            UserBalanceResponse,
+            {"balance": user.balance, "active_subscriptions": active_count},
+        )
+
+    # Покупка абонемента меняет баланс (и updated_at), истечение — дату
+    etag = make_etag(user.id, user.updated_at, today)
+    return await conditional_response(request, etag, build, private=True)
 
 
 @router.get("/history", response_model=list[TransactionResponse])
 async def get_transaction_history(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: User = Depends(get_current_user),
-    offset: int = Query(0, ge=0, description="Смещение для пагинации"),
+    offset: int = Query(0, ge=0, description="Смещение для пагинации (устаревшее — используйте cursor)"),
     limit: int = Query(20, ge=1, le=100, description="Количество записей на странице"),
-) -> list[TransactionResponse]:
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor предыдущей страницы"),
+) -> Response:
     """
     Получить историю транзакций пользователя с пагинацией.
-    Транзакции отсортированы от новых к старым.
+    Транзакции отсортированы от новых к старым. Курсор следующей страницы —
+    в заголовке X-Next-Cursor (нет заголовка — последняя страница).
     """
-    result = await db.execute(
-        select(Transaction)
-        .where(Transaction.user_id == user.id)
-        .order_by(Transaction.created_at.desc())
-        .offset(offset)
-        .limit(limit)
-    )
-    transactions = result.scalars().all()
-    return [TransactionResponse.model_validate(t) for t in transactions]
+    check_cursor_offset(cursor, offset)
+
+    async def build() -> Response:
+        result = await db.execute(
+            paginate(
+                select(Transaction).where(Transaction.user_id == user.id),
+                Transaction.created_at,
+                Transaction.id,
+                limit,
+                cursor,
+                offset,
+            )
+        )
+        transactions, headers = next_cursor(
+            result.scalars().all(), limit, lambda t: (t.created_at, t.id)
+        )
+        return model_response(list[TransactionResponse], transactions, headers=headers)
+
+    # Каждая транзакция меняет баланс, а с ним и updated_at пользователя
+    etag = make_etag(user.id, user.updated_at, offset, limit, cursor)
+    return await conditional_response(request, etag, build, private=True)
@@ -1,19 +1,25 @@
 """
 Роутер для обработки Telegram webhook.
 
-Принимает входящие Update от Telegram Bot API и передаёт их
-в aiogram Dispatcher для обработки зарегистрированными хендлерами.
+Принимает входящие Update от Telegram Bot API, проверяет секретный
+токен и передаёт их в очередь обработки (app.services.webhook_ingestion) —
+ответ Telegram уходит сразу, не дожидаясь хендлеров.
 
-Эндпоинт:
+Эндпоинты:
     POST /bot/webhook — принимает JSON-тело Update от Telegram
+    GET /bot/webhook/stats — счётчики очереди (только администратор)
 """
 
+import hmac
 import logging
 
-from aiogram.types import Update
-from fastapi import APIRouter, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 
-from app.core.bot import bot, dp
+from app.core.config import settings
+from app.core.dependencies import get_current_admin
+from app.core.rate_limit import limiter
+from app.models.user import User
+from app.services.webhook_ingestion import ingestion
 
 logger = logging.getLogger(__name__)
 
@@ -21,18 +27,41 @@ router = APIRouter(prefix="/bot", tags=["webhook"])
 
 
 @router.post("/webhook")
+@limiter.exempt
 async def telegram_webhook(request: Request) -> Response:
     """
-    Обработка входящего Telegram Update через webhook.
+    Приём входящего Telegram Update через webhook.
 
-    Telegram отправляет JSON с объектом Update на этот эндпоинт.
-    Мы парсим его в aiogram Update и передаём в Dispatcher.
+    - 403, если секретный токен не совпал (запрос не от Telegram)
+    - 503, если очередь переполнена — Telegram повторит доставку позже
+    - 200 в остальных случаях, включая повторную доставку и ошибки разбора,
+      чтобы Telegram не ретраил запрос бесконечно
     """
+    if settings.TELEGRAM_WEBHOOK_SECRET:
+        token = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if not hmac.compare_digest(token, settings.TELEGRAM_WEBHOOK_SECRET):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Неверный секретный токен webhook",
+            )
+
     try:
         update_data = await request.json()
-        update = Update.model_validate(update_data, context={"bot": bot})
-        await dp.feed_update(bot=bot, update=update)
-    except Exception:
-        logger.exception("Ошибка обработки Telegram webhook")
-    # Всегда возвращаем 200, чтобы Telegram не ретраил запрос бесконечно
+    except ValueError:
+        logger.warning("Telegram webhook: некорректный JSON")
+        return Response(status_code=200)
+    if not isinstance(update_data, dict):
+        return Response(status_code=200)
+
+    result = await ingestion.submit(update_data)
+    if result == "rejected":
+        return Response(status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
     return Response(status_code=200)
+
+
+@router.get("/webhook/stats")
+async def telegram_webhook_stats(
+    _admin: User = Depends(get_current_admin),
+) -> dict[str, int]:
+    """Счётчики приёма Update и заполненность очереди (backpressure)."""
+    return ingestion.stats()
@@ -3,40 +3,86 @@
 
 Используется:
 - В webhook-эндпоинте для обработки входящих Update от Telegram
-- В сервисе уведомлений для отправки сообщений пользователям
-- В рассылке (broadcast) для массовой отправки
+- В общем отправщике (app.services.telegram_sender) — все исходящие
+  сообщения проходят через него с учётом лимитов Bot API
 
 Единая точка создания — исключает дублирование и гарантирует,
 что все хендлеры зарегистрированы ровно один раз.
+
+Импорт aiogram занимает секунды, поэтому Bot и Dispatcher создаются
+лениво — при первой отправке сообщения или первом Update, а не при
+импорте приложения (холодный старт serverless-функции).
 """
 
-from aiogram import Bot, Dispatcher
-from aiogram.client.default import DefaultBotProperties
-from aiogram.enums import ParseMode
+from typing import TYPE_CHECKING, Any
 
 from app.core.config import settings
 
-# Глобальный экземпляр бота — переиспользуется во всех модулях
-bot = Bot(
-    token=settings.TELEGRAM_BOT_TOKEN,
-    default=DefaultBotProperties(parse_mode=ParseMode.HTML),
-)
+if TYPE_CHECKING:
+    from aiogram import Bot, Dispatcher
+
+_bot: "Bot | None" = None
+_dp: "Dispatcher | None" = None
+_handlers_registered = False
+
+
+def get_bot() -> "Bot":
+    """Глобальный экземпляр бота — создаётся при первом обращении."""
+    global _bot
+    if _bot is None:
+        from aiogram import Bot
+        from aiogram.client.default import DefaultBotProperties
+        from aiogram.enums import ParseMode
+
+        _bot = Bot(
+            token=settings.TELEGRAM_BOT_TOKEN,
+            default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+        )
+    return _bot
+
 
-# Диспетчер с зарегистрированными хендлерами
-dp = Dispatcher()
+def get_dispatcher() -> "Dispatcher":
+    """Диспетчер с зарегистрированными хендлерами."""
+    global _dp
+    if _dp is None:
+        from aiogram import Dispatcher
+
+        _dp = Dispatcher()
+    setup_dispatcher()
+    return _dp
 
 
 def setup_dispatcher() -> None:
-    """Зарегистрировать все хендлеры бота в диспетчере.
+    """Зарегистрировать все хендлеры бота в диспетчере (идемпотентно).
 
-    Вызывается один раз при старте приложения (в lifespan FastAPI).
     Импорт роутеров внутри функции — для избежания циклических зависимостей.
     """
+    global _handlers_registered
+    if _handlers_registered:
+        return
+    _handlers_registered = True
+
     from bot.handlers import start, balance, schedule, help as help_handler, payments
 
+    dp = get_dispatcher()
     # Платежи регистрируем первыми — pre_checkout_query должен обрабатываться быстро
     dp.include_router(payments.router)
     dp.include_router(start.router)
     dp.include_router(balance.router)
     dp.include_router(schedule.router)
     dp.include_router(help_handler.router)
+
+
+async def close_bot() -> None:
+    """Закрыть HTTP-сессию бота, если он был создан."""
+    if _bot is not None:
+        await _bot.session.close()
+
+
+def __getattr__(name: str) -> Any:
+    """`from app.core.bot import bot, dp` — для скриптов и тестов, где ленивость не нужна."""
+    if name == "bot":
+        return get_bot()
+    if name == "dp":
+        return get_dispatcher()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,189 @@
+"""
+Метрики Prometheus.
+
+Метрики процесса API (HTTP, пул БД, записи, платежи, Telegram) и
+Celery-воркеров (длительность задач). При нескольких процессах (uvicorn
+--workers, prefork-воркеры Celery) задайте PROMETHEUS_MULTIPROC_DIR —
+каталог, общий для процессов одного инстанса и очищаемый при старте:
+значения пишутся в mmap-файлы, а render_metrics() собирает их вместе.
+"""
+
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+# ---------- HTTP ----------
+
+HTTP_REQUEST_DURATION = Histogram(
+    "dancemax_http_request_duration_seconds",
+    "Длительность HTTP-запроса",
+    ["method", "route", "status"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "dancemax_http_requests_in_progress",
+    "HTTP-запросы в обработке",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+
+# SSE-потоки не входят в HTTP-метрики выше: их длительность — время жизни
+# подписки, а не обработки запроса
+LIVE_STREAMS = Gauge(
+    "dancemax_live_streams",
+    "Открытые SSE-потоки обновлений расписания",
+    multiprocess_mode="livesum",
+)
+
+# ---------- Пул БД ----------
+
+DB_POOL_CHECKED_OUT = Gauge(
+    "dancemax_db_pool_checked_out",
+    "Соединения пула БД, выданные сессиям",
+    ["pool"],  # primary, replica
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "dancemax_db_pool_overflow",
+    "Соединения сверх pool_size",
+    ["pool"],  # primary, replica
+    multiprocess_mode="livesum",
+)
+
+# ---------- Бизнес-события ----------
+
+BOOKINGS = Counter(
+    "dancemax_bookings_total",
+    "Записи на занятия",
+    ["action"],  # created, cancelled
+)
+
+PAYMENTS = Counter(
+    "dancemax_payments_total",
+    "Успешные платежи из webhook ЮКассы",
+    ["result"],  # credited — абонемент выдан, invalid — не найдены пользователь/план
+)
+
+# ---------- Доменные события ----------
+
+DOMAIN_EVENTS_PUBLISHED = Counter(
+    "dancemax_domain_events_published_total",
+    "Доменные события, опубликованные в Redis Stream",
+    ["type"],
+)
+
+DOMAIN_EVENTS_HANDLED = Counter(
+    "dancemax_domain_events_handled_total",
+    "События, обработанные группой потребителей",
+    ["group", "result"],  # acked, failed, dropped — превышен лимит доставок
+)
+
+DOMAIN_EVENTS_LAG = Gauge(
+    "dancemax_domain_events_lag",
+    "События потока, ещё не выданные группе потребителей",
+    ["group"],
+    multiprocess_mode="max",
+)
+
+DOMAIN_EVENTS_PENDING = Gauge(
+    "dancemax_domain_events_pending",
+    "События, выданные группе, но не подтверждённые (XPENDING)",
+    ["group"],
+    multiprocess_mode="max",
+)
+
+# ---------- Журнал баланса ----------
+
+LEDGER_MISMATCHES = Gauge(
+    "dancemax_ledger_mismatches",
+    "Пользователи, чей баланс расходится с журналом (последняя сверка)",
+    multiprocess_mode="mostrecent",
+)
+
+LEDGER_BROKEN_ENTRIES = Gauge(
+    "dancemax_ledger_broken_entries",
+    "Записи журнала с неверным нарастающим итогом (последняя сверка)",
+    multiprocess_mode="mostrecent",
+)
+
+# ---------- Telegram ----------
+
+TELEGRAM_MESSAGES = Counter(
+    "dancemax_telegram_messages_total",
+    "Исходящие сообщения Telegram по результату доставки",
+    ["priority", "result"],  # result: sent, failed, unreachable
+)
+
+TELEGRAM_REQUEST_DURATION = Histogram(
+    "dancemax_telegram_request_duration_seconds",
+    "Длительность вызова Bot API sendMessage",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+TELEGRAM_RETRY_AFTER = Counter(
+    "dancemax_telegram_retry_after_total",
+    "Ответы 429 (TelegramRetryAfter) от Bot API",
+)
+
+# ---------- Celery ----------
+
+CELERY_TASK_DURATION = Histogram(
+    "dancemax_celery_task_duration_seconds",
+    "Длительность выполнения Celery-задачи",
+    ["task", "state"],
+    buckets=(0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+
+
+def observe_pool(engine, name: str = "primary") -> None:
+    """
+    Обновлять метрики пула по событиям checkout/checkin (только QueuePool).
+
+    name — метка pool: у основной БД и реплики отдельные пулы.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+
+    def on_checkout(*_args) -> None:
+        checked_out.set(pool.checkedout())
+        overflow.set(max(pool.overflow(), 0))
+
+    def on_checkin(*_args) -> None:
+        # Событие приходит до возврата соединения в пул: оно ещё числится
+        # выданным, а при полном пуле будет закрыто как overflow
+        closes_overflow = pool.checkedin() >= pool.size()
+        checked_out.set(pool.checkedout() - 1)
+        overflow.set(max(pool.overflow() - closes_overflow, 0))
+
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "checkin", on_checkin)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Текст метрик для /metrics: (тело, Content-Type)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_process_dead(pid: int) -> None:
+    """Удалить live-gauge завершившегося процесса (в мультипроцессном режиме)."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
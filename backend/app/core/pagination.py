@@ -0,0 +1,96 @@
+"""
+Курсорная (keyset) пагинация.
+
+OFFSET заставляет БД прочитать и отбросить все строки предыдущих страниц,
+а новые записи между запросами сдвигают страницы (дубли и пропуски).
+Курсор хранит ключ сортировки последней строки страницы — (время, id) —
+и следующая страница начинается строго после него: запрос идёт по индексу
+(…, created_at, id) и читает только limit + 1 строк.
+
+Курсор непрозрачен для клиента (base64 от ключа) и отдаётся в заголовке
+X-Next-Cursor: тело ответа остаётся списком, как и при offset, который
+поддерживается для обратной совместимости.
+"""
+
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+T = TypeVar("T")
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Курсор после строки с ключом (created_at, row_id)."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Ключ (created_at, id) из курсора; некорректный курсор — 400."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный курсор пагинации",
+        )
+
+
+def check_cursor_offset(cursor: str | None, offset: int) -> None:
+    """Курсор и offset взаимоисключающие."""
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Нельзя использовать cursor вместе с offset",
+        )
+
+
+def paginate(
+    query: Select,
+    created_at: InstrumentedAttribute,
+    row_id: InstrumentedAttribute,
+    limit: int,
+    cursor: str | None = None,
+    offset: int = 0,
+) -> Select:
+    """
+    Страница query от новых к старым по (created_at, id).
+
+    С курсором — строки строго после него, иначе — offset. Запрашивается
+    limit + 1 строк: лишняя строка говорит о наличии следующей страницы
+    (см. next_cursor).
+    """
+    query = query.order_by(created_at.desc(), row_id.desc()).limit(limit + 1)
+    if cursor is not None:
+        return query.where(tuple_(created_at, row_id) < tuple_(*decode_cursor(cursor)))
+    return query.offset(offset)
+
+
+def next_cursor(
+    rows: Sequence[T],
+    limit: int,
+    key: Callable[[T], tuple[datetime, int]],
+) -> tuple[Sequence[T], dict[str, str]]:
+    """
+    Отрезать лишнюю строку и сформировать заголовок X-Next-Cursor.
+
+    Args:
+        key: функция строки -> (created_at, id).
+
+    Returns:
+        Строки страницы и заголовки ответа (пустые на последней странице).
+    """
+    if len(rows) <= limit:
+        return rows, {}
+    page = rows[:limit]
+    return page, {NEXT_CURSOR_HEADER: encode_cursor(*key(page[-1]))}
@@ -0,0 +1,82 @@
+"""
+Учёт SQL-запросов в рамках HTTP-запроса.
+
+События SQLAlchemy (before/after_cursor_execute) считают число запросов
+к БД и суммарное время их выполнения. Счётчик привязан к текущему
+HTTP-запросу через contextvar; middleware в app.main открывает его,
+отдаёт итог в заголовке Server-Timing и в полях лога, а повторяющиеся
+одинаковые SQL (признак N+1) пишет в лог предупреждением.
+"""
+
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Сколько выполнений одного и того же SQL за запрос считать признаком N+1
+REPEATED_STATEMENT_THRESHOLD = 3
+
+
+@dataclass
+class QueryStats:
+    """Статистика SQL-запросов одного HTTP-запроса."""
+
+    count: int = 0
+    duration: float = 0.0
+    statements: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    def repeated(self, threshold: int = REPEATED_STATEMENT_THRESHOLD) -> dict[str, int]:
+        """
+        SELECT, выполненные не менее threshold раз (кандидаты в N+1).
+
+        UPDATE/INSERT не учитываются: flush сессии пишет изменённые строки
+        по одной, это не N+1.
+        """
+        return {
+            sql: n for sql, n in self.statements.items()
+            if n >= threshold and sql.lstrip()[:6].upper() == "SELECT"
+        }
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing."""
+        return f'db;dur={self.duration_ms:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Считать SQL-запросы, выполненные внутри блока."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _current.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    started = conn.info.get("query_started_at")
+    if stats is None or not started:
+        return
+    stats.duration += time.perf_counter() - started.pop()
+    stats.count += 1
+    stats.statements[statement] += 1
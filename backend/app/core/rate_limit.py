@@ -0,0 +1,221 @@
+"""
+Ограничение частоты запросов к API, общее для всех процессов.
+
+- Алгоритм — скользящее окно (sliding window counter): счётчики текущего
+  и предыдущего окна, вклад предыдущего убывает линейно. Нет всплеска
+  x2 на границе окон, как у фиксированного окна, и O(1) памяти на ключ.
+- Ключ — telegram_id из JWT, если запрос авторизован, иначе IP клиента:
+  за прокси Vercel все пользователи могут приходить с одного адреса.
+- Общий лимит (RATE_LIMIT_DEFAULT) расходуется с весом маршрута: запись
+  на занятие и создание платежа дороже чтения. Маршрут может добавить
+  собственный лимит (@limiter.limit("30/minute")).
+- Все лимиты запроса проверяются и списываются одним Lua-скриптом —
+  один round trip к Redis. Без Redis (или при его недоступности) лимиты
+  действуют в пределах процесса.
+
+Проверка подключается зависимостью enforce_rate_limit на уровне роутера API.
+"""
+
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, Request, status
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.replica import request_subject
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_KEY_PREFIX = "dancemax:rate"
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Лимит: amount единиц стоимости за period секунд."""
+
+    amount: int
+    period: int
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Разобрать строку вида "100/minute"."""
+        amount, _, unit = value.partition("/")
+        period = _PERIODS.get(unit.strip().rstrip("s"))
+        if period is None:
+            raise ValueError(f"Неизвестный период лимита: {value!r}")
+        return cls(int(amount), period)
+
+    @property
+    def name(self) -> str:
+        return f"{self.amount}-{self.period}"
+
+
+# KEYS: по два ключа на лимит (текущее и предыдущее окно).
+# ARGV: для каждого лимита — amount, elapsed_ms, period_ms, cost.
+# Возвращает 0, если запрос разрешён (и списывает стоимость по всем лимитам),
+# иначе — через сколько миллисекунд повторить.
+_CHECK_SCRIPT = """
+local limits = #KEYS / 2
+local retry = 0
+for i = 0, limits - 1 do
+    local amount = tonumber(ARGV[i * 4 + 1])
+    local elapsed = tonumber(ARGV[i * 4 + 2])
+    local period = tonumber(ARGV[i * 4 + 3])
+    local cost = tonumber(ARGV[i * 4 + 4])
+    local current = tonumber(redis.call('GET', KEYS[i * 2 + 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[i * 2 + 2]) or '0')
+    local used = previous * (period - elapsed) / period + current
+    if used + cost > amount then
+        retry = math.max(retry, period - elapsed)
+    end
+end
+if retry > 0 then
+    return retry
+end
+for i = 0, limits - 1 do
+    local period = tonumber(ARGV[i * 4 + 3])
+    redis.call('INCRBY', KEYS[i * 2 + 1], ARGV[i * 4 + 4])
+    redis.call('PEXPIRE', KEYS[i * 2 + 1], period * 2)
+end
+return 0
+"""
+
+
+class LocalSlidingWindow:
+    """Тот же алгоритм в памяти процесса — запасной вариант без Redis."""
+
+    # При каком числе счётчиков удалять устаревшие
+    _MAX_COUNTERS = 50_000
+
+    def __init__(self) -> None:
+        # (ключ, период, номер окна) -> списанная стоимость
+        self._counters: dict[tuple[str, int, int], int] = {}
+
+    def hit(self, checks: list[tuple[str, RateLimit, int]], now: float) -> float:
+        """Проверить и списать лимиты. Returns: 0 — разрешено, иначе секунды до повтора."""
+        retry = 0.0
+        for key, limit, cost in checks:
+            window, elapsed = divmod(now, limit.period)
+            current = self._counters.get((key, limit.period, int(window)), 0)
+            previous = self._counters.get((key, limit.period, int(window) - 1), 0)
+            used = previous * (limit.period - elapsed) / limit.period + current
+            if used + cost > limit.amount:
+                retry = max(retry, limit.period - elapsed)
+        if retry:
+            return retry
+
+        for key, limit, cost in checks:
+            counter = (key, limit.period, int(now // limit.period))
+            self._counters[counter] = self._counters.get(counter, 0) + cost
+        if len(self._counters) > self._MAX_COUNTERS:
+            # Нужны только текущее и предыдущее окно
+            self._counters = {
+                (key, period, window): count
+                for (key, period, window), count in self._counters.items()
+                if window >= now // period - 1
+            }
+        return 0.0
+
+
+class Limiter:
+    """Регистрация лимитов маршрутов; проверка — в enforce_rate_limit."""
+
+    def __init__(self, default: str) -> None:
+        self.default = RateLimit.parse(default)
+        self._local = LocalSlidingWindow()
+
+    def limit(self, value: str) -> Callable[[F], F]:
+        """Дополнительный лимит маршрута (считается в запросах, без веса)."""
+        limit = RateLimit.parse(value)
+
+        def decorator(func: F) -> F:
+            func.__rate_limits__ = (*getattr(func, "__rate_limits__", ()), limit)  # type: ignore[attr-defined]
+            return func
+
+        return decorator
+
+    def cost(self, weight: int) -> Callable[[F], F]:
+        """Вес маршрута в общем лимите (по умолчанию 1)."""
+
+        def decorator(func: F) -> F:
+            func.__rate_cost__ = weight  # type: ignore[attr-defined]
+            return func
+
+        return decorator
+
+    def exempt(self, func: F) -> F:
+        """Маршрут без лимитов (webhook Telegram и ЮКассы, health, метрики)."""
+        func.__rate_exempt__ = True  # type: ignore[attr-defined]
+        return func
+
+    def reset(self) -> None:
+        """Сбросить локальные счётчики (тесты)."""
+        self._local = LocalSlidingWindow()
+
+    async def hit(self, identity: str, endpoint: Callable[..., Any] | None) -> float:
+        """
+        Списать стоимость запроса по всем лимитам.
+
+        Returns:
+            0 — запрос разрешён, иначе через сколько секунд повторить.
+        """
+        checks = [(f"{identity}:default", self.default, getattr(endpoint, "__rate_cost__", 1))]
+        route = f"{getattr(endpoint, '__module__', '')}.{getattr(endpoint, '__name__', '')}"
+        for limit in getattr(endpoint, "__rate_limits__", ()):
+            checks.append((f"{identity}:{route}:{limit.name}", limit, 1))
+
+        now = time.time()
+        redis = get_redis()
+        if redis is not None:
+            keys: list[str] = []
+            args: list[int] = []
+            for key, limit, cost in checks:
+                window, elapsed = divmod(now, limit.period)
+                keys += [f"{_KEY_PREFIX}:{key}:{int(window)}", f"{_KEY_PREFIX}:{key}:{int(window) - 1}"]
+                args += [limit.amount, int(elapsed * 1000), limit.period * 1000, cost]
+            try:
+                return int(await redis.eval(_CHECK_SCRIPT, len(keys), *keys, *args)) / 1000
+            except RedisError:
+                logger.warning("Redis недоступен, лимиты запросов в пределах процесса", exc_info=True)
+        return self._local.hit(checks, now)
+
+
+def client_identity(request: Request) -> str:
+    """Ключ лимита: telegram_id авторизованного пользователя, иначе IP."""
+    subject = request_subject(request)
+    if subject is not None:
+        return f"tg:{subject}"
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+limiter = Limiter(default=settings.RATE_LIMIT_DEFAULT)
+
+
+async def enforce_rate_limit(request: Request) -> None:
+    """Зависимость роутера API: 429 при превышении лимита."""
+    route = request.scope.get("route")
+    endpoint = getattr(route, "endpoint", None)
+    if getattr(endpoint, "__rate_exempt__", False):
+        return
+
+    retry_after = await limiter.hit(client_identity(request), endpoint)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Слишком много запросов, попробуйте позже",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
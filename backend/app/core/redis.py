@@ -0,0 +1,43 @@
+"""
+Асинхронный клиент Redis.
+
+Соединения redis.asyncio привязаны к event loop, поэтому клиент создаётся
+по одному на loop (API-воркер uvicorn, loop Celery-воркера). Пустой
+REDIS_URL отключает Redis — вызывающий код работает в деградированном
+режиме (без распределённых блокировок и кеша).
+"""
+
+import asyncio
+import weakref
+
+from redis.asyncio import Redis
+
+from app.core.config import settings
+
+# Таймауты небольшие: Redis — вспомогательная зависимость, не должен вешать запросы
+_SOCKET_TIMEOUT = 2
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = weakref.WeakKeyDictionary()
+
+
+def get_redis() -> Redis | None:
+    """
+    Клиент Redis для текущего event loop.
+
+    Returns:
+        Клиент или None, если Redis не настроен (REDIS_URL пуст).
+    """
+    if not settings.REDIS_URL:
+        return None
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        client = Redis.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            socket_timeout=_SOCKET_TIMEOUT,
+            socket_connect_timeout=_SOCKET_TIMEOUT,
+        )
+        _clients[loop] = client
+    return client
@@ -0,0 +1,77 @@
+"""
+Привязка пользователя к основной БД после записи (read-your-writes).
+
+Реплика отстаёт от основной БД на доли секунды — секунды. Чтобы после
+записи на занятие или покупки пользователь сразу видел свои изменения,
+успешный изменяющий запрос (POST/PUT/PATCH/DELETE) закрепляет его за
+основной БД на REPLICA_PIN_SECONDS: в это время get_read_db отдаёт
+сессию основной БД.
+
+Пользователь определяется по sub из JWT (telegram_id) без обращения к БД.
+Отметка хранится в Redis (общая для всех инстансов API), без Redis —
+в памяти процесса.
+"""
+
+import logging
+import time
+
+from fastapi import Request
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+from app.core.redis import get_redis
+from app.core.security import verify_token
+
+logger = logging.getLogger(__name__)
+
+PIN_PREFIX = "dancemax:db-pin"
+
+# Сколько отметок держать в памяти процесса, если Redis не используется
+_LOCAL_PINS_LIMIT = 10_000
+
+_local_pins: dict[str, float] = {}
+
+
+def request_subject(request: Request) -> str | None:
+    """sub из Bearer-токена запроса или None (анонимный/невалидный токен)."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = verify_token(token)
+    if payload is None or "sub" not in payload:
+        return None
+    return str(payload["sub"])
+
+
+async def pin_to_primary(subject: str) -> None:
+    """Закрепить пользователя за основной БД на REPLICA_PIN_SECONDS."""
+    now = time.monotonic()
+    _local_pins[subject] = now + settings.REPLICA_PIN_SECONDS
+    if len(_local_pins) > _LOCAL_PINS_LIMIT:
+        for key in [key for key, until in _local_pins.items() if until <= now]:
+            del _local_pins[key]
+
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(f"{PIN_PREFIX}:{subject}", 1, ex=settings.REPLICA_PIN_SECONDS)
+    except RedisError:
+        logger.warning("Не удалось закрепить пользователя за основной БД", exc_info=True)
+
+
+async def is_pinned(subject: str) -> bool:
+    """Закреплён ли пользователь за основной БД."""
+    until = _local_pins.get(subject)
+    if until is not None and until > time.monotonic():
+        return True
+
+    redis = get_redis()
+    if redis is None:
+        return False
+    try:
+        return bool(await redis.exists(f"{PIN_PREFIX}:{subject}"))
+    except RedisError:
+        # Не знаем, писал ли пользователь — безопаснее читать из основной БД
+        logger.warning("Redis недоступен, чтение из основной БД", exc_info=True)
+        return True
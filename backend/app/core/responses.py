@@ -0,0 +1,99 @@
+"""
+Быстрая сериализация ответов и условные GET-запросы.
+
+Раньше маршруты собирали Pydantic-модели вручную (каждая вложенная модель
+валидировалась при создании), а FastAPI по response_model валидировал
+результат ещё раз и сериализовал через промежуточный dict.
+
+Теперь ответ собирается из обычных dict (вложенные ORM-объекты допустимы —
+читаются по атрибутам), проверяется один раз TypeAdapter на ядре pydantic
+(Rust) и сразу превращается в JSON-байты. response_model у маршрута
+остаётся — для схемы OpenAPI.
+
+Условные запросы (ETag / If-None-Match): ETag строится не из тела, а из
+того, от чего тело зависит — версий кеша каталога, updated_at
+пользователя, даты. Поэтому 304 отдаётся до запросов к БД и сериализации.
+Ответы, зависящие от пользователя, помечаются Cache-Control: private
+и Vary: Authorization — общий кеш (CDN, прокси) не отдаст их другому.
+"""
+
+import hashlib
+from collections.abc import Awaitable, Callable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema: Any) -> TypeAdapter:
+    """TypeAdapter на каждую схему ответа строится один раз за процесс."""
+    return TypeAdapter(schema)
+
+
+def dump_json(schema: Any, content: Any) -> bytes:
+    """Проверить content по схеме и сериализовать в JSON."""
+    adapter = _adapter(schema)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+def model_response(
+    schema: Any,
+    content: Any,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> Response:
+    """
+    JSON-ответ по схеме без повторной валидации в FastAPI.
+
+    Пример:
+        return model_response(list[LessonResponse], await project_lessons(db, ...))
+    """
+    return Response(
+        content=dump_json(schema, content),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
+
+
+def make_etag(*parts: Any) -> str:
+    """Сильный ETag из версий и отметок времени, от которых зависит ответ."""
+    return f'"{hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Есть ли etag в If-None-Match (сравнение слабое — префикс W/ не учитывается)."""
+    client_tags = {
+        tag.strip().removeprefix("W/")
+        for tag in request.headers.get("If-None-Match", "").split(",")
+    }
+    return etag in client_tags or "*" in client_tags
+
+
+def validator_headers(etag: str, private: bool = False) -> dict[str, str]:
+    """
+    Заголовки кеширования: клиент хранит ответ, но перепроверяет его по ETag.
+
+    Args:
+        private: ответ зависит от пользователя (заголовка Authorization).
+    """
+    if private:
+        return {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+async def conditional_response(
+    request: Request,
+    etag: str,
+    build: Callable[[], Awaitable[Response]],
+    private: bool = False,
+) -> Response:
+    """304, если у клиента актуальная версия, иначе build() с ETag."""
+    headers = validator_headers(etag, private)
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response = await build()
+    response.headers.update(headers)
+    return response
@@ -1,21 +1,129 @@
 """
 Настройка асинхронного подключения к базе данных через SQLAlchemy.
 Используется asyncpg как драйвер для PostgreSQL.
+Эндпоинты только на чтение получают сессию через get_read_db
+(реплика, если задан DATABASE_REPLICA_URL).
 """
 
 from collections.abc import AsyncGenerator
+from typing import Any
+from uuid import uuid4
 
+from fastapi import Depends, Request
+from sqlalchemy import Table, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool, QueuePool
 
 from app.core.config import settings
+from app.core.metrics import observe_pool
+from app.core.replica import is_pinned, request_subject
+
+
+def _prepared_statement_name() -> str:
+    """Уникальное имя prepared statement — PgBouncer может сменить серверное соединение."""
+    return f"__asyncpg_{uuid4()}__"
+
+
+def engine_options(profile: str, url: str) -> dict[str, Any]:
+    """
+    Параметры create_async_engine для профиля развёртывания.
+
+    - server: пул постоянных соединений (размер и overflow из настроек),
+      pre-ping перед выдачей и пересоздание соединений старше recycle;
+    - serverless: NullPool — соединение берётся у пулера Neon на время
+      запроса и сразу возвращается; кеши prepared statements asyncpg
+      отключены, т.к. в transaction mode PgBouncer соседние запросы
+      попадают в разные серверные соединения.
+
+    Для не-PostgreSQL URL (SQLite в тестах и локально) пул не настраивается.
+    """
+    if make_url(url).get_backend_name() != "postgresql":
+        return {}
+
+    if profile == "serverless":
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                "prepared_statement_name_func": _prepared_statement_name,
+            },
+        }
+
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": True,
+    }
+
 
 # Создаём асинхронный движок SQLAlchemy для работы с PostgreSQL
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=False,  # В продакшене логирование SQL-запросов отключено
+    **engine_options(settings.DB_PROFILE, settings.DATABASE_URL),
+)
+
+# Реплика для чтения (None — все запросы идут в основную БД)
+replica_engine = (
+    create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        echo=False,
+        **engine_options(settings.DB_PROFILE, settings.DATABASE_REPLICA_URL),
+    )
+    if settings.DATABASE_REPLICA_URL
+    else None
 )
 
+# Счётчики событий пула с момента старта процесса
+_pool_counters = {"connects": 0, "checkouts": 0, "invalidations": 0}
+
+
+def _count(name: str):
+    def listener(*_args: Any) -> None:
+        _pool_counters[name] += 1
+    return listener
+
+
+event.listen(engine.sync_engine, "connect", _count("connects"))
+event.listen(engine.sync_engine.pool, "checkout", _count("checkouts"))
+event.listen(engine.sync_engine.pool, "invalidate", _count("invalidations"))
+
+# Метрики Prometheus: выданные соединения и overflow пула (основная БД и реплика)
+observe_pool(engine, "primary")
+if replica_engine is not None:
+    observe_pool(replica_engine, "replica")
+
+
+def pool_stats() -> dict[str, Any]:
+    """
+    Метрики пула подключений.
+
+    connects — сколько физических соединений открыто процессом (для
+    serverless растёт с каждым запросом — ожидаемо, соединения держит пулер);
+    для QueuePool дополнительно текущая заполненность пула.
+    """
+    pool = engine.sync_engine.pool
+    stats: dict[str, Any] = {
+        "profile": settings.DB_PROFILE,
+        "pool": type(pool).__name__,
+        **_pool_counters,
+    }
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    return stats
+
+
 # Фабрика асинхронных сессий — каждая сессия = одна единица работы с БД
 async_session = async_sessionmaker(
     engine,
@@ -24,6 +132,13 @@ async_session = async_sessionmaker(
 )
 
 
+replica_session = (
+    async_sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+
 class Base(DeclarativeBase):
     """Базовый класс для всех моделей SQLAlchemy."""
     pass
@@ -41,3 +156,65 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """
+    Фабрика сессий для использования в Depends.
+
+    Нужна эндпоинтам, которые работают с БД вне жизненного цикла
+    запроса (например, потоковая выгрузка в StreamingResponse):
+    такие эндпоинты открывают собственную сессию из фабрики.
+    """
+    return async_session
+
+
+async def _use_replica(request: Request) -> bool:
+    """Читать ли этот запрос с реплики (реплика настроена и пользователь не закреплён)."""
+    if replica_session is None:
+        return False
+    subject = request_subject(request)
+    return subject is None or not await is_pinned(subject)
+
+
+async def get_read_db(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для эндпоинтов только на чтение.
+
+    Отдаёт сессию реплики, если она настроена, иначе — основной БД (та же
+    сессия, что и get_db в этом запросе: AsyncSession не берёт соединение
+    до первого запроса, поэтому неиспользованная сессия ничего не стоит).
+    Пользователь, только что выполнивший запись, читает из основной БД
+    (app.core.replica).
+    """
+    if not await _use_replica(request):
+        yield db
+        return
+
+    async with replica_session() as session:
+        yield session
+
+
+async def get_read_session_factory(
+    request: Request,
+    factory: async_sessionmaker[AsyncSession] = Depends(get_session_factory),
+) -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий для чтения вне жизненного цикла запроса (выгрузки, отчёты)."""
+    if await _use_replica(request):
+        return replica_session
+    return factory
+
+
+def dialect_insert(session: AsyncSession, table: Table | type[Base]):
+    """
+    INSERT с поддержкой ON CONFLICT для текущего диалекта.
+
+    Продакшен работает на PostgreSQL, тесты — на SQLite; обе СУБД
+    поддерживают on_conflict_do_nothing(), но через разные конструкции.
+    """
+    if session.bind is not None and session.bind.dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
@@ -2,35 +2,41 @@
 Главный модуль приложения DanceMax API.
 
 Создаёт экземпляр FastAPI, подключает CORS-middleware,
-регистрирует все роутеры, настраивает webhook для Telegram-бота,
-rate limiting и определяет корневой эндпоинт.
+регистрирует все роутеры, rate limiting (app.core.rate_limit)
+и определяет корневой эндпоинт. Webhook Telegram-бота настраивается
+отдельной командой (manage.py set-webhook).
 """
 
 import logging
+import time
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 
-import sentry_sdk
-from aiogram.types import MenuButtonWebApp, WebAppInfo
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.util import get_remote_address
 
 from app.api.routes import api_router
-from app.core.bot import bot, setup_dispatcher
+from app.core.bot import close_bot
 from app.core.config import settings
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.query_stats import track_queries
+from app.core.rate_limit import enforce_rate_limit
+from app.core.replica import pin_to_primary, request_subject
+from app.services.domain_events import drain_events, publish_before_response
+from app.services.webhook_ingestion import ingestion
 
 logger: logging.Logger = logging.getLogger(__name__)
 
-# Sentry — инициализация при наличии DSN
+# Sentry — инициализация при наличии DSN (SDK импортируется только если нужен)
 if settings.SENTRY_DSN:
+    import sentry_sdk
+
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN,
         environment="production",
-        traces_sample_rate=0.2,
+        traces_sample_rate=settings.SENTRY_TRACES_SAMPLE_RATE,
         enable_tracing=True,
     )
     logger.info("Sentry инициализирован")
@@ -38,50 +44,31 @@ if settings.SENTRY_DSN:
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Жизненный цикл приложения: действия при запуске и остановке."""
-    # Регистрируем хендлеры бота в диспетчере
-    setup_dispatcher()
-
-    # Устанавливаем webhook для получения обновлений от Telegram
-    if settings.TELEGRAM_BOT_TOKEN:
-        webhook_url = f"{settings.BACKEND_URL}/api/bot/webhook"
-        try:
-            await bot.set_webhook(
-                url=webhook_url,
-                drop_pending_updates=True,
-            )
-            logger.info("Telegram webhook установлен: %s", webhook_url)
-
-            # Устанавливаем кнопку Web App в меню бота
-            await bot.set_chat_menu_button(
-                menu_button=MenuButtonWebApp(
-                    text="Открыть приложение",
-                    web_app=WebAppInfo(url=settings.TELEGRAM_WEBAPP_URL),
-                )
-            )
-            logger.info("Menu button установлена")
-        except Exception:
-            logger.exception("Не удалось настроить Telegram webhook")
+    """
+    Жизненный цикл приложения: действия при запуске и остановке.
+
+    Старт не обращается к сети и не загружает aiogram: бот и диспетчер
+    создаются при первом Update или сообщении, а webhook и кнопка меню
+    настраиваются один раз командой `python manage.py set-webhook`.
+    """
+    # Очередь обработки входящих Update (WEBHOOK_WORKERS=0 — обработка в запросе).
+    # В serverless функция может быть заморожена сразу после ответа —
+    # Update обрабатывается до ответа Telegram
+    workers = 0 if settings.DB_PROFILE == "serverless" else settings.WEBHOOK_WORKERS
+    ingestion.start(workers, settings.WEBHOOK_QUEUE_SIZE)
 
     logger.info("DanceMax API запущен")
     yield
 
-    # Удаляем webhook при остановке приложения
-    if settings.TELEGRAM_BOT_TOKEN:
-        try:
-            await bot.delete_webhook()
-            await bot.session.close()
-            logger.info("Telegram webhook удалён, сессия закрыта")
-        except Exception:
-            logger.exception("Ошибка при удалении webhook")
+    # Дообрабатываем принятые Update до закрытия сессии бота
+    await ingestion.stop()
+    # Публикуем доменные события уже закоммиченных транзакций
+    await drain_events()
+    await close_bot()
 
     logger.info("DanceMax API остановлен")
 
 
-# Rate limiter — ограничение частоты запросов по IP
-# Глобальный лимит: 100 запросов/минуту; admin write: 30 запросов/минуту
-limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
-
 app = FastAPI(
     title="DanceMax API",
     description="API для Telegram Web App танцевальной студии DanceMax",
@@ -89,10 +76,6 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Привязываем limiter к приложению (slowapi хранит state в app)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # CORS: разрешаем только конкретные домены фронтенда
 app.add_middleware(
     CORSMiddleware,
@@ -100,10 +83,109 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Курсор следующей страницы списков (app.core.pagination)
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
-# Подключение всех роутеров с общим префиксом /api
-app.include_router(api_router, prefix="/api")
+
+def _route_template(request: Request) -> str:
+    """
+    Шаблон маршрута для меток метрик: /api/lessons/{lesson_id}, а не
+    /api/lessons/42 — иначе число значений метки не ограничено.
+
+    route.path — шаблон внутри роутера, без префикса include_router
+    ("/api"): префикс — это статические сегменты пути перед шаблоном.
+    """
+    route = request.scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    segments = request.url.path.split("/")
+    prefix = segments[: len(segments) - len(template.split("/")[1:])]
+    return "/".join(prefix) + template
+
+
+@app.middleware("http")
+async def observe_request(request: Request, call_next):
+    """
+    Наблюдаемость запроса:
+    - метрики Prometheus: длительность по шаблону маршрута, запросы в обработке
+      (кроме SSE-потоков — у них своя метрика LIVE_STREAMS);
+    - число SQL-запросов и время в БД: заголовок Server-Timing и поля лога;
+    - повторяющиеся одинаковые SELECT (N+1) — предупреждение в лог.
+    """
+    in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(request.method)
+    in_progress.inc()
+    started = time.perf_counter()
+    status_code = 500
+    streaming = False
+    try:
+        with track_queries() as stats:
+            response = await call_next(request)
+        status_code = response.status_code
+        streaming = response.headers.get("content-type", "").startswith("text/event-stream")
+    finally:
+        # call_next возвращается после заголовков ответа: тело SSE-потока
+        # передаётся уже вне этого блока и в «запросы в обработке» не входит
+        in_progress.dec()
+        if not streaming:
+            HTTP_REQUEST_DURATION.labels(
+                request.method, _route_template(request), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+    response.headers["Server-Timing"] = stats.server_timing()
+    fields = {
+        "path": request.url.path,
+        "method": request.method,
+        "db_queries": stats.count,
+        "db_time_ms": round(stats.duration_ms, 1),
+    }
+    logger.debug("%s %s: SQL-запросов %d, %.1f мс", request.method, request.url.path,
+                 stats.count, stats.duration_ms, extra=fields)
+
+    repeated = stats.repeated()
+    if repeated:
+        logger.warning(
+            "Возможный N+1 в %s %s: %s", request.method, request.url.path,
+            "; ".join(f"{n}× {sql[:120]}" for sql, n in repeated.items()),
+            extra={**fields, "db_repeated_statements": repeated},
+        )
+    return response
+
+
+# Методы, не изменяющие данные — после них закреплять за основной БД не нужно
+_SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+@app.middleware("http")
+async def pin_writers_to_primary(request: Request, call_next):
+    """После успешной записи пользователь читает из основной БД (app.core.replica)."""
+    response = await call_next(request)
+    if (
+        settings.DATABASE_REPLICA_URL
+        and request.method not in _SAFE_METHODS
+        and response.status_code < 400
+    ):
+        subject = request_subject(request)
+        if subject is not None:
+            await pin_to_primary(subject)
+    return response
+
+
+@app.middleware("http")
+async def publish_domain_events(request: Request, call_next):
+    """
+    Ответ уходит после публикации доменных событий запроса: serverless-функцию
+    могут заморозить сразу после ответа, и фоновая публикация не завершится.
+    """
+    async with publish_before_response():
+        return await call_next(request)
+
+
+# Подключение всех роутеров с общим префиксом /api.
+# Лимит частоты запросов (app.core.rate_limit): общий 100/минуту на пользователя
+# с весом маршрута, admin write — дополнительно 30/минуту
+app.include_router(api_router, prefix="/api", dependencies=[Depends(enforce_rate_limit)])
 
 
 @app.get("/")
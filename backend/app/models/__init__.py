@@ -5,10 +5,14 @@
 видят все таблицы при генерации миграций.
 """
 
+from app.models.balance_snapshot import BalanceSnapshot
 from app.models.booking import Booking
 from app.models.direction import Direction
 from app.models.lesson import Lesson
-from app.models.promotion import Promotion
+from app.models.outbox import OutboxEvent
+from app.models.periodic_task import PeriodicTaskConfig
+from app.models.promotion import PromoCode, PromoCodeBatch, Promotion
+from app.models.reminder import ReminderSent
 from app.models.special_course import SpecialCourse
 from app.models.subscription import Subscription, SubscriptionPlan
 from app.models.teacher import Teacher, teacher_direction
@@ -25,6 +29,12 @@ __all__: list[str] = [
     "SubscriptionPlan",
     "Subscription",
     "Transaction",
+    "BalanceSnapshot",
     "Promotion",
+    "PromoCodeBatch",
+    "PromoCode",
     "SpecialCourse",
+    "ReminderSent",
+    "PeriodicTaskConfig",
+    "OutboxEvent",
 ]
@@ -0,0 +1,43 @@
+"""
+Модель снимка баланса (BalanceSnapshot).
+
+Раз в месяц для каждого пользователя с новыми записями журнала
+(transactions) фиксируется баланс на начало месяца и ID последней
+учтённой записи. Сверка баланса (app.services.ledger.reconcile_ledger)
+начинает со снимка и проверяет только записи после него, а не всю историю.
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class BalanceSnapshot(Base):
+    __tablename__ = "balance_snapshots"
+
+    # Один снимок на пользователя и месяц (повторный запуск ничего не меняет)
+    __table_args__ = (
+        UniqueConstraint("user_id", "period", name="uq_balance_snapshot_user_period"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Пользователь, чей баланс зафиксирован
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+
+    # Первое число месяца: баланс на 00:00 этого дня (UTC)
+    period: Mapped[date] = mapped_column(Date)
+
+    # Баланс на начало периода (balance_after записи last_transaction_id)
+    balance: Mapped[int] = mapped_column(Integer)
+
+    # Последняя запись журнала, вошедшая в снимок
+    last_transaction_id: Mapped[int] = mapped_column(ForeignKey("transactions.id"))
+
+    # Дата и время создания снимка
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
@@ -11,7 +11,7 @@ UniqueConstraint гарантирует, что пользователь не м
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -27,6 +27,8 @@ class Booking(Base):
             "lesson_id",
             name="uq_booking_user_lesson",
         ),
+        # Курсорная пагинация записей пользователя (app.core.pagination)
+        Index("ix_bookings_user_booked_id", "user_id", "booked_at", "id"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
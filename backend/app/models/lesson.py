@@ -7,7 +7,7 @@
 
 from datetime import date, datetime, time
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Time
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer, String, Time
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -16,6 +16,11 @@ from app.database import Base
 class Lesson(Base):
     __tablename__ = "lessons"
 
+    # Составной индекс для оконных запросов "занятия в ближайшие N часов"
+    __table_args__ = (
+        Index("ix_lessons_date_start_time", "date", "start_time"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
 
     # Внешний ключ на направление (хип-хоп, contemporary и т.д.)
@@ -0,0 +1,32 @@
+"""
+Модель исходящего доменного события (OutboxEvent).
+
+record_event() пишет событие в таблицу event_outbox в той же транзакции,
+что и изменения, которые оно описывает: событие не теряется, если процесс
+остановится между commit и публикацией (serverless-функция, падение).
+После публикации в Redis Stream строка удаляется; не удалённые строки
+публикует периодическая задача relay_domain_events
+(app.services.domain_events.relay_outbox).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    __tablename__ = "event_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Тип события (booking.created и т.д.)
+    type: Mapped[str] = mapped_column(String(50))
+
+    # Данные события — всё, что нужно потребителям
+    payload: Mapped[dict] = mapped_column(JSON)
+
+    # Время события (UTC); по нему relay отличает зависшие строки от публикуемых
+    occurred_at: Mapped[datetime] = mapped_column(DateTime, index=True)
@@ -0,0 +1,38 @@
+"""
+Модель настройки периодической задачи (PeriodicTaskConfig).
+
+Хранит переопределения расписания Celery Beat: администратор может
+изменить crontab, параметры (например, окно напоминаний) или отключить
+задачу без передеплоя. Задачи без записи в таблице работают по
+расписанию по умолчанию (celery_app.schedule.DEFAULT_SCHEDULE).
+"""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class PeriodicTaskConfig(Base):
+    __tablename__ = "periodic_tasks"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Имя записи расписания (ключ beat_schedule, например "check-lesson-reminders")
+    name: Mapped[str] = mapped_column(String(100), unique=True)
+
+    # Crontab в стандартном порядке полей: "минута час день месяц день_недели"
+    crontab: Mapped[str] = mapped_column(String(100))
+
+    # Именованные параметры задачи (например, {"window_minutes": 90})
+    kwargs: Mapped[dict] = mapped_column(JSON, default=dict)
+
+    # Флаг активности — отключённые задачи не запускаются
+    enabled: Mapped[bool] = mapped_column(Boolean, default=True)
+
+    # Дата и время последнего изменения
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
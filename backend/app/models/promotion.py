@@ -3,11 +3,14 @@
 
 Хранит информацию об акциях студии: промо-коды со скидками,
 специальные предложения, ограниченные по времени и количеству использований.
+
+Помимо общего промо-кода (Promotion.promo_code) у акции могут быть партии
+одноразовых кодов (PromoCodeBatch / PromoCode) — для партнёрских кампаний.
 """
 
-from datetime import date
+from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, Integer, String, Text
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database import Base
@@ -50,3 +53,52 @@ class Promotion(Base):
 
     # Флаг активности — неактивные акции скрыты от пользователей
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+
+
+class PromoCodeBatch(Base):
+    """Партия одноразовых промокодов, выпущенная для акции (например, для партнёра)."""
+
+    __tablename__ = "promo_code_batches"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Акция, скидку которой дают коды партии
+    promotion_id: Mapped[int] = mapped_column(ForeignKey("promotions.id"), index=True)
+
+    # Префикс кодов партии (например, "PARTNER") — помогает отличать кампании
+    prefix: Mapped[str] = mapped_column(String(12), default="")
+
+    # Количество сгенерированных кодов
+    size: Mapped[int] = mapped_column(Integer)
+
+    # Дата и время выпуска партии
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
+
+
+class PromoCode(Base):
+    """Одноразовый промокод из партии.
+
+    Хранится в нормализованном виде (верхний регистр, без пробелов и дефисов),
+    поэтому проверка кода — один поиск по уникальному индексу.
+    """
+
+    __tablename__ = "promo_codes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Партия, к которой относится код
+    batch_id: Mapped[int] = mapped_column(ForeignKey("promo_code_batches.id"), index=True)
+
+    # Денормализованная ссылка на акцию — чтобы валидация обходилась без join через партию
+    promotion_id: Mapped[int] = mapped_column(ForeignKey("promotions.id"), index=True)
+
+    # Нормализованный код (уникальный индекс — точечный поиск при валидации)
+    code: Mapped[str] = mapped_column(String(32), unique=True, index=True)
+
+    # Когда и кем код погашен (NULL — ещё не использован)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    used_by_user_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id"), nullable=True
+    )
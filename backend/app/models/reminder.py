@@ -0,0 +1,52 @@
+"""
+Модель отправленного напоминания (ReminderSent).
+
+Таблица дедупликации для периодических рассылок: каждое напоминание
+фиксируется ключом (kind, ref_id, ref_date) до отправки. Повторный запуск
+задачи (или пересечение двух запусков) не отправит сообщение дважды —
+вставка конфликтующего ключа просто игнорируется.
+
+Виды (kind):
+- lesson_reminder: напоминание о занятии (ref_id = ID бронирования, ref_date = дата занятия)
+- subscription_expiring: абонемент скоро истекает (ref_id = ID пользователя, ref_date = дата проверки)
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database import Base
+
+
+class ReminderSent(Base):
+    __tablename__ = "reminders_sent"
+
+    # Ключ дедупликации: одно напоминание данного вида на объект и дату
+    __table_args__ = (
+        UniqueConstraint(
+            "kind",
+            "ref_id",
+            "ref_date",
+            name="uq_reminder_kind_ref",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    # Вид напоминания (lesson_reminder и т.д.)
+    kind: Mapped[str] = mapped_column(String(30))
+
+    # ID объекта, к которому относится напоминание (бронирование, пользователь)
+    ref_id: Mapped[int] = mapped_column(Integer)
+
+    # Дата, к которой привязано напоминание
+    ref_date: Mapped[date] = mapped_column(Date)
+
+    # Получатель напоминания
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+
+    # Дата и время отправки
+    sent_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow
+    )
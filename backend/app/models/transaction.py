@@ -1,16 +1,22 @@
 """
 Модель транзакции (Transaction).
 
-Фиксирует все операции с балансом занятий пользователя:
+Журнал (ledger) операций с балансом занятий пользователя:
 - purchase: покупка абонемента (пополнение баланса)
 - deduction: списание занятия при записи
 - refund: возврат занятия при отмене записи
 - manual: ручная корректировка администратором
+- correction: выравнивание журнала с балансом при переходе на журнал
+
+Журнал только дополняется: записи не изменяются и не удаляются, а пишутся
+вместе с изменением users.balance через app.services.ledger.post_entry.
+balance_after — баланс после операции (нарастающий итог), поэтому баланс
+на любой момент — это balance_after последней записи до него.
 """
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -19,17 +25,25 @@ from app.database import Base
 class Transaction(Base):
     __tablename__ = "transactions"
 
+    # Индекс для курсорной пагинации истории пользователя (app.core.pagination)
+    __table_args__ = (
+        Index("ix_transactions_user_created_id", "user_id", "created_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
 
     # Внешний ключ на пользователя, которому принадлежит транзакция
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
 
-    # Тип операции: purchase / deduction / refund / manual
+    # Тип операции: purchase / deduction / refund / manual / correction
     type: Mapped[str] = mapped_column(String(20))
 
     # Сумма операции в занятиях (положительная при пополнении, отрицательная при списании)
     amount: Mapped[int] = mapped_column(Integer)
 
+    # Баланс пользователя после операции (нарастающий итог по журналу)
+    balance_after: Mapped[int] = mapped_column(Integer)
+
     # Описание операции (например, "Покупка абонемента 'Стандарт'", "Запись на занятие #42")
     description: Mapped[str] = mapped_column(String(300))
 
@@ -50,3 +64,10 @@ class Transaction(Base):
 
     # Связь с пользователем
     user: Mapped["User"] = relationship(back_populates="transactions")  # type: ignore[name-defined]  # noqa: F821
+
+
+@event.listens_for(Transaction, "before_update")
+@event.listens_for(Transaction, "before_delete")
+def _forbid_ledger_changes(_mapper, _connection, target: Transaction) -> None:
+    # Ошибку исправляет новая запись (refund, manual), а не правка старой
+    raise RuntimeError(f"Журнал баланса только дополняется: транзакция {target.id} не изменяется")
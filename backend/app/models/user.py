@@ -7,7 +7,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Index, Integer, String, text, true
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -16,6 +16,19 @@ from app.database import Base
 class User(Base):
     __tablename__ = "users"
 
+    __table_args__ = (
+        # Недоступных пользователей — доли процента: частичный индекс только по ним
+        # (отбор получателей читает почти всю таблицу, индекс по флагу ему не нужен)
+        Index(
+            "ix_users_telegram_unreachable",
+            "telegram_id",
+            postgresql_where=text("telegram_reachable = false"),
+            sqlite_where=text("telegram_reachable = 0"),
+        ),
+        # Курсорная пагинация списка учеников в админке
+        Index("ix_users_created_id", "created_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
 
     # Уникальный идентификатор пользователя в Telegram
@@ -50,6 +63,18 @@ class User(Base):
     # Флаг администратора для доступа к админ-панели
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False)
 
+    # Доступен ли пользователь для сообщений бота: сбрасывается, когда Telegram
+    # отвечает "бот заблокирован" / "чат не найден"; восстанавливается при
+    # открытии Mini App или команде /start
+    telegram_reachable: Mapped[bool] = mapped_column(
+        Boolean, default=True, server_default=true()
+    )
+
+    # Когда пользователь стал недоступен (None — доступен)
+    telegram_unreachable_at: Mapped[datetime | None] = mapped_column(
+        DateTime, nullable=True
+    )
+
     # Временные метки создания и обновления записи
     created_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow
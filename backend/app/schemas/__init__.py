@@ -4,6 +4,7 @@
 
 from app.schemas.auth import AuthResponse, TelegramAuthRequest
 from app.schemas.booking import BookingCreateRequest, BookingResponse
+from app.schemas.bootstrap import BootstrapResponse
 from app.schemas.course import SpecialCourseResponse
 from app.schemas.direction import DirectionListResponse, DirectionResponse
 from app.schemas.lesson import LessonDetailResponse, LessonResponse
@@ -43,4 +44,5 @@ __all__: list[str] = [
     "PromoValidateRequest",
     "PromoValidateResponse",
     "SpecialCourseResponse",
+    "BootstrapResponse",
 ]
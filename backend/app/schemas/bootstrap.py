@@ -0,0 +1,20 @@
+"""
+Pydantic-схема стартовых данных Mini App.
+"""
+
+from pydantic import BaseModel
+
+from app.schemas.booking import BookingResponse
+from app.schemas.lesson import LessonResponse
+from app.schemas.subscription import SubscriptionResponse
+from app.schemas.user import UserResponse
+
+
+class BootstrapResponse(BaseModel):
+    """Всё, что нужно Mini App на первом экране, одним ответом."""
+    profile: UserResponse
+    balance: int
+    active_subscriptions: list[SubscriptionResponse]
+    today_lessons: list[LessonResponse]  # с is_booked / booking_id текущего пользователя
+    upcoming_bookings: list[BookingResponse]  # активные записи с сегодняшнего дня
+    catalog_version: str  # меняется при любом изменении каталога в админке
@@ -32,3 +32,15 @@ class LessonDetailResponse(LessonResponse):
     """Детальная информация о занятии с полными данными направления и преподавателя."""
     direction: DirectionResponse
     teacher: TeacherResponse
+
+
+class DirectionDetailResponse(BaseModel):
+    """Страница направления: описание и ближайшие занятия."""
+    direction: DirectionResponse
+    upcoming_lessons: list[LessonResponse]
+
+
+class TeacherDetailResponse(BaseModel):
+    """Страница преподавателя: профиль и ближайшее расписание."""
+    teacher: TeacherResponse
+    schedule: list[LessonResponse]
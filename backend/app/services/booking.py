@@ -6,7 +6,8 @@ from fastapi import HTTPException, status
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Booking, Lesson, Transaction, User
+from app.models import Booking, Lesson, User
+from app.services.ledger import post_entry
 
 
 class BookingService:
@@ -92,18 +93,8 @@ class BookingService:
         )
         self.db.add(booking)
 
-        # Списываем занятие с баланса
-        user.balance -= 1
-
-        # Создаём транзакцию списания
-        transaction = Transaction(
-            user_id=user_id,
-            type="deduction",
-            amount=-1,
-            description="Запись на занятие",
-            booking_id=booking.id,
-        )
-        self.db.add(transaction)
+        # Списываем занятие с баланса и создаём транзакцию списания
+        await post_entry(self.db, user, "deduction", -1, "Запись на занятие", booking=booking)
 
         await self.db.commit()
         await self.db.refresh(booking)
@@ -142,20 +133,10 @@ class BookingService:
         booking.status = "cancelled"
         booking.cancelled_at = datetime.utcnow()
 
-        # Возвращаем занятие на баланс
+        # Возвращаем занятие на баланс и создаём транзакцию возврата
         user = await self.db.get(User, user_id)
         if user:
-            user.balance += 1
-
-        # Транзакция возврата
-        transaction = Transaction(
-            user_id=user_id,
-            type="refund",
-            amount=1,
-            description="Отмена записи на занятие",
-            booking_id=booking_id,
-        )
-        self.db.add(transaction)
+            await post_entry(self.db, user, "refund", 1, "Отмена записи на занятие", booking=booking)
 
         await self.db.commit()
         await self.db.refresh(booking)
@@ -0,0 +1,146 @@
+"""
+Расписание дня для команды бота /schedule.
+
+Текст расписания рендерится одним запросом (занятия + направление +
+преподаватель + число активных записей) и кешируется по дате: в Redis,
+если он настроен, и в памяти процесса. Кеш сбрасывается при изменении
+занятий (админка) и заполненности (запись, отмена, отметка посещения),
+поэтому серия команд /schedule стоит одного запроса к БД.
+
+Текст содержит названия направлений и имена преподавателей, поэтому
+запись кеша помечена версиями тегов каталога "directions" и "teachers":
+после их изменения в админке запись считается устаревшей.
+"""
+
+import logging
+import time
+from datetime import date
+
+from redis.exceptions import RedisError
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.redis import get_redis
+from app.models.booking import Booking
+from app.models.direction import Direction
+from app.models.lesson import Lesson
+from app.models.teacher import Teacher
+from app.services.catalog_cache import bump_catalog_version, catalog_versions
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "dancemax:bot-schedule"
+
+# TTL кеша в Redis (страховка на случай пропущенной инвалидации), секунд
+REDIS_TTL_SECONDS = 10 * 60
+
+# TTL кеша в памяти: короче, т.к. инвалидация из другого процесса
+# без Redis сюда не доходит
+LOCAL_TTL_SECONDS = 60
+
+# Теги каталога, данные которых попадают в текст расписания
+CATALOG_TAGS = ("directions", "teachers")
+
+_local_cache: dict[date, tuple[float, str, str]] = {}
+
+
+def _cache_key(day: date) -> str:
+    return f"{CACHE_PREFIX}:{day.isoformat()}"
+
+
+async def render_day_schedule(db: AsyncSession, day: date) -> str:
+    """Сформировать текст расписания на день (один запрос к БД)."""
+    occupied = func.count(Booking.id).label("occupied")
+    result = await db.execute(
+        select(
+            Lesson.start_time,
+            Lesson.end_time,
+            Lesson.room,
+            Lesson.max_spots,
+            Lesson.is_cancelled,
+            Direction.name.label("direction_name"),
+            Teacher.name.label("teacher_name"),
+            occupied,
+        )
+        .join(Direction, Lesson.direction_id == Direction.id)
+        .join(Teacher, Lesson.teacher_id == Teacher.id)
+        .outerjoin(
+            Booking,
+            and_(Booking.lesson_id == Lesson.id, Booking.status == "active"),
+        )
+        .where(Lesson.date == day)
+        .group_by(Lesson.id, Direction.name, Teacher.name)
+        .order_by(Lesson.start_time)
+    )
+    rows = result.all()
+
+    header = f"<b>Расписание на {day.strftime('%d.%m')}</b>"
+    if not rows:
+        return f"{header}\n\nЗанятий нет."
+
+    lines = [header]
+    for row in rows:
+        slot = f"{row.start_time.strftime('%H:%M')}–{row.end_time.strftime('%H:%M')}"
+        if row.is_cancelled:
+            status = "отменено"
+        else:
+            free = max(row.max_spots - row.occupied, 0)
+            status = f"свободно {free} из {row.max_spots}" if free else "мест нет"
+        lines.append(
+            f"\n<b>{slot}</b> {row.direction_name} — {row.teacher_name}\n"
+            f"{row.room} · {status}"
+        )
+    return "\n".join(lines)
+
+
+async def get_day_schedule(db: AsyncSession, day: date) -> str:
+    """Текст расписания на день из кеша; при промахе — рендер и запись в кеш."""
+    version = ".".join(map(str, await catalog_versions(*CATALOG_TAGS)))
+    cached = _local_cache.get(day)
+    if cached is not None and cached[0] > time.monotonic() and cached[1] == version:
+        return cached[2]
+
+    redis = get_redis()
+    if redis is not None:
+        try:
+            # Значение в Redis — "версия|текст"
+            value = await redis.get(_cache_key(day))
+            if value is not None:
+                cached_version, _, text = value.partition("|")
+                if cached_version == version:
+                    _local_cache[day] = (time.monotonic() + LOCAL_TTL_SECONDS, version, text)
+                    return text
+        except RedisError:
+            logger.warning("Redis недоступен, кеш расписания только в памяти", exc_info=True)
+
+    text = await render_day_schedule(db, day)
+
+    _local_cache[day] = (time.monotonic() + LOCAL_TTL_SECONDS, version, text)
+    if redis is not None:
+        try:
+            await redis.set(_cache_key(day), f"{version}|{text}", ex=REDIS_TTL_SECONDS)
+        except RedisError:
+            logger.warning("Не удалось сохранить расписание в Redis", exc_info=True)
+    return text
+
+
+async def invalidate_day_schedule(*days: date, lessons_changed: bool = False) -> None:
+    """
+    Сбросить кеш расписания на указанные даты.
+
+    Заодно увеличивает версию тега "schedule" кеша каталога — от неё
+    зависят ETag публичного расписания (заполненность). lessons_changed —
+    изменились сами занятия или чужие записи (админка): увеличивается и
+    версия "lessons", от которой зависят личные ответы всех пользователей.
+    """
+    await bump_catalog_version(*(("schedule", "lessons") if lessons_changed else ("schedule",)))
+    for day in days:
+        _local_cache.pop(day, None)
+
+    redis = get_redis()
+    if redis is None or not days:
+        return
+    try:
+        await redis.delete(*(_cache_key(day) for day in days))
+    except RedisError:
+        logger.warning("Не удалось сбросить кеш расписания в Redis", exc_info=True)
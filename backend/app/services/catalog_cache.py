@@ -0,0 +1,171 @@
+"""
+Кеш каталога: направления, преподаватели, спецкурсы, тарифы, акции.
+
+Данные каталога меняются только из админки, а читаются на каждом экране
+Mini App. Готовое JSON-тело ответа кешируется в два уровня:
+- L1 — в памяти процесса;
+- L2 — в Redis, общий для всех инстансов API.
+
+Актуальность определяется версиями тегов ("directions", "teachers", ...):
+маршрут объявляет, от каких тегов зависит его ответ, а админка после
+изменения увеличивает версию тега (bump_catalog_version). Версии всех
+тегов читаются одним MGET — каждый процесс видит изменение на следующем
+же запросе. Без Redis (или при его сбое) версии живут в памяти процесса:
+изменение из другого процесса сюда не дойдёт, поэтому к ним добавляется
+номер интервала LOCAL_TTL_SECONDS — ETag и кеши, построенные на версиях,
+устаревают не позже чем через интервал, а не остаются верными навсегда.
+
+Маршруты каталога собирают ответ из основной БД, а не из реплики:
+иначе отстающая реплика может закешировать старые данные под новой версией.
+
+У каждого тела есть сильный ETag (хеш тела, считается один раз при
+заполнении кеша): повторный запрос с If-None-Match получает 304.
+"""
+
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from fastapi import Request, Response, status
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from app.core.responses import etag_matches, validator_headers
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "dancemax:catalog"
+
+# TTL тела в Redis: версия в ключе, так что это только уборка старых версий
+REDIS_TTL_SECONDS = 24 * 60 * 60
+
+# TTL записи L1 — страховка на случай работы без Redis
+LOCAL_TTL_SECONDS = 60
+
+# Все теги каталога — из их версий складывается catalog_version в /bootstrap
+CATALOG_TAGS = ("directions", "teachers", "courses", "plans", "promos")
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Готовое JSON-тело ответа и его ETag."""
+
+    body: bytes
+    etag: str
+
+    @classmethod
+    def from_body(cls, body: bytes) -> "CachedBody":
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"')
+
+
+_local_versions: dict[str, int] = {}
+_local: dict[str, tuple[tuple[int, ...], float, CachedBody]] = {}
+
+
+def _version_key(tag: str) -> str:
+    return f"{CACHE_PREFIX}:version:{tag}"
+
+
+def _body_key(key: str, versions: tuple[int, ...]) -> str:
+    return f"{CACHE_PREFIX}:{key}:{'.'.join(map(str, versions))}"
+
+
+async def catalog_versions(*tags: str) -> tuple[int, ...]:
+    """
+    Текущие версии тегов (один запрос к Redis).
+
+    Без Redis — версии из памяти процесса и последним элементом номер
+    интервала LOCAL_TTL_SECONDS.
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            values = await redis.mget([_version_key(tag) for tag in tags])
+            return tuple(int(value or 0) for value in values)
+        except RedisError:
+            logger.warning("Redis недоступен, версии каталога из памяти процесса", exc_info=True)
+    local = tuple(_local_versions.get(tag, 0) for tag in tags)
+    return (*local, int(time.time() // LOCAL_TTL_SECONDS))
+
+
+async def bump_catalog_version(*tags: str) -> None:
+    """Отметить изменение данных тегов — все процессы сбросят зависимые ответы."""
+    for tag in tags:
+        _local_versions[tag] = _local_versions.get(tag, 0) + 1
+
+    redis = get_redis()
+    if redis is None or not tags:
+        return
+    try:
+        async with redis.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(_version_key(tag))
+            await pipe.execute()
+    except RedisError:
+        logger.warning("Не удалось обновить версию каталога в Redis", exc_info=True)
+
+
+def clear_local_cache() -> None:
+    """Сбросить L1 и локальные версии (тесты)."""
+    _local.clear()
+    _local_versions.clear()
+
+
+async def get_cached(
+    key: str,
+    tags: tuple[str, ...],
+    build: Callable[[], Awaitable[bytes]],
+) -> CachedBody:
+    """
+    Тело ответа из кеша; при промахе — build() и запись в оба уровня.
+
+    Args:
+        key: ключ ответа (с параметрами, от которых он зависит).
+        tags: теги каталога, от которых зависит ответ.
+        build: сборка JSON-тела из БД.
+    """
+    versions = await catalog_versions(*tags)
+    cached = _local.get(key)
+    if cached is not None and cached[0] == versions and cached[1] > time.monotonic():
+        return cached[2]
+
+    redis = get_redis()
+    entry: CachedBody | None = None
+    if redis is not None:
+        try:
+            # Клиент декодирует ответы в str — тело хранится как UTF-8 JSON
+            body = await redis.get(_body_key(key, versions))
+            if body is not None:
+                entry = CachedBody.from_body(body.encode())
+        except RedisError:
+            logger.warning("Redis недоступен, кеш каталога только в памяти", exc_info=True)
+
+    if entry is None:
+        entry = CachedBody.from_body(await build())
+        if redis is not None:
+            try:
+                await redis.set(_body_key(key, versions), entry.body, ex=REDIS_TTL_SECONDS)
+            except RedisError:
+                logger.warning("Не удалось сохранить ответ каталога в Redis", exc_info=True)
+
+    _local[key] = (versions, time.monotonic() + LOCAL_TTL_SECONDS, entry)
+    return entry
+
+
+def cached_response(request: Request, entry: CachedBody) -> Response:
+    """200 с телом или 304, если у клиента та же версия (If-None-Match)."""
+    headers = validator_headers(entry.etag)
+    if etag_matches(request, entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, headers=headers, media_type="application/json")
+
+
+async def catalog_response(
+    request: Request,
+    key: str,
+    tags: tuple[str, ...],
+    build: Callable[[], Awaitable[bytes]],
+) -> Response:
+    """Ответ маршрута каталога из кеша с ETag."""
+    return cached_response(request, await get_cached(key, tags, build))
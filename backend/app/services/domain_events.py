@@ -0,0 +1,327 @@
+"""
+Доменные события: запись, отмена, отмена занятия, оплата, истечение абонемента.
+
+Обработчик запроса не выполняет побочные эффекты сам (уведомления,
+статистика), а регистрирует событие в сессии — record_event(). Событие
+пишется в таблицу event_outbox в той же транзакции, что и данные: при
+rollback оно отбрасывается вместе с ними, а после commit не теряется.
+
+После commit (хук SQLAlchemy after_commit) события публикуются в Redis
+Stream STREAM и удаляются из outbox. Middleware API дожидается публикации
+до ответа (publish_before_response): serverless-функцию (Vercel) могут
+заморозить сразу после ответа. Если процесс всё же остановился раньше,
+оставшиеся в outbox события публикует задача Celery relay_domain_events
+(relay_outbox, раз в минуту) — публикация at-least-once.
+
+Потребители (app.services.event_consumers) объединены в группы
+(consumer groups Redis): у каждой группы своя позиция в потоке, а
+экземпляры одной группы делят события между собой — группы независимы
+и масштабируются горизонтально (`python manage.py consume-events`).
+Событие подтверждается (XACK) только после успешной обработки: упавший
+экземпляр не теряет события — их забирает другой (at-least-once),
+поэтому обработчики должны переносить повторную доставку: дедупликация —
+по DomainEvent.key (ID строки outbox одинаков и при повторной публикации
+relay). Новая группа читает поток с начала (он ограничен STREAM_MAXLEN):
+события, опубликованные до первого запуска потребителей, не теряются.
+
+В продакшене потребители работают только в долгоживущем сервисе
+events_consumer (docker-compose), а relay — в воркере maintenance;
+функции API на Vercel события лишь публикуют в общий Redis.
+
+Без Redis (или если он недоступен при публикации) события обрабатываются
+потребителями в процессе, который их опубликовал: в запросе до ответа
+или в relay.
+
+Payload несёт всё, что нужно потребителям (Telegram ID, дата и время
+занятия): обработчикам не нужна БД, а событие описывает состояние на
+момент commit.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+
+from app.core.metrics import DOMAIN_EVENTS_PUBLISHED
+from app.core.redis import get_redis
+from app.models.outbox import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+STREAM = "dancemax:events"
+
+# Приблизительная длина потока: старые события вытесняются (MAXLEN ~)
+STREAM_MAXLEN = 100_000
+
+EVENT_TYPES = (
+    "booking.created",
+    "booking.cancelled",
+    "lesson.cancelled",
+    "payment.succeeded",
+    "subscription.expired",
+)
+
+# Строки outbox моложе этого возраста ещё публикует записавший их процесс
+RELAY_DELAY_SECONDS = 60
+
+# Сколько событий relay публикует за один запуск
+RELAY_BATCH_SIZE = 500
+
+# Ключи в Session.info: события текущей транзакции (с их строками outbox)
+# и движок сессии — им удаляются строки после публикации
+_PENDING_KEY = "dancemax_domain_events"
+_ENGINE_KEY = "dancemax_domain_events_engine"
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    """
+    Событие: тип, данные и время; id — ID записи в потоке (если из Redis),
+    outbox_id — ID строки event_outbox (не меняется при повторной публикации).
+    """
+
+    type: str
+    payload: dict[str, Any]
+    occurred_at: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+    id: str | None = None
+    outbox_id: int | None = None
+
+    @property
+    def key(self) -> str | None:
+        """Устойчивый ключ события для дедупликации у потребителей."""
+        if self.outbox_id is not None:
+            return f"outbox:{self.outbox_id}"
+        if self.id is not None:
+            return f"stream:{self.id}"
+        return None
+
+    def to_fields(self) -> dict[str, str]:
+        fields = {
+            "type": self.type,
+            "payload": json.dumps(self.payload, ensure_ascii=False),
+            "occurred_at": self.occurred_at,
+        }
+        if self.outbox_id is not None:
+            fields["outbox_id"] = str(self.outbox_id)
+        return fields
+
+    @classmethod
+    def from_fields(cls, entry_id: str, fields: dict[str, str]) -> "DomainEvent":
+        return cls(
+            type=fields["type"],
+            payload=json.loads(fields["payload"]),
+            occurred_at=fields["occurred_at"],
+            id=entry_id,
+            outbox_id=int(fields["outbox_id"]) if "outbox_id" in fields else None,
+        )
+
+
+Handler = Callable[[DomainEvent], Awaitable[None]]
+
+# Группа потребителей -> тип события -> обработчики
+_consumers: dict[str, dict[str, list[Handler]]] = {}
+
+
+def consumer(group: str, *event_types: str) -> Callable[[Handler], Handler]:
+    """Зарегистрировать обработчик событий в группе потребителей."""
+
+    def register(handler: Handler) -> Handler:
+        handlers = _consumers.setdefault(group, {})
+        for event_type in event_types:
+            handlers.setdefault(event_type, []).append(handler)
+        return handler
+
+    return register
+
+
+def consumer_groups() -> dict[str, dict[str, list[Handler]]]:
+    """Все группы потребителей (с загрузкой модуля обработчиков)."""
+    import app.services.event_consumers  # noqa: F401
+
+    return _consumers
+
+
+async def handle_event(group: str, domain_event: DomainEvent) -> None:
+    """Выполнить обработчики группы для события (ошибка пробрасывается)."""
+    for handler in consumer_groups().get(group, {}).get(domain_event.type, []):
+        await handler(domain_event)
+
+
+def record_event(session: AsyncSession, event_type: str, **payload: Any) -> None:
+    """
+    Зарегистрировать событие — оно будет опубликовано после commit сессии.
+
+    Вызывается внутри транзакции, вместе с изменениями, которые событие
+    описывает.
+
+    Пример:
+        record_event(db, "booking.cancelled", booking_id=booking.id, ...)
+        await db.commit()
+    """
+    if event_type not in EVENT_TYPES:
+        raise ValueError(f"Неизвестный тип события: {event_type}")
+    occurred_at = datetime.now(timezone.utc)
+    row = OutboxEvent(
+        type=event_type, payload=payload, occurred_at=occurred_at.replace(tzinfo=None)
+    )
+    session.add(row)
+    session.info[_ENGINE_KEY] = session.bind
+    session.info.setdefault(_PENDING_KEY, []).append(
+        (DomainEvent(type=event_type, payload=payload, occurred_at=occurred_at.isoformat()), row)
+    )
+
+
+# Задачи публикации: ссылки держим, чтобы задачи не собрал GC до завершения
+_publishing: set[asyncio.Task] = set()
+
+# Задачи публикации текущего HTTP-запроса (publish_before_response)
+_request_tasks: ContextVar[set[asyncio.Task] | None] = ContextVar(
+    "domain_event_tasks", default=None
+)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_after_commit(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    engine = session.info.pop(_ENGINE_KEY, None)
+    if not pending:
+        return
+    # identity доступна и у объектов, истёкших после commit
+    outbox_ids = [inspect(row).identity[0] for _, row in pending]
+    events = [
+        replace(domain_event, outbox_id=outbox_id)
+        for (domain_event, _), outbox_id in zip(pending, outbox_ids)
+    ]
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning("Нет event loop — события %s опубликует relay", [e.type for e in events])
+        return
+    task = loop.create_task(_publish_committed(events, engine, outbox_ids))
+    _publishing.add(task)
+    task.add_done_callback(_publishing.discard)
+    request_tasks = _request_tasks.get()
+    if request_tasks is not None:
+        request_tasks.add(task)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted(session: Session, transaction: SessionTransaction) -> None:
+    # Корневая транзакция закончилась без commit (rollback, close) —
+    # события отбрасываются вместе со строками outbox; SAVEPOINT
+    # (begin_nested) их не трогает
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+        session.info.pop(_ENGINE_KEY, None)
+
+
+async def _publish_committed(
+    events: list[DomainEvent],
+    engine: AsyncEngine,
+    outbox_ids: list[int],
+) -> None:
+    """Опубликовать события закоммиченной транзакции и удалить их из outbox."""
+    await publish_events(events)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(outbox_ids)))
+    except SQLAlchemyError:
+        logger.warning("Не удалось удалить события из outbox — relay опубликует их повторно",
+                       exc_info=True)
+
+
+@asynccontextmanager
+async def publish_before_response() -> AsyncIterator[None]:
+    """Дождаться публикации событий, закоммиченных внутри блока (middleware запроса)."""
+    tasks: set[asyncio.Task] = set()
+    token = _request_tasks.set(tasks)
+    try:
+        yield
+    finally:
+        _request_tasks.reset(token)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def publish_events(events: list[DomainEvent]) -> None:
+    """Опубликовать события в поток; без Redis — обработать в этом процессе."""
+    redis = get_redis()
+    if redis is not None:
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for domain_event in events:
+                    pipe.xadd(
+                        STREAM,
+                        domain_event.to_fields(),
+                        maxlen=STREAM_MAXLEN,
+                        approximate=True,
+                    )
+                await pipe.execute()
+        except RedisError:
+            logger.error("Не удалось опубликовать события в Redis, обработка в процессе", exc_info=True)
+        else:
+            for domain_event in events:
+                DOMAIN_EVENTS_PUBLISHED.labels(domain_event.type).inc()
+            return
+
+    for domain_event in events:
+        for group in consumer_groups():
+            try:
+                await handle_event(group, domain_event)
+            except Exception:
+                logger.exception("Ошибка обработки события %s группой %s", domain_event.type, group)
+
+
+async def relay_outbox(db: AsyncSession) -> int:
+    """
+    Опубликовать события, оставшиеся в outbox дольше RELAY_DELAY_SECONDS.
+
+    Такие строки остаются, если процесс остановился между commit и
+    публикацией. Событие может быть опубликовано повторно (процесс успел
+    опубликовать, но не удалить строку) — потребители это переносят.
+
+    Returns:
+        Количество опубликованных событий.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=RELAY_DELAY_SECONDS)
+    rows = (
+        await db.scalars(
+            select(OutboxEvent)
+            .where(OutboxEvent.occurred_at < cutoff)
+            .order_by(OutboxEvent.id)
+            .limit(RELAY_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+    if not rows:
+        return 0
+
+    await publish_events([
+        DomainEvent(
+            type=row.type,
+            payload=row.payload,
+            occurred_at=row.occurred_at.replace(tzinfo=timezone.utc).isoformat(),
+            outbox_id=row.id,
+        )
+        for row in rows
+    ])
+    await db.execute(delete(OutboxEvent).where(OutboxEvent.id.in_([row.id for row in rows])))
+    await db.commit()
+    return len(rows)
+
+
+async def drain_events() -> None:
+    """Дождаться публикации событий уже закоммиченных транзакций (остановка, тесты)."""
+    while _publishing:
+        await asyncio.gather(*_publishing, return_exceptions=True)
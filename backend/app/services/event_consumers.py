@@ -0,0 +1,148 @@
+"""
+Потребители доменных событий.
+
+Группы:
+- notifications — сообщения пользователям в Telegram о записи, отмене,
+  отмене занятия и оплате;
+- stats — дневные счётчики событий в Redis (HINCRBY по типу события).
+
+Доставка at-least-once (повтор после XCLAIM, повторная публикация из
+outbox): обработчики отбрасывают повтор по ключу события (DomainEvent.key)
+через SET NX в Redis. notifications отмечает пару (событие, получатель)
+до отправки и снимает отметку, если отправка упала, — пользователь не
+получает одно уведомление дважды, а упавшее уходит при повторе.
+
+Сброс кешей расписания и каталога остаётся в обработчиках запросов:
+ETag ответа сразу после записи должен учитывать её (read-your-writes),
+а потребитель обрабатывает событие с задержкой.
+"""
+
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from app.services.domain_events import EVENT_TYPES, DomainEvent, consumer
+from app.services.notification import (
+    notify_booking_cancelled,
+    notify_booking_created,
+    notify_lesson_cancelled,
+    notify_payment_succeeded,
+)
+
+logger = logging.getLogger(__name__)
+
+STATS_PREFIX = "dancemax:stats"
+
+# Сколько хранить дневные счётчики, секунд
+STATS_TTL_SECONDS = 400 * 24 * 60 * 60
+
+# Сколько помнить ID учтённых событий (дольше, чем живёт необработанное событие)
+STATS_DEDUPE_SECONDS = 7 * 24 * 60 * 60
+
+NOTIFY_DEDUPE_PREFIX = "dancemax:notified"
+
+# Сколько помнить отправленные уведомления (как и учтённые события)
+NOTIFY_DEDUPE_SECONDS = STATS_DEDUPE_SECONDS
+
+
+def _lesson_info(payload: dict[str, Any], with_direction: bool = True) -> str:
+    when = f"{payload['lesson_date']} {payload['start_time']}"
+    return f"{payload['direction']}\n{when}" if with_direction else when
+
+
+async def _notify_once(
+    event: DomainEvent,
+    telegram_id: int,
+    send: Callable[..., Awaitable[bool]],
+    **kwargs: Any,
+) -> None:
+    """
+    Отправить уведомление о событии получателю, если оно ещё не отправлялось.
+
+    Отметка (событие, получатель) ставится до отправки и снимается, если
+    отправка не удалась, — повторная доставка события отправит его снова.
+    Без Redis (или без ключа события) повторов из потока нет — отправка сразу.
+    """
+    redis = get_redis()
+    key = f"{NOTIFY_DEDUPE_PREFIX}:{event.key}:{telegram_id}"
+    claimed = False
+    if redis is not None and event.key is not None:
+        try:
+            if not await redis.set(key, 1, nx=True, ex=NOTIFY_DEDUPE_SECONDS):
+                logger.info("Уведомление %s для %d уже отправлено", event.key, telegram_id)
+                return
+            claimed = True
+        except RedisError:
+            logger.warning("Redis недоступен, уведомление без дедупликации", exc_info=True)
+
+    sent = False
+    try:
+        sent = await send(user_telegram_id=telegram_id, **kwargs)
+    finally:
+        if claimed and not sent:
+            try:
+                await redis.delete(key)
+            except RedisError:
+                logger.warning("Не удалось снять отметку уведомления %s", key, exc_info=True)
+
+
+@consumer("notifications", "booking.created")
+async def notify_on_booking_created(event: DomainEvent) -> None:
+    await _notify_once(
+        event,
+        event.payload["telegram_id"],
+        notify_booking_created,
+        lesson_info=_lesson_info(event.payload),
+    )
+
+
+@consumer("notifications", "booking.cancelled")
+async def notify_on_booking_cancelled(event: DomainEvent) -> None:
+    await _notify_once(
+        event,
+        event.payload["telegram_id"],
+        notify_booking_cancelled,
+        lesson_info=_lesson_info(event.payload),
+    )
+
+
+@consumer("notifications", "lesson.cancelled")
+async def notify_on_lesson_cancelled(event: DomainEvent) -> None:
+    lesson_info = _lesson_info(event.payload, with_direction=False)
+    for telegram_id in event.payload["telegram_ids"]:
+        await _notify_once(
+            event,
+            telegram_id,
+            notify_lesson_cancelled,
+            lesson_info=lesson_info,
+            reason=event.payload["reason"],
+        )
+
+
+@consumer("notifications", "payment.succeeded")
+async def notify_on_payment_succeeded(event: DomainEvent) -> None:
+    await _notify_once(
+        event,
+        event.payload["telegram_id"],
+        notify_payment_succeeded,
+        plan_name=event.payload["plan_name"],
+        balance=event.payload["balance"],
+    )
+
+
+@consumer("stats", *EVENT_TYPES)
+async def count_event(event: DomainEvent) -> None:
+    """Учесть событие в счётчиках дня (один раз на ключ события)."""
+    redis = get_redis()
+    if redis is None or event.key is None:
+        return
+    if not await redis.set(f"{STATS_PREFIX}:seen:{event.key}", 1, nx=True, ex=STATS_DEDUPE_SECONDS):
+        return
+    key = f"{STATS_PREFIX}:events:{event.occurred_at[:10]}"
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.hincrby(key, event.type, 1)
+        pipe.expire(key, STATS_TTL_SECONDS)
+        await pipe.execute()
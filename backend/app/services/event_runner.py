@@ -0,0 +1,156 @@
+"""
+Запуск групп потребителей доменных событий (Redis Streams).
+
+Каждый экземпляр читает новые события группы (XREADGROUP ">") и
+подтверждает событие (XACK) после успешной обработки. Неподтверждённые
+события — упал обработчик или экземпляр — через CLAIM_IDLE_MS забирает
+любой живой экземпляр группы (XPENDING + XCLAIM); после MAX_DELIVERIES
+попыток событие снимается с ошибкой в логе, чтобы не блокировать группу.
+
+Отставание группы (XINFO GROUPS: lag и pending) раз в LAG_INTERVAL_SECONDS
+пишется в метрики dancemax_domain_events_lag / _pending.
+
+Запуск: `python manage.py consume-events [--group notifications] ...`
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError, ResponseError
+
+from app.core.metrics import DOMAIN_EVENTS_HANDLED, DOMAIN_EVENTS_LAG, DOMAIN_EVENTS_PENDING
+from app.core.redis import get_redis
+from app.services.domain_events import STREAM, DomainEvent, handle_event
+
+logger = logging.getLogger(__name__)
+
+# Ожидание новых событий за один XREADGROUP, мс (меньше таймаута сокета Redis)
+BLOCK_MS = 1000
+
+# Сколько событий читать за раз
+BATCH_SIZE = 50
+
+# Через сколько неподтверждённое событие забирает другой экземпляр, мс
+CLAIM_IDLE_MS = 60_000
+
+# Сколько раз событие выдаётся, прежде чем его снимут как необрабатываемое
+MAX_DELIVERIES = 5
+
+# Как часто обновлять метрики отставания, секунд
+LAG_INTERVAL_SECONDS = 15
+
+# Пауза после ошибки Redis, секунд
+RECONNECT_SECONDS = 2
+
+
+def default_consumer_name() -> str:
+    """Имя экземпляра в группе: хост и PID."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+async def ensure_group(redis: Redis, group: str) -> None:
+    """
+    Создать группу (и поток), если её нет.
+
+    Новая группа читает поток с начала: события, опубликованные API до
+    первого запуска потребителей, обрабатываются (поток ограничен MAXLEN).
+    """
+    try:
+        await redis.xgroup_create(STREAM, group, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+class GroupRunner:
+    """Экземпляр потребителя одной группы."""
+
+    def __init__(self, redis: Redis, group: str, consumer_name: str) -> None:
+        self.redis = redis
+        self.group = group
+        self.consumer_name = consumer_name
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Обрабатывать события до stop."""
+        await ensure_group(self.redis, self.group)
+        logger.info("Потребитель %s группы %s запущен", self.consumer_name, self.group)
+        next_lag_update = 0.0
+        while not stop.is_set():
+            try:
+                if time.monotonic() >= next_lag_update:
+                    await self.update_lag()
+                    next_lag_update = time.monotonic() + LAG_INTERVAL_SECONDS
+                await self.reclaim()
+                await self.read_new()
+            except RedisError:
+                logger.warning("Ошибка Redis в группе %s", self.group, exc_info=True)
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+    async def read_new(self) -> None:
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer_name,
+            {STREAM: ">"},
+            count=BATCH_SIZE,
+            block=BLOCK_MS,
+        )
+        for _stream, entries in response or []:
+            for entry_id, fields in entries:
+                await self.process(entry_id, fields)
+
+    async def reclaim(self) -> None:
+        """Забрать давно не подтверждённые события группы (в том числе упавших экземпляров)."""
+        pending = await self.redis.xpending_range(
+            STREAM, self.group, min="-", max="+", count=BATCH_SIZE, idle=CLAIM_IDLE_MS
+        )
+        if not pending:
+            return
+
+        exhausted = [p["message_id"] for p in pending if p["times_delivered"] >= MAX_DELIVERIES]
+        if exhausted:
+            await self.redis.xack(STREAM, self.group, *exhausted)
+            DOMAIN_EVENTS_HANDLED.labels(self.group, "dropped").inc(len(exhausted))
+            logger.error(
+                "Группа %s: события %s сняты после %d попыток", self.group, exhausted, MAX_DELIVERIES
+            )
+
+        retry = [p["message_id"] for p in pending if p["times_delivered"] < MAX_DELIVERIES]
+        if not retry:
+            return
+        claimed = await self.redis.xclaim(
+            STREAM, self.group, self.consumer_name, CLAIM_IDLE_MS, retry
+        )
+        for entry_id, fields in claimed:
+            await self.process(entry_id, fields)
+
+    async def process(self, entry_id: str, fields: dict[str, str]) -> None:
+        """Обработать событие и подтвердить; при ошибке оно остаётся в pending."""
+        try:
+            await handle_event(self.group, DomainEvent.from_fields(entry_id, fields))
+        except Exception:
+            DOMAIN_EVENTS_HANDLED.labels(self.group, "failed").inc()
+            logger.exception("Группа %s: ошибка обработки события %s", self.group, entry_id)
+            return
+        await self.redis.xack(STREAM, self.group, entry_id)
+        DOMAIN_EVENTS_HANDLED.labels(self.group, "acked").inc()
+
+    async def update_lag(self) -> None:
+        for info in await self.redis.xinfo_groups(STREAM):
+            if info["name"] == self.group:
+                # lag — с Redis 7; None, если его нельзя определить после обрезки потока
+                DOMAIN_EVENTS_LAG.labels(self.group).set(info.get("lag") or 0)
+                DOMAIN_EVENTS_PENDING.labels(self.group).set(info["pending"])
+
+
+async def run_consumers(groups: list[str], consumer_name: str, stop: asyncio.Event) -> None:
+    """Запустить экземпляры указанных групп в одном процессе."""
+    redis = get_redis()
+    if redis is None:
+        raise RuntimeError("Потребителям доменных событий нужен REDIS_URL")
+    await asyncio.gather(
+        *(GroupRunner(redis, group, consumer_name).run(stop) for group in groups)
+    )
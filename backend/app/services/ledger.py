@@ -0,0 +1,332 @@
+"""
+Журнал баланса занятий (ledger).
+
+users.balance меняется только через post_entry(): атомарный UPDATE
+balance = balance + amount и запись журнала (transactions) с итогом
+balance_after в одной транзакции — баланс и журнал не расходятся, а
+параллельные списания не уводят баланс в минус (проверка в том же UPDATE).
+UPDATE блокирует строку пользователя до commit, поэтому записи одного
+пользователя идут в журнале в порядке id.
+
+Раз в месяц take_balance_snapshots() фиксирует баланс каждого пользователя
+с новыми записями на начало месяца (balance_snapshots). reconcile_ledger()
+сверяет users.balance со снимком и записями после него — читается только
+хвост журнала после последнего снимка, а не вся история.
+
+Граница месяца в журнале — один ID: последняя запись, созданная до начала
+месяца. Дальше снимки и сверка делят журнал только по id: запись с меньшим
+ID, но более поздним created_at (часы разных инстансов), попадает в снимок,
+а не теряется между снимком и хвостом.
+
+Баланс на произвольный момент (balance_at) — balance_after последней
+записи до него: одно чтение по индексу, без пересчёта истории.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.metrics import LEDGER_BROKEN_ENTRIES, LEDGER_MISMATCHES
+from app.database import dialect_insert
+from app.models.balance_snapshot import BalanceSnapshot
+from app.models.booking import Booking
+from app.models.subscription import Subscription
+from app.models.transaction import Transaction
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Сколько расхождений выводить в лог сверки
+LOG_LIMIT = 20
+
+
+async def post_entry(
+    db: AsyncSession,
+    user: User,
+    type: str,
+    amount: int,
+    description: str,
+    *,
+    booking: Booking | None = None,
+    subscription: Subscription | None = None,
+) -> Transaction:
+    """
+    Изменить баланс пользователя и записать операцию в журнал.
+
+    Commit — за вызывающим кодом, вместе с остальными изменениями.
+    Объект user получает новый баланс из БД (с учётом параллельных операций).
+
+    Args:
+        type: purchase / deduction / refund / manual / correction.
+        amount: изменение баланса (отрицательное — списание).
+        booking, subscription: связанные объекты; новые получают ID
+            при автоматическом flush перед UPDATE.
+
+    Raises:
+        HTTPException: списание больше текущего баланса (400).
+    """
+    stmt = (
+        update(User)
+        .where(User.id == user.id)
+        .values(balance=User.balance + amount)
+        .returning(User.balance, User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    if amount < 0:
+        stmt = stmt.where(User.balance + amount >= 0)
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Недостаточно занятий на балансе",
+        )
+    set_committed_value(user, "balance", row.balance)
+    set_committed_value(user, "updated_at", row.updated_at)
+
+    entry = Transaction(
+        user_id=user.id,
+        type=type,
+        amount=amount,
+        balance_after=row.balance,
+        description=description,
+        booking_id=booking.id if booking is not None else None,
+        subscription_id=subscription.id if subscription is not None else None,
+    )
+    db.add(entry)
+    return entry
+
+
+async def balance_at(db: AsyncSession, user_id: int, moment: datetime) -> int:
+    """
+    Баланс пользователя на момент moment (UTC, без tzinfo).
+
+    Последняя запись — с наибольшим ID среди созданных до moment (то же
+    правило, что у границы снимков): ID выдаются в порядке записи в журнал,
+    а created_at параллельных транзакций может идти не по порядку.
+    """
+    last_id = (
+        select(func.max(Transaction.id))
+        .where(Transaction.user_id == user_id, Transaction.created_at < moment)
+        .scalar_subquery()
+    )
+    balance = await db.scalar(
+        select(Transaction.balance_after).where(Transaction.id == last_id)
+    )
+    return balance or 0
+
+
+def _period_start(period: date) -> datetime:
+    return datetime(period.year, period.month, 1)
+
+
+async def take_balance_snapshots(db: AsyncSession, period: date | None = None) -> int:
+    """
+    Снимки баланса на начало месяца period (по умолчанию — текущего).
+
+    Снимок получают только пользователи с записями после предыдущих
+    снимков: у остальных последний снимок по-прежнему верен. Повторный
+    запуск за тот же месяц ничего не меняет.
+
+    Граница периода — ID последней записи, созданной до его начала;
+    в снимок входят все записи до этого ID включительно.
+
+    Returns:
+        Количество новых снимков.
+    """
+    period = (period or date.today()).replace(day=1)
+
+    # Записи до этого ID уже учтены в снимках прошлых месяцев
+    watermark = await db.scalar(
+        select(func.max(BalanceSnapshot.last_transaction_id)).where(
+            BalanceSnapshot.period < period
+        )
+    ) or 0
+
+    cut = await db.scalar(
+        select(func.max(Transaction.id)).where(
+            Transaction.id > watermark, Transaction.created_at < _period_start(period)
+        )
+    )
+    if cut is None:
+        return 0
+
+    latest = (
+        select(Transaction.user_id, func.max(Transaction.id).label("last_id"))
+        .where(Transaction.id > watermark, Transaction.id <= cut)
+        .group_by(Transaction.user_id)
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            select(latest.c.user_id, latest.c.last_id, Transaction.balance_after).join(
+                Transaction, Transaction.id == latest.c.last_id
+            )
+        )
+    ).all()
+    if not rows:
+        return 0
+
+    created = await db.execute(
+        dialect_insert(db, BalanceSnapshot)
+        .on_conflict_do_nothing(index_elements=["user_id", "period"])
+        .returning(BalanceSnapshot.id),
+        [
+            {
+                "user_id": row.user_id,
+                "period": period,
+                "balance": row.balance_after,
+                "last_transaction_id": row.last_id,
+                "created_at": datetime.utcnow(),
+            }
+            for row in rows
+        ],
+    )
+    count = len(created.scalars().all())
+    await db.commit()
+    return count
+
+
+@dataclass(frozen=True)
+class BalanceMismatch:
+    """Баланс пользователя не совпадает с журналом."""
+
+    user_id: int
+    balance: int
+    expected: int
+
+
+@dataclass
+class LedgerReport:
+    """Результат сверки журнала."""
+
+    users_checked: int = 0
+    entries_checked: int = 0
+    # Пользователи, у которых users.balance не равен снимку + записям после него
+    mismatches: list[BalanceMismatch] = field(default_factory=list)
+    # ID записей, у которых balance_after не продолжает предыдущую запись
+    broken_entries: list[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches and not self.broken_entries
+
+
+async def reconcile_ledger(db: AsyncSession) -> LedgerReport:
+    """
+    Сверить users.balance с журналом от последнего снимка.
+
+    Для каждого пользователя: ожидаемый баланс = баланс последнего снимка
+    (0, если снимков нет) + сумма записей после него. Для новых записей
+    дополнительно проверяется цепочка: balance_after - amount равен
+    balance_after предыдущей записи (или балансу снимка).
+
+    Читаются пользователи, их последние снимки и записи журнала после
+    последнего запуска take_balance_snapshots.
+    """
+    # Записи до watermark учтены снимками: у пользователя без снимка
+    # за последний месяц не было записей между его снимком и watermark
+    watermark = await db.scalar(select(func.max(BalanceSnapshot.last_transaction_id))) or 0
+
+    last_period = (
+        select(BalanceSnapshot.user_id, func.max(BalanceSnapshot.period).label("period"))
+        .group_by(BalanceSnapshot.user_id)
+        .subquery()
+    )
+    snapshot = (
+        select(
+            BalanceSnapshot.user_id,
+            BalanceSnapshot.balance,
+            BalanceSnapshot.last_transaction_id,
+        )
+        .join(
+            last_period,
+            and_(
+                BalanceSnapshot.user_id == last_period.c.user_id,
+                BalanceSnapshot.period == last_period.c.period,
+            ),
+        )
+        .subquery()
+    )
+
+    previous = func.lag(Transaction.balance_after).over(
+        partition_by=Transaction.user_id, order_by=Transaction.id
+    )
+    tail = (
+        select(
+            Transaction.id,
+            Transaction.user_id,
+            Transaction.amount,
+            Transaction.balance_after,
+            previous.label("previous"),
+        )
+        .where(Transaction.id > watermark)
+        .subquery()
+    )
+    tail = (
+        select(tail, snapshot.c.balance.label("snapshot_balance"))
+        .outerjoin(snapshot, snapshot.c.user_id == tail.c.user_id)
+        .where(tail.c.id > func.coalesce(snapshot.c.last_transaction_id, 0))
+        .subquery()
+    )
+
+    report = LedgerReport()
+    report.broken_entries = list(
+        (
+            await db.scalars(
+                select(tail.c.id)
+                .where(
+                    tail.c.balance_after - tail.c.amount
+                    != func.coalesce(tail.c.previous, tail.c.snapshot_balance, 0)
+                )
+                .order_by(tail.c.id)
+            )
+        ).all()
+    )
+
+    delta = (
+        select(
+            tail.c.user_id,
+            func.sum(tail.c.amount).label("amount"),
+            func.count().label("entries"),
+        )
+        .group_by(tail.c.user_id)
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            select(
+                User.id,
+                User.balance,
+                (
+                    func.coalesce(snapshot.c.balance, 0) + func.coalesce(delta.c.amount, 0)
+                ).label("expected"),
+                func.coalesce(delta.c.entries, 0).label("entries"),
+            )
+            .outerjoin(snapshot, snapshot.c.user_id == User.id)
+            .outerjoin(delta, delta.c.user_id == User.id)
+            .order_by(User.id)
+        )
+    ).all()
+
+    for row in rows:
+        report.users_checked += 1
+        report.entries_checked += row.entries
+        if row.balance != row.expected:
+            report.mismatches.append(
+                BalanceMismatch(user_id=row.id, balance=row.balance, expected=row.expected)
+            )
+
+    LEDGER_MISMATCHES.set(len(report.mismatches))
+    LEDGER_BROKEN_ENTRIES.set(len(report.broken_entries))
+    if not report.ok:
+        logger.error(
+            "Журнал баланса расходится: пользователи %s, записи %s",
+            report.mismatches[:LOG_LIMIT],
+            report.broken_entries[:LOG_LIMIT],
+        )
+    return report
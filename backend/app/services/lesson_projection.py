@@ -0,0 +1,275 @@
+"""
+Проекция занятий для расписания.
+
+Все эндпоинты со списками занятий (расписание, записи пользователя,
+страницы направления и преподавателя, bootstrap) собирают LessonResponse
+и BookingResponse здесь:
+- один SQL-запрос возвращает плоские колонки занятий, число активных
+  записей и ID записи текущего пользователя;
+- направления и преподаватели (небольшие, редко меняющиеся таблицы)
+  берутся из снимка в памяти процесса — без загрузки Lesson.direction,
+  Lesson.teacher и selectin-загрузки Teacher.directions на каждый запрос.
+
+Снимок привязан к версиям тегов "directions" и "teachers" кеша каталога
+(app.services.catalog_cache): админка увеличивает версию — все процессы
+перезагружают снимок на следующем запросе. Без Redis изменения из другого
+процесса видны не позже чем через SNAPSHOT_TTL_SECONDS. Если занятие
+ссылается на направление или преподавателя, которых нет в снимке, он
+перезагружается сразу.
+"""
+
+import time
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.responses import make_etag
+from app.models.booking import Booking
+from app.models.direction import Direction
+from app.models.lesson import Lesson
+from app.models.teacher import Teacher, teacher_direction
+from app.services.catalog_cache import catalog_versions
+
+# Сколько живёт снимок направлений и преподавателей, секунд
+SNAPSHOT_TTL_SECONDS = 60
+
+# Теги кеша каталога, от которых зависит снимок
+SNAPSHOT_TAGS = ("directions", "teachers")
+
+# От чего зависит публичный ответ с занятиями: расписание (занятия, заполненность
+# — тег увеличивает invalidate_day_schedule) и снимок
+SCHEDULE_TAGS = ("schedule", *SNAPSHOT_TAGS)
+
+# От чего зависит личный ответ (записи пользователя, bootstrap) кроме версии
+# самого пользователя: изменения занятий из админки и снимок. Запись другого
+# пользователя его не меняет — иначе каждая запись сбрасывала бы ETag всем
+USER_TAGS = ("lessons", *SNAPSHOT_TAGS)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Направления и преподаватели по ID — в виде dict для схем ответа.
+
+    Dict содержат поля и краткой, и полной схемы (DirectionListResponse /
+    DirectionResponse, TeacherListResponse / TeacherResponse) — лишние
+    поля схема отбрасывает. Dict общие для всех ответов: не изменять.
+    """
+
+    directions: dict[int, dict[str, Any]]
+    teachers: dict[int, dict[str, Any]]
+    versions: tuple[int, ...]
+    expires_at: float
+
+    def covers(self, direction_ids: Iterable[int], teacher_ids: Iterable[int]) -> bool:
+        return all(i in self.directions for i in direction_ids) and all(
+            i in self.teachers for i in teacher_ids
+        )
+
+
+_snapshot: CatalogSnapshot | None = None
+
+
+async def _load_snapshot(db: AsyncSession, versions: tuple[int, ...]) -> CatalogSnapshot:
+    """Прочитать все направления и преподавателей (три запроса)."""
+    direction_rows = await db.execute(
+        select(
+            Direction.id,
+            Direction.name,
+            Direction.slug,
+            Direction.description,
+            Direction.short_description,
+            Direction.image_url,
+            Direction.color,
+            Direction.icon,
+        )
+    )
+    directions = {row["id"]: dict(row) for row in direction_rows.mappings()}
+
+    teacher_rows = await db.execute(
+        select(
+            Teacher.id,
+            Teacher.name,
+            Teacher.slug,
+            Teacher.bio,
+            Teacher.photo_url,
+            Teacher.experience_years,
+        )
+    )
+    teachers = {
+        row["id"]: {**row, "specializations": [], "directions": []}
+        for row in teacher_rows.mappings()
+    }
+
+    links = await db.execute(
+        select(teacher_direction.c.teacher_id, teacher_direction.c.direction_id)
+        .join(Direction, Direction.id == teacher_direction.c.direction_id)
+        .order_by(teacher_direction.c.teacher_id, Direction.sort_order, Direction.id)
+    )
+    for teacher_id, direction_id in links:
+        teacher = teachers.get(teacher_id)
+        direction = directions.get(direction_id)
+        if teacher is None or direction is None:
+            continue
+        teacher["specializations"].append(direction["name"])
+        teacher["directions"].append(direction)
+
+    return CatalogSnapshot(
+        directions=directions,
+        teachers=teachers,
+        versions=versions,
+        expires_at=time.monotonic() + SNAPSHOT_TTL_SECONDS,
+    )
+
+
+async def get_catalog_snapshot(
+    db: AsyncSession,
+    direction_ids: Iterable[int] = (),
+    teacher_ids: Iterable[int] = (),
+) -> CatalogSnapshot:
+    """Снимок направлений и преподавателей, содержащий указанные ID."""
+    global _snapshot
+    versions = await catalog_versions(*SNAPSHOT_TAGS)
+    snapshot = _snapshot
+    if (
+        snapshot is None
+        or snapshot.versions != versions
+        or snapshot.expires_at <= time.monotonic()
+        or not snapshot.covers(direction_ids, teacher_ids)
+    ):
+        snapshot = _snapshot = await _load_snapshot(db, versions)
+    return snapshot
+
+
+async def schedule_etag(*parts: Any) -> str:
+    """ETag ответа с занятиями: версии SCHEDULE_TAGS и parts (пользователь, дата, фильтры)."""
+    return make_etag(await catalog_versions(*SCHEDULE_TAGS), *parts)
+
+
+async def user_etag(user: Any, *parts: Any) -> str:
+    """
+    ETag личного ответа: версии USER_TAGS, пользователь и parts (фильтры).
+
+    Свои записи и отмены меняют баланс, а с ним updated_at пользователя.
+    Заполненность занятий в таком ответе обновляется вместе с ним —
+    актуальная заполненность в публичном расписании.
+    """
+    return make_etag(await catalog_versions(*USER_TAGS), user.id, user.updated_at, *parts)
+
+
+def invalidate_catalog_snapshot() -> None:
+    """Сбросить снимок в этом процессе (тесты; админка увеличивает версии тегов)."""
+    global _snapshot
+    _snapshot = None
+
+
+async def project_lessons(
+    db: AsyncSession,
+    *criteria: Any,
+    user_id: int | None = None,
+    order_by: Iterable[Any] = (Lesson.date, Lesson.start_time),
+    limit: int | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Занятия по условиям criteria в виде dict по схеме LessonResponse.
+
+    Args:
+        criteria: условия WHERE на колонки Lesson.
+        user_id: ID текущего пользователя — для is_booked и booking_id.
+    """
+    occupancy = (
+        select(func.count(Booking.id))
+        .where(Booking.lesson_id == Lesson.id, Booking.status == "active")
+        .correlate(Lesson)
+        .scalar_subquery()
+    )
+    columns = [
+        Lesson.id,
+        Lesson.direction_id,
+        Lesson.teacher_id,
+        Lesson.date,
+        Lesson.start_time,
+        Lesson.end_time,
+        Lesson.room,
+        Lesson.max_spots,
+        Lesson.level,
+        Lesson.is_cancelled,
+        Lesson.cancel_reason,
+        occupancy.label("current_spots"),
+    ]
+    if user_id is not None:
+        own_booking = (
+            select(Booking.id)
+            .where(
+                Booking.lesson_id == Lesson.id,
+                Booking.user_id == user_id,
+                Booking.status == "active",
+            )
+            .correlate(Lesson)
+            .limit(1)
+            .scalar_subquery()
+        )
+        columns.append(own_booking.label("booking_id"))
+
+    query = select(*columns).where(*criteria).order_by(*order_by)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = (await db.execute(query)).all()
+    if not rows:
+        return []
+
+    snapshot = await get_catalog_snapshot(
+        db,
+        direction_ids={row.direction_id for row in rows},
+        teacher_ids={row.teacher_id for row in rows},
+    )
+
+    lessons = []
+    for row in rows:
+        booking_id = row.booking_id if user_id is not None else None
+        lessons.append({
+            "id": row.id,
+            "direction": snapshot.directions[row.direction_id],
+            "teacher": snapshot.teachers[row.teacher_id],
+            "date": row.date.isoformat(),
+            "start_time": row.start_time.strftime("%H:%M"),
+            "end_time": row.end_time.strftime("%H:%M"),
+            "room": row.room,
+            "max_spots": row.max_spots,
+            "current_spots": row.current_spots,
+            "level": row.level,
+            "is_cancelled": row.is_cancelled,
+            "cancel_reason": row.cancel_reason,
+            "is_booked": booking_id is not None,
+            "booking_id": booking_id,
+        })
+    return lessons
+
+
+async def project_bookings(
+    db: AsyncSession,
+    bookings: Sequence[Booking],
+    user_id: int,
+) -> list[dict[str, Any]]:
+    """Записи в виде dict по схеме BookingResponse — занятия одним запросом project_lessons."""
+    if not bookings:
+        return []
+    lessons = await project_lessons(
+        db,
+        Lesson.id.in_({b.lesson_id for b in bookings}),
+        user_id=user_id,
+    )
+    lessons_by_id = {lesson["id"]: lesson for lesson in lessons}
+    return [
+        {
+            "id": booking.id,
+            "lesson": lessons_by_id[booking.lesson_id],
+            "status": booking.status,
+            "booked_at": booking.booked_at,
+            "cancelled_at": booking.cancelled_at,
+        }
+        for booking in bookings
+    ]
@@ -0,0 +1,226 @@
+"""
+Живые обновления заполненности занятий (Server-Sent Events).
+
+Запись, отмена записи и изменения занятий в админке публикуют событие
+в канал Redis pub/sub. Каждый процесс API держит одну подписку на канал
+(LessonUpdateHub — по одному на event loop, как и клиент Redis) и
+раздаёт события своим SSE-клиентам через очереди в памяти: тысяча
+открытых экранов расписания — это одна подписка Redis на воркер, а не
+тысяча опросов БД.
+
+Подписка создаётся с первым клиентом и закрывается, когда клиентов не
+осталось. Без Redis события раздаются только клиентам этого процесса.
+Хаб считает потоки каждого клиента (client_identity) — эндпоинт
+ограничивает их число.
+
+Клиент, не успевающий читать, и все клиенты после переподключения к Redis
+получают событие "resync" — пропущенные изменения нужно перечитать
+из API расписания.
+"""
+
+import asyncio
+import json
+import logging
+import weakref
+from collections import Counter
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any
+
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.metrics import LIVE_STREAMS
+from app.core.redis import get_redis
+from app.models.booking import Booking
+from app.models.lesson import Lesson
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "dancemax:lessons:live"
+
+# Сколько событий ждёт непрочитанными у одного клиента
+QUEUE_SIZE = 100
+
+# Как часто слушатель проверяет, остались ли клиенты, секунд
+# (меньше таймаута сокета Redis в app.core.redis)
+POLL_SECONDS = 1.0
+
+# Пауза перед переподключением к Redis, секунд
+RECONNECT_SECONDS = 2.0
+
+RESYNC_EVENT: dict[str, Any] = {"type": "resync"}
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    """SSE-клиент: его очередь, фильтр (дата или набор занятий) и ключ клиента."""
+
+    day: date | None
+    lesson_ids: frozenset[int]
+    client: str | None = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(QUEUE_SIZE))
+
+    def wants(self, event: dict[str, Any]) -> bool:
+        if event["type"] == "resync":
+            return True
+        if self.lesson_ids:
+            return event["lesson_id"] in self.lesson_ids
+        # Перенесённое занятие уходит и с экрана прежней даты
+        return self.day.isoformat() in (event["date"], event.get("previous_date"))
+
+    def put(self, event: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Клиент отстал — отдельные изменения ему уже не помогут
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC_EVENT)
+
+
+class LessonUpdateHub:
+    """Одна подписка на канал Redis и раздача событий клиентам процесса."""
+
+    def __init__(self) -> None:
+        self._subscribers: set[_Subscriber] = set()
+        self._clients: Counter[str] = Counter()
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def client_streams(self, client: str) -> int:
+        """Сколько потоков открыто у клиента в этом процессе."""
+        return self._clients[client]
+
+    def open(
+        self,
+        day: date | None = None,
+        lesson_ids: Iterable[int] = (),
+        client: str | None = None,
+    ) -> _Subscriber:
+        """
+        Зарегистрировать клиента; парный вызов — close().
+
+        Args:
+            day: дата занятий (если lesson_ids не указаны).
+            lesson_ids: ID занятий — имеют приоритет над day.
+            client: ключ клиента для подсчёта его потоков.
+        """
+        subscriber = _Subscriber(day=day, lesson_ids=frozenset(lesson_ids), client=client)
+        self._subscribers.add(subscriber)
+        if client is not None:
+            self._clients[client] += 1
+        LIVE_STREAMS.inc()
+        if get_redis() is not None and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen())
+        return subscriber
+
+    def close(self, subscriber: _Subscriber) -> None:
+        """Снять клиента с раздачи (повторный вызов ничего не делает)."""
+        if subscriber not in self._subscribers:
+            return
+        self._subscribers.discard(subscriber)
+        if subscriber.client is not None:
+            self._clients[subscriber.client] -= 1
+            if self._clients[subscriber.client] <= 0:
+                del self._clients[subscriber.client]
+        LIVE_STREAMS.dec()
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        day: date | None = None,
+        lesson_ids: Iterable[int] = (),
+    ) -> AsyncIterator[asyncio.Queue]:
+        """Очередь событий для одного клиента (open/close вокруг блока)."""
+        subscriber = self.open(day, lesson_ids)
+        try:
+            yield subscriber.queue
+        finally:
+            self.close(subscriber)
+
+    def dispatch(self, event: dict[str, Any]) -> None:
+        """Раздать событие подходящим клиентам."""
+        for subscriber in list(self._subscribers):
+            if subscriber.wants(event):
+                subscriber.put(event)
+
+    async def _listen(self) -> None:
+        """Читать канал, пока есть клиенты; при сбое — переподключиться и разослать resync."""
+        while self._subscribers:
+            redis = get_redis()
+            if redis is None:
+                return
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    while self._subscribers:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=POLL_SECONDS
+                        )
+                        if message is not None:
+                            self.dispatch(json.loads(message["data"]))
+            except RedisError:
+                logger.warning("Подписка на обновления расписания прервана", exc_info=True)
+                await asyncio.sleep(RECONNECT_SECONDS)
+                self.dispatch(RESYNC_EVENT)
+
+
+_hubs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LessonUpdateHub]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_hub() -> LessonUpdateHub:
+    """Хаб текущего event loop (у каждого воркера uvicorn — свой)."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = LessonUpdateHub()
+    return hub
+
+
+async def publish_lesson_update(
+    db: AsyncSession,
+    lesson: Lesson,
+    previous_date: date | None = None,
+) -> None:
+    """
+    Опубликовать текущую заполненность и статус занятия.
+
+    Вызывается после commit; previous_date — прежняя дата перенесённого
+    занятия. Ошибка Redis не ломает запрос — клиенты получат изменение
+    со следующим событием или при перечитывании расписания.
+    """
+    current_spots = await db.scalar(
+        select(func.count(Booking.id)).where(
+            Booking.lesson_id == lesson.id,
+            Booking.status == "active",
+        )
+    )
+    event = {
+        "type": "lesson",
+        "lesson_id": lesson.id,
+        "date": lesson.date.isoformat(),
+        "current_spots": current_spots or 0,
+        "max_spots": lesson.max_spots,
+        "is_cancelled": lesson.is_cancelled,
+        "cancel_reason": lesson.cancel_reason,
+    }
+    if previous_date is not None and previous_date != lesson.date:
+        event["previous_date"] = previous_date.isoformat()
+
+    redis = get_redis()
+    if redis is None:
+        get_hub().dispatch(event)
+        return
+    try:
+        await redis.publish(CHANNEL, json.dumps(event))
+    except RedisError:
+        logger.warning("Не удалось опубликовать обновление занятия %s", lesson.id, exc_info=True)
@@ -1,15 +1,15 @@
 """
 Сервис уведомлений через Telegram-бота Dance Max.
 
-Отправляет реальные сообщения пользователям через aiogram Bot.
-Каждая функция оборачивает отправку в try/except, чтобы
-ошибка доставки (бот заблокирован, пользователь удалён)
-не ломала бизнес-логику вызывающего кода.
+Отправляет сообщения пользователям через общий отправщик
+(app.services.telegram_sender) с транзакционным приоритетом.
+Ошибка доставки (бот заблокирован, пользователь удалён)
+не ломает бизнес-логику вызывающего кода — функции возвращают False.
 """
 
 import logging
 
-from app.core.bot import bot
+from app.services.telegram_sender import send_message
 
 logger = logging.getLogger(__name__)
 
@@ -33,17 +33,10 @@ async def notify_booking_created(
         "Ждём вас в студии! Если планы изменятся, "
         "отмените запись заранее в приложении."
     )
-    try:
-        await bot.send_message(chat_id=user_telegram_id, text=text)
+    sent = await send_message(user_telegram_id, text)
+    if sent:
         logger.info("Уведомление о записи отправлено: user=%d", user_telegram_id)
-        return True
-    except Exception:
-        logger.warning(
-            "Не удалось отправить уведомление о записи: user=%d",
-            user_telegram_id,
-            exc_info=True,
-        )
-        return False
+    return sent
 
 
 async def notify_booking_cancelled(
@@ -64,17 +57,10 @@ async def notify_booking_cancelled(
         f"{lesson_info}\n\n"
         "Занятие возвращено на ваш баланс."
     )
-    try:
-        await bot.send_message(chat_id=user_telegram_id, text=text)
+    sent = await send_message(user_telegram_id, text)
+    if sent:
         logger.info("Уведомление об отмене записи отправлено: user=%d", user_telegram_id)
-        return True
-    except Exception:
-        logger.warning(
-            "Не удалось отправить уведомление об отмене: user=%d",
-            user_telegram_id,
-            exc_info=True,
-        )
-        return False
+    return sent
 
 
 async def notify_lesson_cancelled(
@@ -101,14 +87,34 @@ async def notify_lesson_cancelled(
         f"Причина: {reason}\n\n"
         "Занятие возвращено на ваш баланс. Приносим извинения за неудобства."
     )
-    try:
-        await bot.send_message(chat_id=user_telegram_id, text=text)
+    sent = await send_message(user_telegram_id, text)
+    if sent:
         logger.info("Уведомление об отмене занятия отправлено: user=%d", user_telegram_id)
-        return True
-    except Exception:
-        logger.warning(
-            "Не удалось отправить уведомление об отмене занятия: user=%d",
-            user_telegram_id,
-            exc_info=True,
-        )
-        return False
+    return sent
+
+
+async def notify_payment_succeeded(
+    user_telegram_id: int,
+    plan_name: str,
+    balance: int,
+) -> bool:
+    """Уведомление об успешной оплате абонемента.
+
+    Args:
+        user_telegram_id: Telegram ID пользователя.
+        plan_name: Название тарифного плана.
+        balance: Баланс занятий после зачисления.
+
+    Returns:
+        True если сообщение отправлено, False если ошибка.
+    """
+    text = (
+        "<b>Оплата прошла!</b>\n\n"
+        f"Абонемент «{plan_name}» активирован.\n"
+        f"На балансе: <b>{balance}</b> занятий.\n\n"
+        "Открывайте приложение и записывайтесь!"
+    )
+    sent = await send_message(user_telegram_id, text)
+    if sent:
+        logger.info("Уведомление об оплате отправлено: user=%d", user_telegram_id)
+    return sent
@@ -6,7 +6,8 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Promotion, Subscription, SubscriptionPlan, Transaction, User
+from app.models import Promotion, Subscription, SubscriptionPlan, User
+from app.services.ledger import post_entry
 
 
 class PaymentService:
@@ -77,17 +78,15 @@ class PaymentService:
         )
         self.db.add(subscription)
 
-        # Начисляем занятия на баланс пользователя
-        user.balance += plan.lessons_count
-
-        # Создаём транзакцию пополнения
-        transaction = Transaction(
-            user_id=user_id,
-            type="purchase",
-            amount=plan.lessons_count,
-            description=f"Покупка абонемента «{plan.name}» на {plan.lessons_count} занятий",
+        # Начисляем занятия на баланс и создаём транзакцию пополнения
+        await post_entry(
+            self.db,
+            user,
+            "purchase",
+            plan.lessons_count,
+            f"Покупка абонемента «{plan.name}» на {plan.lessons_count} занятий",
+            subscription=subscription,
         )
-        self.db.add(transaction)
 
         # Увеличиваем счётчик использований промокода
         if promotion:
@@ -0,0 +1,194 @@
+"""
+Сервис одноразовых промокодов (партии кодов для партнёрских кампаний).
+
+Коды генерируются пачкой и вставляются одной операцией: на PostgreSQL —
+через COPY (asyncpg copy_records_to_table), на остальных СУБД — через
+executemany. Хранятся в нормализованном виде, поэтому проверка кода —
+один поиск по уникальному индексу promo_codes.code.
+"""
+
+import logging
+import re
+import secrets
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.promotion import PromoCode, PromoCodeBatch, Promotion
+
+try:
+    from asyncpg.exceptions import UniqueViolationError
+except ImportError:  # драйвер PostgreSQL не установлен (например, тесты на SQLite)
+    UniqueViolationError = IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Алфавит без легко путаемых символов (0/O, 1/I/L) — коды вводят вручную
+CODE_ALPHABET = "ABCDEFGHJKMNPQRSTUVWXYZ23456789"
+
+# Длина случайной части кода: 31^10 ≈ 8·10^14 вариантов
+CODE_RANDOM_LENGTH = 10
+
+# Максимальный размер одной партии
+MAX_BATCH_SIZE = 100_000
+
+# Размер пачки для executemany на не-PostgreSQL СУБД
+_INSERT_CHUNK_SIZE = 5_000
+
+# Сколько раз перегенерировать партию при коллизии с уже существующим кодом
+_MAX_GENERATE_ATTEMPTS = 3
+
+_NON_CODE_CHARS = re.compile(r"[\s\-_]+")
+
+
+def normalize_promo_code(code: str) -> str:
+    """Привести код к каноническому виду: верхний регистр, без пробелов и дефисов."""
+    return _NON_CODE_CHARS.sub("", code).upper()
+
+
+def generate_codes(count: int, prefix: str = "") -> list[str]:
+    """Сгенерировать count уникальных (в пределах партии) нормализованных кодов."""
+    prefix = normalize_promo_code(prefix)
+    codes: set[str] = set()
+    while len(codes) < count:
+        random_part = "".join(
+            secrets.choice(CODE_ALPHABET) for _ in range(CODE_RANDOM_LENGTH)
+        )
+        codes.add(prefix + random_part)
+    return list(codes)
+
+
+async def _bulk_insert_codes(
+    db: AsyncSession,
+    batch_id: int,
+    promotion_id: int,
+    codes: list[str],
+) -> None:
+    """Вставить коды одной bulk-операцией (COPY на PostgreSQL)."""
+    connection = await db.connection()
+
+    if connection.dialect.name == "postgresql":
+        raw = await connection.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            PromoCode.__tablename__,
+            records=[(batch_id, promotion_id, code) for code in codes],
+            columns=["batch_id", "promotion_id", "code"],
+        )
+        return
+
+    for start in range(0, len(codes), _INSERT_CHUNK_SIZE):
+        chunk = codes[start:start + _INSERT_CHUNK_SIZE]
+        await db.execute(
+            insert(PromoCode),
+            [
+                {"batch_id": batch_id, "promotion_id": promotion_id, "code": code}
+                for code in chunk
+            ],
+        )
+
+
+async def create_code_batch(
+    db: AsyncSession,
+    promotion: Promotion,
+    count: int,
+    prefix: str = "",
+) -> PromoCodeBatch:
+    """
+    Выпустить партию одноразовых кодов для акции.
+
+    Партия вставляется в SAVEPOINT: при (крайне маловероятной) коллизии
+    с кодом из прошлых партий генерируем коды заново.
+    Коммит — на стороне вызывающего кода.
+    """
+    batch = PromoCodeBatch(
+        promotion_id=promotion.id,
+        prefix=normalize_promo_code(prefix),
+        size=count,
+    )
+    db.add(batch)
+    await db.flush()
+
+    for attempt in range(1, _MAX_GENERATE_ATTEMPTS + 1):
+        codes = generate_codes(count, batch.prefix)
+        try:
+            async with db.begin_nested():
+                await _bulk_insert_codes(db, batch.id, promotion.id, codes)
+            break
+        except (IntegrityError, UniqueViolationError):
+            # asyncpg COPY бросает UniqueViolationError напрямую, executemany — IntegrityError
+            if attempt == _MAX_GENERATE_ATTEMPTS:
+                raise
+            logger.warning("Коллизия промокодов в партии %d, попытка %d", batch.id, attempt)
+
+    logger.info(
+        "Выпущена партия промокодов: batch=%d, promotion=%d, size=%d",
+        batch.id, promotion.id, count,
+    )
+    return batch
+
+
+async def find_batch_code(
+    db: AsyncSession, code: str
+) -> tuple[PromoCode, Promotion] | None:
+    """Найти одноразовый код и его акцию одним запросом по уникальному индексу."""
+    result = await db.execute(
+        select(PromoCode, Promotion)
+        .join(Promotion, Promotion.id == PromoCode.promotion_id)
+        .where(PromoCode.code == normalize_promo_code(code))
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return row[0], row[1]
+
+
+async def redeem_batch_code(
+    db: AsyncSession, code: str, user_id: int
+) -> Promotion | None:
+    """
+    Погасить одноразовый код атомарно (UPDATE ... WHERE used_at IS NULL).
+
+    Возвращает акцию, если код был свободен и теперь погашен, иначе None.
+    Коммит — на стороне вызывающего кода.
+    """
+    result = await db.execute(
+        update(PromoCode)
+        .where(
+            PromoCode.code == normalize_promo_code(code),
+            PromoCode.used_at.is_(None),
+        )
+        .values(used_at=datetime.utcnow(), used_by_user_id=user_id)
+        .returning(PromoCode.promotion_id)
+    )
+    promotion_id = result.scalar_one_or_none()
+    if promotion_id is None:
+        return None
+    return await db.get(Promotion, promotion_id)
+
+
+async def iter_codes_csv(
+    db: AsyncSession,
+    promotion_id: int,
+    batch_id: int | None = None,
+    chunk_size: int = 5_000,
+) -> AsyncIterator[str]:
+    """Построчно выгрузить коды акции в CSV, не загружая партию в память целиком."""
+    query = (
+        select(PromoCode.code, PromoCode.batch_id, PromoCode.used_at)
+        .where(PromoCode.promotion_id == promotion_id)
+        .order_by(PromoCode.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if batch_id is not None:
+        query = query.where(PromoCode.batch_id == batch_id)
+
+    yield "code,batch_id,used_at\n"
+    result = await db.stream(query)
+    async for rows in result.partitions():
+        yield "".join(
+            f"{code},{row_batch_id},{used_at.isoformat() if used_at else ''}\n"
+            for code, row_batch_id, used_at in rows
+        )
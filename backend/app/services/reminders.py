@@ -0,0 +1,263 @@
+"""
+Сервис напоминаний: о занятиях и об истекающих абонементах.
+
+Один проход работает за фиксированное число запросов независимо от
+количества занятий, записей и абонементов:
+1. Set-based запрос: занятия, начинающиеся в ближайшие N минут, сразу
+   соединённые с активными бронированиями, пользователями и направлениями
+   (или агрегат истекающих абонементов по пользователю).
+2. Пакетная вставка ключей в reminders_sent с ON CONFLICT DO NOTHING
+   RETURNING — возвращает только ещё не отправленные напоминания.
+3. Отправка через общий rate-limited отправщик: напоминания о занятиях —
+   в транзакционной полосе (рассылка не должна их задержать), об истекающих
+   абонементах — в полосе массовых сообщений.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import dialect_insert
+from app.models.booking import Booking
+from app.models.direction import Direction
+from app.models.lesson import Lesson
+from app.models.reminder import ReminderSent
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.telegram_sender import Priority, send_many
+from bot.keyboards.inline import lesson_reminder_keyboard
+
+logger = logging.getLogger(__name__)
+
+LESSON_REMINDER_KIND = "lesson_reminder"
+SUBSCRIPTION_EXPIRING_KIND = "subscription_expiring"
+
+# За сколько дней до истечения абонемента предупреждать пользователя
+SUBSCRIPTION_EXPIRING_DAYS = (3, 1)
+
+
+def studio_now() -> datetime:
+    """Текущее время студии (без tzinfo — в том же виде, что дата/время занятий)."""
+    return datetime.now(ZoneInfo(settings.STUDIO_TIMEZONE)).replace(tzinfo=None)
+
+
+def _lesson_window_clause(start: datetime, end: datetime):
+    """
+    Условие "занятие начинается в [start, end)" по паре колонок (date, start_time).
+
+    Окно может переходить через полночь — тогда это два диапазона
+    по составному индексу ix_lessons_date_start_time.
+    """
+    if start.date() == end.date():
+        return and_(
+            Lesson.date == start.date(),
+            Lesson.start_time >= start.time(),
+            Lesson.start_time < end.time(),
+        )
+    return or_(
+        and_(Lesson.date == start.date(), Lesson.start_time >= start.time()),
+        and_(Lesson.date == end.date(), Lesson.start_time < end.time()),
+    )
+
+
+async def collect_lesson_reminders(
+    db: AsyncSession,
+    now: datetime,
+    window: timedelta,
+) -> list:
+    """
+    Найти и атомарно "забронировать" напоминания о занятиях в окне [now, now + window).
+
+    Возвращает строки (booking_id, user_id, telegram_id, lesson_id, date,
+    start_time, room, direction_name) только для напоминаний, которые
+    ещё не отправлялись. Коммит — на стороне вызывающего кода.
+    """
+    result = await db.execute(
+        select(
+            Booking.id.label("booking_id"),
+            User.id.label("user_id"),
+            User.telegram_id,
+            Lesson.id.label("lesson_id"),
+            Lesson.date,
+            Lesson.start_time,
+            Lesson.room,
+            Direction.name.label("direction_name"),
+        )
+        .join(Lesson, Booking.lesson_id == Lesson.id)
+        .join(User, Booking.user_id == User.id)
+        .join(Direction, Lesson.direction_id == Direction.id)
+        .where(
+            _lesson_window_clause(now, now + window),
+            Lesson.is_cancelled == False,  # noqa: E712
+            Booking.status == "active",
+            User.telegram_reachable == True,  # noqa: E712
+        )
+    )
+    candidates = result.all()
+    if not candidates:
+        return []
+
+    # Пакетно фиксируем ключи; конфликт = напоминание уже было отправлено
+    # (executemany + RETURNING — SQLAlchemy сам разбивает вставку на пачки)
+    claimed = await db.execute(
+        dialect_insert(db, ReminderSent)
+        .on_conflict_do_nothing(index_elements=["kind", "ref_id", "ref_date"])
+        .returning(ReminderSent.ref_id),
+        [
+            {
+                "kind": LESSON_REMINDER_KIND,
+                "ref_id": row.booking_id,
+                "ref_date": row.date,
+                "user_id": row.user_id,
+                "sent_at": datetime.utcnow(),
+            }
+            for row in candidates
+        ],
+    )
+    claimed_ids = set(claimed.scalars().all())
+
+    return [row for row in candidates if row.booking_id in claimed_ids]
+
+
+async def collect_expiring_subscriptions(db: AsyncSession, today: date) -> list:
+    """
+    Найти пользователей с абонементами, истекающими через 3 или 1 день.
+
+    Один агрегирующий запрос с GROUP BY по пользователю: два истекающих
+    абонемента = одно уведомление. Ключ дедупликации — (пользователь,
+    дата проверки), поэтому повторный запуск в тот же день ничего не
+    отправит, а предупреждения за 3 и за 1 день уйдут в разные дни.
+
+    Возвращает строки (user_id, telegram_id, expires_at, lessons_left)
+    только для ещё не уведомлённых пользователей. Коммит — на стороне
+    вызывающего кода.
+    """
+    result = await db.execute(
+        select(
+            User.id.label("user_id"),
+            User.telegram_id,
+            func.min(Subscription.expires_at).label("expires_at"),
+            func.sum(Subscription.lessons_remaining).label("lessons_left"),
+        )
+        .join(User, Subscription.user_id == User.id)
+        .where(
+            Subscription.is_active == True,  # noqa: E712
+            Subscription.lessons_remaining > 0,
+            User.telegram_reachable == True,  # noqa: E712
+            Subscription.expires_at.in_(
+                [today + timedelta(days=days) for days in SUBSCRIPTION_EXPIRING_DAYS]
+            ),
+        )
+        .group_by(User.id, User.telegram_id)
+    )
+    candidates = result.all()
+    if not candidates:
+        return []
+
+    claimed = await db.execute(
+        dialect_insert(db, ReminderSent)
+        .on_conflict_do_nothing(index_elements=["kind", "ref_id", "ref_date"])
+        .returning(ReminderSent.ref_id),
+        [
+            {
+                "kind": SUBSCRIPTION_EXPIRING_KIND,
+                "ref_id": row.user_id,
+                "ref_date": today,
+                "user_id": row.user_id,
+                "sent_at": datetime.utcnow(),
+            }
+            for row in candidates
+        ],
+    )
+    claimed_ids = set(claimed.scalars().all())
+
+    return [row for row in candidates if row.user_id in claimed_ids]
+
+
+def build_subscription_expiring_text(lessons_left: int, days_left: int) -> str:
+    """Текст уведомления об истекающем абонементе."""
+    when = "завтра" if days_left == 1 else f"через {days_left} дня"
+    return (
+        "<b>Абонемент скоро закончится</b>\n\n"
+        f"Срок действия истекает {when}, "
+        f"а на абонементе ещё осталось занятий: <b>{lessons_left}</b>.\n\n"
+        "Успейте записаться или продлите абонемент в приложении."
+    )
+
+
+def build_lesson_reminder_text(
+    direction_name: str,
+    lesson_date: date,
+    start_time: str,
+    room: str,
+    today: date | None = None,
+) -> str:
+    """
+    Текст напоминания о занятии.
+
+    Окно напоминаний может переходить через полночь — поэтому день занятия
+    ("сегодня", "завтра" или дата) считается от today (по умолчанию —
+    сегодня по времени студии).
+    """
+    today = today or studio_now().date()
+    if lesson_date == today:
+        day = "сегодня"
+    elif lesson_date == today + timedelta(days=1):
+        day = "завтра"
+    else:
+        day = lesson_date.strftime("%d.%m")
+    return (
+        "<b>Напоминание о занятии</b>\n\n"
+        f"{direction_name} {day} в {start_time}\n"
+        f"Зал: {room}\n\n"
+        "До встречи в студии!"
+    )
+
+
+async def dispatch_lesson_reminders(
+    db: AsyncSession,
+    now: datetime | None = None,
+    window: timedelta | None = None,
+) -> int:
+    """
+    Отправить напоминания о занятиях, начинающихся в ближайшее окно.
+
+    Ключи дедупликации коммитятся до отправки: при сбое отправки
+    напоминание не будет продублировано следующим запуском.
+
+    Returns:
+        Количество отправленных напоминаний.
+    """
+    now = now or studio_now()
+    window = window or timedelta(minutes=settings.LESSON_REMINDER_WINDOW_MINUTES)
+
+    reminders = await collect_lesson_reminders(db, now, window)
+    await db.commit()
+
+    if not reminders:
+        return 0
+
+    messages = [
+        (
+            row.telegram_id,
+            build_lesson_reminder_text(
+                row.direction_name,
+                row.date,
+                row.start_time.strftime("%H:%M"),
+                row.room,
+                today=now.date(),
+            ),
+            lesson_reminder_keyboard(row.lesson_id),
+        )
+        for row in reminders
+    ]
+    # Напоминание привязано ко времени занятия — транзакционная полоса,
+    # чтобы идущая рассылка его не задержала
+    sent = await send_many(messages, priority=Priority.TRANSACTIONAL)
+
+    logger.info("Напоминания о занятиях: найдено %d, отправлено %d", len(reminders), sent)
+    return sent
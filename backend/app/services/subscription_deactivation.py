@@ -4,6 +4,7 @@
 Выполняет пакетную деактивацию подписок, у которых истёк срок действия
 (expires_at < текущей даты), но флаг is_active всё ещё True.
 Используется из admin-эндпоинта (ручной запуск) и из Celery-задачи (по расписанию).
+На каждую деактивированную подписку публикуется событие subscription.expired.
 """
 
 from datetime import date
@@ -12,6 +13,7 @@ from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.subscription import Subscription
+from app.services.domain_events import record_event
 
 
 async def deactivate_expired_subscriptions(db: AsyncSession) -> int:
@@ -51,6 +53,15 @@ async def deactivate_expired_subscriptions(db: AsyncSession) -> int:
         .values(is_active=False)
     )
     await db.execute(stmt)
+    for subscription in expired:
+        record_event(
+            db,
+            "subscription.expired",
+            subscription_id=subscription.id,
+            user_id=subscription.user_id,
+            plan_id=subscription.plan_id,
+            expires_at=subscription.expires_at.isoformat(),
+        )
     await db.commit()
 
     return count
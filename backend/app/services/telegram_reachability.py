@@ -0,0 +1,71 @@
+"""
+Учёт доступности пользователей в Telegram.
+
+Если Telegram отвечает "бот заблокирован" или "чат не найден", пользователь
+помечается недоступным (users.telegram_reachable = False) и исключается
+из рассылок, напоминаний и уведомлений об абонементах — такие отправки
+только тратят лимит Bot API. Флаг снимается, когда пользователь снова
+открывает Mini App или отправляет /start.
+"""
+
+import logging
+from collections.abc import Collection
+from datetime import datetime
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_session_factory
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def is_unreachable_error(exc: Exception) -> bool:
+    """Означает ли ошибка Bot API, что писать пользователю бесполезно."""
+    # aiogram к этому моменту уже загружен отправщиком
+    from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+    if isinstance(exc, TelegramForbiddenError):
+        # bot was blocked by the user / user is deactivated
+        return True
+    if isinstance(exc, TelegramBadRequest):
+        return "chat not found" in exc.message.lower()
+    return False
+
+
+async def mark_unreachable(telegram_ids: Collection[int]) -> None:
+    """
+    Пометить пользователей недоступными (одним UPDATE).
+
+    Вызывается отправщиком после неудачной доставки, поэтому открывает
+    собственную сессию; ошибка БД не пробрасывается.
+    """
+    if not telegram_ids:
+        return
+    try:
+        async with get_session_factory()() as db:
+            await db.execute(
+                update(User)
+                .where(
+                    User.telegram_id.in_(list(telegram_ids)),
+                    User.telegram_reachable == True,  # noqa: E712
+                )
+                .values(telegram_reachable=False, telegram_unreachable_at=datetime.utcnow())
+            )
+            await db.commit()
+        logger.info("Помечены недоступными в Telegram: %d пользователей", len(telegram_ids))
+    except Exception:
+        logger.warning("Не удалось пометить пользователей недоступными", exc_info=True)
+
+
+async def mark_reachable(db: AsyncSession, telegram_id: int) -> None:
+    """Снять отметку недоступности. Коммит — на стороне вызывающего кода."""
+    await db.execute(
+        update(User)
+        .where(
+            User.telegram_id == telegram_id,
+            User.telegram_reachable == False,  # noqa: E712
+        )
+        .values(telegram_reachable=True, telegram_unreachable_at=None)
+    )
@@ -0,0 +1,319 @@
+"""
+Единый отправщик исходящих сообщений Telegram.
+
+Все сообщения бота (уведомления, рассылки, ответы хендлеров, платёжный
+webhook) проходят через send_message / send_many, которые соблюдают лимиты
+Bot API совместно для всех процессов:
+- глобальный token bucket (~30 сообщений/с на бота);
+- не чаще одного сообщения в секунду в один чат;
+- при 429 (TelegramRetryAfter) отправка ставится на паузу для всех
+  процессов на retry_after секунд и повторяется;
+- пользователи, заблокировавшие бота, помечаются недоступными
+  (app.services.telegram_reachability);
+- полосы приоритета: массовые сообщения (MARKETING — рассылки, предупреждения
+  об абонементе) не могут выбрать последние токены bucket — они
+  зарезервированы для транзакционных сообщений (подтверждения, ответы бота,
+  напоминания о занятиях).
+
+Состояние лимитов хранится в Redis и меняется одним Lua-скриптом.
+Без Redis (или при его недоступности) лимиты действуют в пределах процесса.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Sequence
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any
+
+from redis.exceptions import RedisError
+
+from app.core.bot import get_bot
+from app.core.metrics import TELEGRAM_MESSAGES, TELEGRAM_REQUEST_DURATION, TELEGRAM_RETRY_AFTER
+from app.core.redis import get_redis
+from app.services.telegram_reachability import is_unreachable_error, mark_unreachable
+
+if TYPE_CHECKING:
+    from aiogram.types import InlineKeyboardMarkup
+
+logger = logging.getLogger(__name__)
+
+# Глобальный лимит Bot API — ~30 сообщений в секунду
+GLOBAL_RATE_PER_SECOND = 30
+
+# Минимальный интервал между сообщениями в один чат, секунд
+CHAT_INTERVAL_SECONDS = 1.0
+
+# Сколько повторять отправку после 429
+MAX_RETRY_AFTER_ATTEMPTS = 3
+
+# Сколько сообщений одного send_many ждут слота одновременно
+_SEND_MANY_CONCURRENCY = GLOBAL_RATE_PER_SECOND
+
+_KEY_PREFIX = "dancemax:tg-rate"
+
+
+class Priority(IntEnum):
+    """Полоса приоритета сообщения."""
+
+    # Ответ на действие пользователя: подтверждение записи, оплата, ответ бота,
+    # а также напоминание о занятии (привязано ко времени)
+    TRANSACTIONAL = 0
+    # Массовые сообщения: рассылки, предупреждения об абонементе
+    MARKETING = 1
+
+
+# Сколько токенов bucket зарезервировано за более приоритетными полосами
+_LANE_RESERVE = {
+    Priority.TRANSACTIONAL: 0,
+    Priority.MARKETING: 5,
+}
+
+
+# KEYS: bucket, чат, пауза. ARGV: rate, capacity, reserve, chat_interval_ms.
+# Возвращает 0, если слот выдан, иначе — сколько миллисекунд подождать.
+_ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local chat_interval = tonumber(ARGV[4])
+
+local pause_until = tonumber(redis.call('GET', KEYS[3]) or '0')
+if pause_until > now then
+    return pause_until - now
+end
+
+local chat_next = tonumber(redis.call('GET', KEYS[2]) or '0')
+if chat_next > now then
+    return chat_next - now
+end
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+
+if tokens < 1 + reserve then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+    redis.call('PEXPIRE', KEYS[1], 60000)
+    return math.ceil((1 + reserve - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 60000)
+redis.call('SET', KEYS[2], now + chat_interval, 'PX', chat_interval)
+return 0
+"""
+
+
+class LocalRateLimiter:
+    """Тот же алгоритм в памяти процесса — запасной вариант без Redis."""
+
+    # Чаты старше этого срока удаляются из памяти, секунд
+    _CHAT_TTL = 60
+
+    def __init__(self, rate: float = GLOBAL_RATE_PER_SECOND, chat_interval: float = CHAT_INTERVAL_SECONDS) -> None:
+        self.rate = rate
+        self.capacity = rate
+        self.chat_interval = chat_interval
+        self._tokens = float(rate)
+        self._updated: float | None = None
+        self._chat_next: dict[int, float] = {}
+        self._pause_until = 0.0
+
+    def try_acquire(self, chat_id: int, priority: Priority, now: float | None = None) -> float:
+        """Занять слот. Returns: 0 — слот выдан, иначе сколько секунд подождать."""
+        now = time.monotonic() if now is None else now
+
+        if self._pause_until > now:
+            return self._pause_until - now
+
+        chat_next = self._chat_next.get(chat_id, 0.0)
+        if chat_next > now:
+            return chat_next - now
+
+        if self._updated is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        reserve = _LANE_RESERVE[priority]
+        if self._tokens < 1 + reserve:
+            return (1 + reserve - self._tokens) / self.rate
+
+        self._tokens -= 1
+        self._chat_next[chat_id] = now + self.chat_interval
+        if len(self._chat_next) > 10_000:
+            self._chat_next = {
+                chat: next_at for chat, next_at in self._chat_next.items()
+                if next_at > now - self._CHAT_TTL
+            }
+        return 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Приостановить отправку (после 429)."""
+        self._pause_until = max(self._pause_until, time.monotonic() + seconds)
+
+
+_local_limiter = LocalRateLimiter()
+
+
+async def _acquire_once(chat_id: int, priority: Priority) -> float:
+    """Одна попытка занять слот; Redis, если доступен, иначе локальный лимитер."""
+    redis = get_redis()
+    if redis is not None:
+        try:
+            wait_ms = await redis.eval(
+                _ACQUIRE_SCRIPT,
+                3,
+                f"{_KEY_PREFIX}:bucket",
+                f"{_KEY_PREFIX}:chat:{chat_id}",
+                f"{_KEY_PREFIX}:pause",
+                GLOBAL_RATE_PER_SECOND,
+                GLOBAL_RATE_PER_SECOND,
+                _LANE_RESERVE[priority],
+                int(CHAT_INTERVAL_SECONDS * 1000),
+            )
+            return int(wait_ms) / 1000
+        except RedisError:
+            logger.warning("Redis недоступен, лимиты Telegram в пределах процесса", exc_info=True)
+    return _local_limiter.try_acquire(chat_id, priority)
+
+
+async def acquire(chat_id: int, priority: Priority = Priority.TRANSACTIONAL) -> None:
+    """Дождаться слота на отправку сообщения в чат."""
+    while True:
+        wait = await _acquire_once(chat_id, priority)
+        if wait <= 0:
+            return
+        await asyncio.sleep(max(wait, 0.01))
+
+
+async def _pause_all(seconds: int) -> None:
+    """Поставить отправку на паузу во всех процессах (после 429)."""
+    _local_limiter.pause(seconds)
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        pause_until_ms = math.ceil((time.time() + seconds) * 1000)
+        await redis.set(f"{_KEY_PREFIX}:pause", pause_until_ms, px=seconds * 1000)
+    except RedisError:
+        logger.warning("Не удалось сохранить паузу отправки в Redis", exc_info=True)
+
+
+class Delivery(IntEnum):
+    """Результат доставки сообщения."""
+
+    SENT = 0
+    FAILED = 1
+    # Бот заблокирован / чат не найден — пользователь помечается недоступным
+    UNREACHABLE = 2
+
+
+async def _deliver(
+    chat_id: int,
+    text: str,
+    reply_markup: "InlineKeyboardMarkup | None",
+    priority: Priority,
+    **kwargs: Any,
+) -> Delivery:
+    """Отправить сообщение и учесть результат в метриках."""
+    result = await _deliver_with_retry(chat_id, text, reply_markup, priority, **kwargs)
+    TELEGRAM_MESSAGES.labels(priority.name.lower(), result.name.lower()).inc()
+    return result
+
+
+async def _deliver_with_retry(
+    chat_id: int,
+    text: str,
+    reply_markup: "InlineKeyboardMarkup | None",
+    priority: Priority,
+    **kwargs: Any,
+) -> Delivery:
+    """Отправить сообщение с ожиданием лимитов и повтором после 429."""
+    from aiogram.exceptions import TelegramAPIError, TelegramRetryAfter
+
+    bot = get_bot()
+    for attempt in range(1, MAX_RETRY_AFTER_ATTEMPTS + 1):
+        await acquire(chat_id, priority)
+        try:
+            with TELEGRAM_REQUEST_DURATION.time():
+                await bot.send_message(chat_id=chat_id, text=text, reply_markup=reply_markup, **kwargs)
+            return Delivery.SENT
+        except TelegramRetryAfter as exc:
+            TELEGRAM_RETRY_AFTER.inc()
+            logger.warning(
+                "Telegram 429: пауза %d с (user=%d, попытка %d)", exc.retry_after, chat_id, attempt
+            )
+            await _pause_all(exc.retry_after)
+        except TelegramAPIError as exc:
+            if is_unreachable_error(exc):
+                logger.info("Пользователь недоступен в Telegram: user=%d (%s)", chat_id, exc.message)
+                return Delivery.UNREACHABLE
+            logger.warning("Не удалось отправить сообщение: user=%d", chat_id, exc_info=True)
+            return Delivery.FAILED
+        except Exception:
+            logger.warning("Ошибка отправки сообщения: user=%d", chat_id, exc_info=True)
+            return Delivery.FAILED
+
+    logger.warning("Сообщение не отправлено после %d попыток: user=%d", MAX_RETRY_AFTER_ATTEMPTS, chat_id)
+    return Delivery.FAILED
+
+
+async def send_message(
+    chat_id: int,
+    text: str,
+    reply_markup: "InlineKeyboardMarkup | None" = None,
+    priority: Priority = Priority.TRANSACTIONAL,
+    **kwargs: Any,
+) -> bool:
+    """
+    Отправить сообщение с соблюдением лимитов Bot API.
+
+    Ошибка доставки (бот заблокирован, чат не найден) не пробрасывается —
+    вызывающий код получает False, а недоступный пользователь помечается в БД.
+
+    Returns:
+        True если сообщение отправлено.
+    """
+    result = await _deliver(chat_id, text, reply_markup, priority, **kwargs)
+    if result is Delivery.UNREACHABLE:
+        await mark_unreachable([chat_id])
+    return result is Delivery.SENT
+
+
+async def send_many(
+    messages: Sequence[tuple[int, str, "InlineKeyboardMarkup | None"]],
+    priority: Priority = Priority.MARKETING,
+) -> int:
+    """
+    Массовая отправка сообщений.
+
+    Ошибка доставки одному пользователю не прерывает рассылку; недоступные
+    пользователи помечаются в БД одним запросом после отправки.
+
+    Args:
+        messages: Список (telegram_id, текст, клавиатура или None).
+        priority: Полоса приоритета (по умолчанию — массовые сообщения).
+
+    Returns:
+        Количество успешно отправленных сообщений.
+    """
+    semaphore = asyncio.Semaphore(_SEND_MANY_CONCURRENCY)
+
+    async def _send(chat_id: int, text: str, markup: "InlineKeyboardMarkup | None") -> Delivery:
+        async with semaphore:
+            return await _deliver(chat_id, text, markup, priority)
+
+    results = await asyncio.gather(*(_send(*message) for message in messages))
+
+    unreachable = {
+        message[0] for message, result in zip(messages, results)
+        if result is Delivery.UNREACHABLE
+    }
+    await mark_unreachable(unreachable)
+
+    return sum(result is Delivery.SENT for result in results)
@@ -0,0 +1,183 @@
+"""
+Приём Telegram Update через webhook.
+
+Обработчики бота (например, успешный платёж) работают с БД и могут быть
+медленными, поэтому webhook не ждёт их завершения:
+1. update_id дедуплицируется (Redis SET NX EX, без Redis — в памяти процесса):
+   повторная доставка Telegram после таймаута не обрабатывается дважды.
+2. Update кладётся в ограниченную asyncio-очередь, которую разбирают
+   N воркеров; при переполнении webhook отвечает 503 и Telegram повторит
+   доставку позже.
+3. Счётчики (принято, дубликаты, отклонено, обработано, ошибки, глубина
+   очереди) доступны через stats() для мониторинга backpressure.
+
+Если воркеры не запущены (WEBHOOK_WORKERS=0, serverless), Update
+обрабатывается прямо в запросе.
+"""
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any
+
+from redis.exceptions import RedisError
+
+from app.core.bot import get_bot, get_dispatcher
+from app.core.config import settings
+from app.core.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+DEDUPE_PREFIX = "dancemax:tg-update"
+
+# Сколько update_id помнить в памяти процесса, если Redis не используется
+_LOCAL_DEDUPE_SIZE = 10_000
+
+# Сколько ждать обработки оставшихся Update при остановке, секунд
+_DRAIN_TIMEOUT = 10
+
+
+class UpdateIngestion:
+    """Очередь входящих Update с пулом воркеров."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._workers: list[asyncio.Task] = []
+        self._seen: OrderedDict[int, None] = OrderedDict()
+        self._counters = {
+            "received": 0,
+            "duplicates": 0,
+            "rejected": 0,
+            "processed": 0,
+            "failed": 0,
+        }
+        self._max_depth = 0
+
+    @property
+    def running(self) -> bool:
+        return self._queue is not None
+
+    def start(self, workers: int, maxsize: int) -> None:
+        """Создать очередь и запустить воркеров (в lifespan приложения)."""
+        if workers <= 0 or self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=maxsize)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"tg-update-worker-{index}")
+            for index in range(workers)
+        ]
+        logger.info("Очередь Telegram Update запущена: воркеров %d, ёмкость %d", workers, maxsize)
+
+    async def stop(self) -> None:
+        """Дождаться обработки очереди (с таймаутом) и остановить воркеров."""
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=_DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Не все Update обработаны при остановке: %d в очереди", self._queue.qsize())
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._queue, self._workers = None, []
+
+    async def submit(self, update_data: dict[str, Any]) -> str:
+        """
+        Принять Update.
+
+        Returns:
+            "duplicate" — уже принят ранее, "queued" — поставлен в очередь,
+            "processed" — обработан сразу (без воркеров), "rejected" — очередь полна.
+        """
+        self._counters["received"] += 1
+        update_id = update_data.get("update_id")
+
+        if update_id is not None and not await self._claim(update_id):
+            self._counters["duplicates"] += 1
+            return "duplicate"
+
+        if self._queue is None:
+            await self._process(update_data)
+            return "processed"
+
+        try:
+            self._queue.put_nowait(update_data)
+        except asyncio.QueueFull:
+            self._counters["rejected"] += 1
+            # Освобождаем update_id, иначе повторная доставка будет сочтена дубликатом
+            if update_id is not None:
+                await self._release(update_id)
+            logger.warning("Очередь Telegram Update переполнена, update_id=%s отклонён", update_id)
+            return "rejected"
+
+        self._max_depth = max(self._max_depth, self._queue.qsize())
+        return "queued"
+
+    def stats(self) -> dict[str, int]:
+        """Счётчики приёма и текущее состояние очереди."""
+        return {
+            **self._counters,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self._queue.maxsize if self._queue is not None else 0,
+            "max_queue_size": self._max_depth,
+            "workers": len(self._workers),
+        }
+
+    async def _claim(self, update_id: int) -> bool:
+        """Зафиксировать update_id; False — уже был принят."""
+        redis = get_redis()
+        if redis is not None:
+            try:
+                return bool(await redis.set(
+                    f"{DEDUPE_PREFIX}:{update_id}",
+                    1,
+                    nx=True,
+                    ex=settings.WEBHOOK_DEDUPE_TTL_SECONDS,
+                ))
+            except RedisError:
+                logger.warning("Redis недоступен, дедупликация update_id в памяти", exc_info=True)
+
+        if update_id in self._seen:
+            return False
+        self._seen[update_id] = None
+        if len(self._seen) > _LOCAL_DEDUPE_SIZE:
+            self._seen.popitem(last=False)
+        return True
+
+    async def _release(self, update_id: int) -> None:
+        """Снять отметку update_id (Update не был принят в обработку)."""
+        self._seen.pop(update_id, None)
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            await redis.delete(f"{DEDUPE_PREFIX}:{update_id}")
+        except RedisError:
+            logger.warning("Не удалось снять отметку update_id=%s", update_id, exc_info=True)
+
+    async def _process(self, update_data: dict[str, Any]) -> None:
+        """Передать Update в Dispatcher; ошибки хендлеров не пробрасываются."""
+        try:
+            from aiogram.types import Update
+
+            bot = get_bot()
+            update = Update.model_validate(update_data, context={"bot": bot})
+            await get_dispatcher().feed_update(bot=bot, update=update)
+            self._counters["processed"] += 1
+        except Exception:
+            self._counters["failed"] += 1
+            logger.exception("Ошибка обработки Telegram Update %s", update_data.get("update_id"))
+
+    async def _worker(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            update_data = await queue.get()
+            try:
+                await self._process(update_data)
+            finally:
+                queue.task_done()
+
+
+# Единственный экземпляр на процесс API
+ingestion = UpdateIngestion()
@@ -0,0 +1,140 @@
+"""
+Микробенчмарк сериализации расписания из 200 занятий.
+
+Сравнивает:
+- before: модели собираются вручную (каждая вложенная модель валидируется),
+  затем ответ валидируется по response_model и сериализуется через dict +
+  json.dumps (JSONResponse) — путь FastAPI до появления dump_json
+- before (dump_json): то же, но сериализация сразу в байты — путь новых FastAPI
+- after: dict из ORM-объектов, одна валидация и dump_json (app.core.responses)
+
+Запуск:
+  cd backend && python -m benchmarks.serialization
+"""
+
+import json
+import timeit
+from datetime import date, time
+from types import SimpleNamespace
+
+from pydantic import TypeAdapter
+
+from app.core.responses import dump_json
+from app.schemas.direction import DirectionListResponse
+from app.schemas.lesson import LessonResponse
+from app.schemas.teacher import TeacherListResponse
+
+LESSONS_COUNT = 200
+REPEAT = 200
+
+
+def _make_lessons() -> list[SimpleNamespace]:
+    """ORM-подобные занятия с направлением, преподавателем и записями."""
+    directions = [
+        SimpleNamespace(
+            id=i, name=f"Направление {i}", slug=f"direction-{i}",
+            short_description="Описание", color="#FF5722", icon="music",
+        )
+        for i in range(5)
+    ]
+    teachers = [
+        SimpleNamespace(
+            id=i, name=f"Преподаватель {i}", slug=f"teacher-{i}", photo_url=None,
+            experience_years=5, directions=directions[:2],
+        )
+        for i in range(8)
+    ]
+    return [
+        SimpleNamespace(
+            id=i,
+            direction=directions[i % 5],
+            teacher=teachers[i % 8],
+            date=date(2026, 10, 19),
+            start_time=time(18, 0),
+            end_time=time(19, 0),
+            room="Зал 1",
+            max_spots=15,
+            level="all",
+            is_cancelled=False,
+            cancel_reason=None,
+            bookings=[SimpleNamespace(id=j, user_id=j, status="active") for j in range(8)],
+        )
+        for i in range(LESSONS_COUNT)
+    ]
+
+
+def _fields(lesson: SimpleNamespace) -> dict:
+    return {
+        "id": lesson.id,
+        "date": lesson.date.isoformat(),
+        "start_time": lesson.start_time.strftime("%H:%M"),
+        "end_time": lesson.end_time.strftime("%H:%M"),
+        "room": lesson.room,
+        "max_spots": lesson.max_spots,
+        "current_spots": sum(1 for b in lesson.bookings if b.status == "active"),
+        "level": lesson.level,
+        "is_cancelled": lesson.is_cancelled,
+        "cancel_reason": lesson.cancel_reason,
+    }
+
+
+def _teacher(teacher: SimpleNamespace) -> dict:
+    return {
+        "id": teacher.id,
+        "name": teacher.name,
+        "slug": teacher.slug,
+        "photo_url": teacher.photo_url,
+        "experience_years": teacher.experience_years,
+        "specializations": [d.name for d in teacher.directions],
+    }
+
+
+def build_models(lessons: list[SimpleNamespace]) -> list[LessonResponse]:
+    """Прежняя сборка ответа: модель на каждое занятие и вложенный объект."""
+    return [
+        LessonResponse(
+            **_fields(lesson),
+            direction=DirectionListResponse.model_validate(lesson.direction),
+            teacher=TeacherListResponse(**_teacher(lesson.teacher)),
+        )
+        for lesson in lessons
+    ]
+
+
+def build_payload(lessons: list[SimpleNamespace]) -> list[dict]:
+    """Новая сборка ответа: обычные dict, направление — ORM-объектом."""
+    return [
+        {**_fields(lesson), "direction": lesson.direction, "teacher": _teacher(lesson.teacher)}
+        for lesson in lessons
+    ]
+
+
+def main() -> None:
+    lessons = _make_lessons()
+    response_field = TypeAdapter(list[LessonResponse])
+
+    def before() -> bytes:
+        value = response_field.validate_python(build_models(lessons), from_attributes=True)
+        return json.dumps(response_field.dump_python(value, mode="json")).encode()
+
+    def before_dump_json() -> bytes:
+        value = response_field.validate_python(build_models(lessons), from_attributes=True)
+        return response_field.dump_json(value)
+
+    def after() -> bytes:
+        return dump_json(list[LessonResponse], build_payload(lessons))
+
+    assert json.loads(before()) == json.loads(after())
+
+    print(f"Сериализация {LESSONS_COUNT} занятий, среднее по {REPEAT} повторам:")
+    for name, func in (
+        ("before", before),
+        ("before (dump_json)", before_dump_json),
+        ("after", after),
+    ):
+        seconds = min(timeit.repeat(func, number=REPEAT, repeat=3)) / REPEAT
+        print(f"  {name:<20} {seconds * 1000:7.2f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,32 +8,73 @@ from aiogram.types import (
     Message,
     WebAppInfo,
 )
+from sqlalchemy import and_, func, select
 
 from app.core.config import settings
+from app.database import async_session
+from app.models.subscription import Subscription
+from app.models.user import User
+from app.services.telegram_sender import send_message
 
 router = Router()
 
 
+def _profile_keyboard() -> InlineKeyboardMarkup:
+    """Кнопка открытия профиля в приложении."""
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="Открыть приложение",
+                    web_app=WebAppInfo(
+                        url=f"{settings.TELEGRAM_WEBAPP_URL}/profile"
+                    ),
+                )
+            ],
+        ]
+    )
+
+
 @router.message(Command("balance"))
 async def cmd_balance(message: Message) -> None:
     """Быстрая проверка баланса занятий.
 
-    В MVP: заглушка с кнопкой открытия приложения.
-    В проде: запрос к API по telegram_id через httpx.
+    Один запрос по telegram_id: баланс и ближайшая дата окончания
+    активного абонемента.
     """
-    await message.answer(
-        "<b>Ваш баланс</b>\n\n"
-        "Для просмотра баланса откройте приложение.",
-        reply_markup=InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    InlineKeyboardButton(
-                        text="Открыть приложение",
-                        web_app=WebAppInfo(
-                            url=f"{settings.TELEGRAM_WEBAPP_URL}/profile"
-                        ),
-                    )
-                ],
-            ]
-        ),
+    if message.from_user is None:
+        return
+
+    async with async_session() as db:
+        result = await db.execute(
+            select(User.balance, func.min(Subscription.expires_at))
+            .outerjoin(
+                Subscription,
+                and_(
+                    Subscription.user_id == User.id,
+                    Subscription.is_active == True,  # noqa: E712
+                    Subscription.lessons_remaining > 0,
+                ),
+            )
+            .where(User.telegram_id == message.from_user.id)
+            .group_by(User.id)
+        )
+        row = result.first()
+
+    if row is None:
+        text = (
+            "<b>Ваш баланс</b>\n\n"
+            "Вы ещё не зарегистрированы — откройте приложение, "
+            "чтобы купить абонемент и записаться на занятие."
+        )
+    else:
+        balance, expires_at = row
+        text = f"<b>Ваш баланс</b>\n\nЗанятий на балансе: <b>{balance}</b>"
+        if expires_at is not None:
+            text += f"\nАбонемент действует до {expires_at.strftime('%d.%m.%Y')}"
+
+    await send_message(
+        message.chat.id,
+        text,
+        reply_markup=_profile_keyboard(),
     )
@@ -4,13 +4,16 @@ from aiogram import Router
 from aiogram.filters import Command
 from aiogram.types import Message
 
+from app.services.telegram_sender import send_message
+
 router = Router()
 
 
 @router.message(Command("help"))
 async def cmd_help(message: Message) -> None:
     """Список доступных команд бота."""
-    await message.answer(
+    await send_message(
+        message.chat.id,
         "<b>Доступные команды:</b>\n\n"
         "/start — Открыть приложение\n"
         "/balance — Проверить баланс\n"
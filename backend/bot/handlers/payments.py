@@ -19,8 +19,10 @@ from sqlalchemy import select
 from app.database import async_session
 from app.models.promotion import Promotion
 from app.models.subscription import Subscription, SubscriptionPlan
-from app.models.transaction import Transaction
 from app.models.user import User
+from app.services.domain_events import record_event
+from app.services.ledger import post_entry
+from app.services.promo_codes import redeem_batch_code
 
 logger = logging.getLogger(__name__)
 
@@ -95,12 +97,16 @@ async def handle_successful_payment(message: Message) -> None:
                 )
             )
             promo = promo_result.scalar_one_or_none()
+            if promo is None:
+                # Одноразовый код из партии — гасим атомарно
+                promo = await redeem_batch_code(db, promo_code, user.id)
+            else:
+                promo.current_uses += 1
             if promo is not None:
                 if promo.discount_percent:
                     promo_description = f" (скидка {promo.discount_percent}%)"
                 elif promo.discount_amount:
                     promo_description = f" (скидка {promo.discount_amount // 100} руб.)"
-                promo.current_uses += 1
 
         # Создаём подписку
         today = date.today()
@@ -114,27 +120,31 @@ async def handle_successful_payment(message: Message) -> None:
         )
         db.add(subscription)
 
-        # Зачисляем занятия на баланс
-        user.balance += plan.lessons_count
-
-        # Транзакция покупки
-        transaction = Transaction(
-            user_id=user.id,
-            type="purchase",
-            amount=plan.lessons_count,
-            description=(
+        # Зачисляем занятия на баланс и пишем транзакцию покупки
+        await post_entry(
+            db,
+            user,
+            "purchase",
+            plan.lessons_count,
+            (
                 f'Покупка абонемента "{plan.name}" '
                 f'({plan.lessons_count} занятий){promo_description}'
             ),
+            subscription=subscription,
         )
-        db.add(transaction)
 
-        await db.commit()
+        # Уведомление пользователя — потребитель события после commit
+        record_event(
+            db,
+            "payment.succeeded",
+            provider="telegram",
+            payment_id=payment.telegram_payment_charge_id,
+            user_id=user.id,
+            telegram_id=telegram_id,
+            plan_id=plan.id,
+            plan_name=plan.name,
+            subscription_id=subscription.id,
+            balance=user.balance,
+        )
 
-    # Уведомляем пользователя
-    await message.answer(
-        f"<b>Оплата прошла!</b>\n\n"
-        f'Абонемент «{plan.name}» активирован.\n'
-        f"На балансе: <b>{user.balance}</b> занятий.\n\n"
-        f"Открывайте приложение и записывайтесь!"
-    )
+        await db.commit()
@@ -10,6 +10,10 @@ from aiogram.types import (
 )
 
 from app.core.config import settings
+from app.database import async_session
+from app.services.bot_schedule import get_day_schedule
+from app.services.reminders import studio_now
+from app.services.telegram_sender import send_message
 
 router = Router()
 
@@ -18,12 +22,15 @@ router = Router()
 async def cmd_schedule(message: Message) -> None:
     """Расписание на сегодня.
 
-    В MVP: заглушка с кнопкой открытия приложения.
-    В проде: запрос к API за расписанием на текущий день.
+    Текст кешируется по дате (app.services.bot_schedule), поэтому
+    повторные команды не обращаются к БД.
     """
-    await message.answer(
-        "<b>Расписание</b>\n\n"
-        "Для просмотра полного расписания откройте приложение.",
+    async with async_session() as db:
+        text = await get_day_schedule(db, studio_now().date())
+
+    await send_message(
+        message.chat.id,
+        text,
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
                 [
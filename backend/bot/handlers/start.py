@@ -10,6 +10,9 @@ from aiogram.types import (
 )
 
 from app.core.config import settings
+from app.database import async_session
+from app.services.telegram_reachability import mark_reachable
+from app.services.telegram_sender import send_message
 
 router = Router()
 
@@ -17,6 +20,12 @@ router = Router()
 @router.message(CommandStart())
 async def cmd_start(message: Message) -> None:
     """Обработчик команды /start — приветствие и кнопка Web App."""
+    # Пользователь снова написал боту — снимаем отметку недоступности
+    if message.from_user is not None:
+        async with async_session() as db:
+            await mark_reachable(db, message.from_user.id)
+            await db.commit()
+
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -28,7 +37,8 @@ async def cmd_start(message: Message) -> None:
         ]
     )
 
-    await message.answer(
+    await send_message(
+        message.chat.id,
         f"<b>Добро пожаловать в Dance Max!</b>\n\n"
         f"Студия социальных танцев в Санкт-Петербурге.\n"
         f"Сальса, бачата, кизомба и многое другое.\n\n"
@@ -12,7 +12,7 @@ import logging
 
 from aiogram.types import MenuButtonWebApp, WebAppInfo
 
-from app.core.bot import bot, dp, setup_dispatcher
+from app.core.bot import get_bot, get_dispatcher
 from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
@@ -21,8 +21,9 @@ logger = logging.getLogger(__name__)
 
 async def main() -> None:
     """Инициализация и запуск бота в режиме polling (для локальной разработки)."""
-    # Регистрируем хендлеры
-    setup_dispatcher()
+    # Диспетчер с зарегистрированными хендлерами
+    dp = get_dispatcher()
+    bot = get_bot()
 
     # Удаляем webhook, если был установлен ранее (polling и webhook несовместимы)
     await bot.delete_webhook(drop_pending_updates=True)
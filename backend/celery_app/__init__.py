@@ -1,6 +1,16 @@
-"""Конфигурация Celery для проекта Dance Max."""
+"""Конфигурация Celery для проекта Dance Max.
+
+Очереди:
+- notifications — точечные уведомления (подтверждения, напоминания), чувствительны к задержке
+- bulk — массовые рассылки и выгрузки
+- maintenance — обслуживание данных (деактивация, сверки)
+
+Каждую очередь обслуживает свой воркер (см. docker-compose.yml), поэтому
+большая рассылка не задерживает подтверждение записи.
+"""
 
 from celery import Celery
+from kombu import Queue
 
 from app.core.config import settings
 
@@ -16,4 +26,29 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Europe/Moscow",
     enable_utc=True,
+    # Очереди и маршрутизация
+    task_queues=(
+        Queue("notifications"),
+        Queue("bulk"),
+        Queue("maintenance"),
+    ),
+    task_default_queue="notifications",
+    task_routes={
+        "celery_app.tasks.notifications.send_subscription_expiring_batch": {"queue": "bulk"},
+        "celery_app.tasks.notifications.*": {"queue": "notifications"},
+        "celery_app.tasks.scheduled.check_lesson_reminders": {"queue": "notifications"},
+        "celery_app.tasks.scheduled.check_expiring_subscriptions": {"queue": "bulk"},
+        "celery_app.tasks.bulk.*": {"queue": "bulk"},
+        "celery_app.tasks.maintenance.*": {"queue": "maintenance"},
+    },
+    # Результаты: большинство задач fire-and-forget (ignore_result=True);
+    # для остальных ключи в Redis живут ограниченное время
+    result_expires=3600,
+    # Подтверждение после выполнения: задача не теряется при падении воркера.
+    # prefetch задаётся на воркер очереди флагом --prefetch-multiplier
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    # Redis-брокер: не переотправлять долгие рассылки раньше, чем они могли завершиться
+    broker_transport_options={"visibility_timeout": 3600},
 )
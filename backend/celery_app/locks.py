@@ -0,0 +1,127 @@
+"""Распределённая блокировка периодических задач.
+
+При нескольких репликах Beat (или перекрытии при перезапуске) одна и та же
+периодическая задача может быть поставлена в очередь дважды. Перед выполнением
+задача занимает ключ Redis (SET NX EX) по имени задачи и временному слоту —
+вторая копия в том же слоте пропускается.
+
+Слот считается от запланированного времени запуска, а не от момента
+выполнения: при публикации задачи в заголовок scheduled_at пишется минута
+отправки (Beat отправляет задачу в минуту срабатывания crontab по своим
+часам). Копии одного запуска получают одинаковое время, даже если воркеры
+выполнят их в разное время.
+
+Без Redis (REDIS_URL пуст или Redis недоступен) блокировка не берётся
+и задача выполняется: от двойной отправки дополнительно защищает
+таблица дедупликации reminders_sent.
+"""
+
+import functools
+import logging
+import os
+import socket
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from celery.signals import before_task_publish
+from redis.exceptions import RedisError
+
+from app.core.redis import get_redis
+from celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+LOCK_PREFIX = "dancemax:periodic-lock"
+
+
+# Заголовок задачи с запланированным временем запуска (Unix-время начала минуты)
+SCHEDULED_AT_HEADER = "scheduled_at"
+
+# Гранулярность crontab: Beat отправляет задачу в течение минуты срабатывания
+_SCHEDULE_RESOLUTION = 60
+
+# Задачи под periodic_singleton и длина их слота — только им нужен заголовок scheduled_at
+_singleton_tasks: dict[str, int] = {}
+
+
+def slot_key(name: str, slot_seconds: int, scheduled_at: float) -> str:
+    """Ключ блокировки для задачи и слота её запланированного запуска."""
+    return f"{LOCK_PREFIX}:{name}:{int(scheduled_at // slot_seconds)}"
+
+
+def singleton_slot_seconds(name: str) -> int | None:
+    """Длина слота задачи под periodic_singleton (None — задача без блокировки)."""
+    return _singleton_tasks.get(name)
+
+
+@before_task_publish.connect
+def _stamp_scheduled_at(sender: str | None = None, headers: dict | None = None, **_: Any) -> None:
+    if sender in _singleton_tasks and headers is not None:
+        headers.setdefault(SCHEDULED_AT_HEADER, time.time() // _SCHEDULE_RESOLUTION * _SCHEDULE_RESOLUTION)
+
+
+def _scheduled_at() -> float:
+    """Запланированное время текущей задачи; без заголовка — текущая минута."""
+    task = celery_app.current_task
+    scheduled_at = getattr(task.request, SCHEDULED_AT_HEADER, None) if task is not None else None
+    if scheduled_at is None:
+        return time.time() // _SCHEDULE_RESOLUTION * _SCHEDULE_RESOLUTION
+    return float(scheduled_at)
+
+
+async def acquire_slot_lock(name: str, slot_seconds: int, scheduled_at: float) -> bool:
+    """Занять слот для запуска задачи, запланированного на scheduled_at.
+
+    Returns:
+        True если слот свободен (или Redis не используется), False если занят.
+    """
+    redis = get_redis()
+    if redis is None:
+        return True
+
+    key = slot_key(name, slot_seconds, scheduled_at)
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    try:
+        return bool(await redis.set(key, owner, nx=True, ex=slot_seconds))
+    except RedisError:
+        logger.warning("Redis недоступен, блокировка %s не взята", key, exc_info=True)
+        return True
+
+
+def periodic_singleton(slot_seconds: int):
+    """Выполнять периодическую задачу не более одного раза за слот.
+
+    Применяется к async-функции под async_task:
+
+        @async_task(ignore_result=True)
+        @periodic_singleton(slot_seconds=300)
+        async def check_something() -> int: ...
+
+    Args:
+        slot_seconds: Длина слота (и TTL ключа) в секундах. Должна быть
+            не больше интервала запуска задачи — иначе запуски, попавшие
+            в один слот, пропускаются (админка не даёт задать такой crontab).
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T | None]]:
+        name = f"{func.__module__}.{func.__qualname__}"
+        _singleton_tasks[name] = slot_seconds
+
+        async def run(scheduled_at: float, args: tuple, kwargs: dict) -> T | None:
+            if not await acquire_slot_lock(name, slot_seconds, scheduled_at):
+                logger.info("Задача %s уже выполняется в этом слоте, пропускаем", name)
+                return None
+            return await func(*args, **kwargs)
+
+        # Синхронная обёртка: заголовок задачи читается в потоке воркера,
+        # а корутина затем выполняется в loop async runtime
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Awaitable[T | None]:
+            return run(_scheduled_at(), args, kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,57 @@
+"""Метрики Prometheus Celery-воркера.
+
+Длительность задач измеряется в процессе, который их выполняет
+(сигналы task_prerun/task_postrun). Для prefork-пула задайте
+PROMETHEUS_MULTIPROC_DIR: дочерние процессы пишут значения в общий
+каталог, а HTTP-сервер метрик главного процесса (CELERY_METRICS_PORT)
+отдаёт их вместе.
+"""
+
+import logging
+import os
+import time
+from typing import Any
+
+from celery.signals import task_postrun, task_prerun, worker_init, worker_process_shutdown
+from prometheus_client import CollectorRegistry, multiprocess, start_http_server
+
+from app.core.config import settings
+from app.core.metrics import CELERY_TASK_DURATION, mark_process_dead
+
+logger = logging.getLogger(__name__)
+
+# Время старта выполняемых задач процесса: task_id -> perf_counter
+_started: dict[str, float] = {}
+
+
+@worker_init.connect
+def _start_metrics_server(**_: Any) -> None:
+    """Главный процесс воркера: HTTP-сервер метрик."""
+    if not settings.CELERY_METRICS_PORT:
+        return
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(settings.CELERY_METRICS_PORT, registry=registry)
+    else:
+        start_http_server(settings.CELERY_METRICS_PORT)
+    logger.info("Метрики воркера на порту %d", settings.CELERY_METRICS_PORT)
+
+
+@task_prerun.connect
+def _task_started(task_id: str, **_: Any) -> None:
+    _started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def _task_finished(task_id: str, task: Any = None, state: str | None = None, **_: Any) -> None:
+    started = _started.pop(task_id, None)
+    if started is None or task is None:
+        return
+    CELERY_TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@worker_process_shutdown.connect
+def _forget_process(pid: int | None = None, **_: Any) -> None:
+    """Live-gauge завершившегося процесса не должны попадать в сумму."""
+    mark_process_dead(pid or os.getpid())
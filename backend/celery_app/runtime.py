@@ -0,0 +1,160 @@
+"""Асинхронный runtime для Celery-воркеров.
+
+Движок БД (asyncpg) и HTTP-сессия бота привязаны к event loop, в котором
+были созданы. Поэтому в каждом процессе воркера живёт один долгоживущий
+loop в фоновом потоке: задачи отправляют в него корутины, а пул соединений
+и сессия aiogram переиспользуются между задачами.
+
+Loop запускается по сигналу worker_process_init (или лениво при первом
+вызове — для solo-пула и eager-режима) и закрывается по
+worker_process_shutdown вместе с сессией бота и пулом БД.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+
+from celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Сколько ждать закрытия ресурсов при остановке процесса, секунд
+_SHUTDOWN_TIMEOUT = 10
+
+_loop: asyncio.AbstractEventLoop | None = None
+_thread: threading.Thread | None = None
+_lock = threading.Lock()
+
+
+def start_loop() -> asyncio.AbstractEventLoop:
+    """Запустить event loop процесса в фоновом потоке (идемпотентно).
+
+    Returns:
+        Работающий event loop.
+    """
+    global _loop, _thread
+
+    with _lock:
+        if _loop is not None and _loop.is_running():
+            return _loop
+
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def _serve() -> None:
+            asyncio.set_event_loop(loop)
+            loop.call_soon(ready.set)
+            loop.run_forever()
+
+        thread = threading.Thread(target=_serve, name="celery-async-loop", daemon=True)
+        thread.start()
+        ready.wait()
+
+        _loop, _thread = loop, thread
+        logger.info("Запущен async runtime воркера")
+        return loop
+
+
+async def _close_resources() -> None:
+    """Закрыть сессию бота и пул соединений БД внутри loop процесса."""
+    from app.core.bot import close_bot
+    from app.database import engine
+    from app.services.domain_events import drain_events
+
+    await drain_events()
+    await close_bot()
+    await engine.dispose()
+
+
+def shutdown_loop() -> None:
+    """Закрыть ресурсы и остановить event loop процесса."""
+    global _loop, _thread
+
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop, _thread = None, None
+
+    if loop is None:
+        return
+
+    try:
+        asyncio.run_coroutine_threadsafe(_close_resources(), loop).result(_SHUTDOWN_TIMEOUT)
+    except Exception:
+        logger.exception("Ошибка при закрытии ресурсов async runtime")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(_SHUTDOWN_TIMEOUT)
+        if thread is not None and thread.is_alive():
+            # Закрывать работающий loop нельзя — оставляем его daemon-потоку
+            logger.error("Async runtime воркера не остановился за %d с", _SHUTDOWN_TIMEOUT)
+        else:
+            loop.close()
+            logger.info("Async runtime воркера остановлен")
+
+
+def run_async(func: Callable[[], Awaitable[T]]) -> T:
+    """Выполнить асинхронную функцию в loop процесса и дождаться результата.
+
+    Args:
+        func: Функция без аргументов, возвращающая корутину.
+
+    Returns:
+        Результат корутины.
+
+    Raises:
+        RuntimeError: Вызов из потока самого loop (задача внутри задачи,
+            eager-вызов из корутины) — ожидание результата заблокировало бы loop.
+    """
+    if _thread is not None and threading.current_thread() is _thread:
+        raise RuntimeError("run_async нельзя вызывать из потока async runtime: используйте await")
+    loop = _loop if _loop is not None and _loop.is_running() else start_loop()
+    return asyncio.run_coroutine_threadsafe(func(), loop).result()
+
+
+def async_task(*args: Any, **options: Any):
+    """Объявить Celery-задачу из async-функции.
+
+    Тело задачи выполняется в долгоживущем loop процесса, поэтому
+    соединения с БД и сессия бота переиспользуются между вызовами.
+    Параметры передаются в celery_app.task как есть.
+
+    Пример:
+        @async_task(ignore_result=True)
+        async def send_something(telegram_id: int) -> None: ...
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]):
+        @functools.wraps(func)
+        def wrapper(*task_args: Any, **task_kwargs: Any) -> T:
+            return run_async(lambda: func(*task_args, **task_kwargs))
+
+        return celery_app.task(**options)(wrapper)
+
+    # Поддержка формы без скобок: @async_task
+    if len(args) == 1 and callable(args[0]) and not options:
+        return decorator(args[0])
+    return decorator
+
+
+@worker_process_init.connect
+def _on_worker_process_init(**_: Any) -> None:
+    """Новый процесс воркера: сбросить унаследованные соединения и поднять loop."""
+    from app.database import engine
+
+    # Соединения, открытые в родительском процессе до fork, использовать нельзя
+    engine.sync_engine.dispose(close=False)
+    start_loop()
+
+
+@worker_process_shutdown.connect
+def _on_worker_process_shutdown(**_: Any) -> None:
+    """Остановка процесса воркера: закрыть сессию бота и пул БД."""
+    shutdown_loop()
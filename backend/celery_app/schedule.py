@@ -0,0 +1,179 @@
+"""Расписание периодических задач Celery Beat.
+
+DEFAULT_SCHEDULE — расписание по умолчанию (в коде). Администратор может
+переопределить crontab, параметры или отключить задачу через таблицу
+periodic_tasks. Переопределения подхватывает DatabaseScheduler:
+
+    celery -A celery_app.worker beat -S celery_app.schedule:DatabaseScheduler
+
+Со стандартным планировщиком Celery работает только расписание по умолчанию.
+"""
+
+import importlib
+import logging
+import time
+from typing import Any
+
+from celery.beat import Scheduler
+from celery.schedules import crontab
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Расписание по умолчанию: crontab в стандартном порядке полей
+# ("минута час день месяц день_недели"), время — МСК.
+# Ключи kwargs — параметры, которые можно переопределить из админки.
+DEFAULT_SCHEDULE: dict[str, dict[str, Any]] = {
+    "check-lesson-reminders": {
+        "task": "celery_app.tasks.scheduled.check_lesson_reminders",
+        "crontab": "*/30 * * * *",  # каждые 30 минут
+        "kwargs": {"window_minutes": settings.LESSON_REMINDER_WINDOW_MINUTES},
+    },
+    "check-expiring-subscriptions": {
+        "task": "celery_app.tasks.scheduled.check_expiring_subscriptions",
+        "crontab": "0 10 * * *",  # каждый день в 10:00
+        "kwargs": {},
+    },
+    "deactivate-expired-subscriptions": {
+        "task": "celery_app.tasks.maintenance.deactivate_expired_subscriptions",
+        "crontab": "5 0 * * *",  # каждый день в 00:05
+        "kwargs": {},
+    },
+    "snapshot-balances": {
+        "task": "celery_app.tasks.maintenance.snapshot_balances",
+        "crontab": "15 3 1 * *",  # 1-го числа в 03:15 (00:15 UTC — месяц уже закрыт)
+        "kwargs": {},
+    },
+    "relay-domain-events": {
+        "task": "celery_app.tasks.maintenance.relay_domain_events",
+        "crontab": "* * * * *",  # каждую минуту
+        "kwargs": {},
+    },
+    "reconcile-ledger": {
+        "task": "celery_app.tasks.maintenance.reconcile_ledger",
+        "crontab": "0 4 * * *",  # каждый день в 04:00
+        "kwargs": {},
+    },
+}
+
+
+def parse_crontab(expr: str) -> crontab:
+    """Разобрать crontab-выражение из пяти полей.
+
+    Raises:
+        ValueError: Неверное число полей или недопустимое значение.
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError("Ожидается 5 полей: минута час день месяц день_недели")
+    minute, hour, day_of_month, month_of_year, day_of_week = fields
+    return crontab(
+        minute=minute,
+        hour=hour,
+        day_of_month=day_of_month,
+        month_of_year=month_of_year,
+        day_of_week=day_of_week,
+    )
+
+
+def min_interval_seconds(schedule: crontab) -> int:
+    """Наименьший интервал между запусками по crontab, в секундах.
+
+    Учитываются минуты и часы (включая переход через полночь); ограничения
+    по дням только увеличивают интервалы.
+    """
+    times = sorted(hour * 60 + minute for hour in schedule.hour for minute in schedule.minute)
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    gaps.append(times[0] + 24 * 60 - times[-1])
+    return min(gaps) * 60
+
+
+def task_slot_seconds(task: str) -> int | None:
+    """Длина слота блокировки periodic_singleton для задачи (None — без блокировки)."""
+    from celery_app.locks import singleton_slot_seconds
+
+    # Задача регистрируется в locks при импорте своего модуля
+    importlib.import_module(task.rpartition(".")[0])
+    return singleton_slot_seconds(task)
+
+
+def build_beat_schedule(overrides: list | None = None) -> dict[str, dict[str, Any]]:
+    """Собрать beat_schedule из расписания по умолчанию и переопределений из БД.
+
+    Args:
+        overrides: Записи PeriodicTaskConfig (или None — только значения по умолчанию).
+    """
+    by_name = {row.name: row for row in overrides or []}
+    schedule: dict[str, dict[str, Any]] = {}
+
+    for name, default in DEFAULT_SCHEDULE.items():
+        row = by_name.get(name)
+        if row is not None and not row.enabled:
+            continue
+
+        expr = row.crontab if row is not None else default["crontab"]
+        kwargs = dict(default["kwargs"])
+        if row is not None:
+            kwargs.update(row.kwargs or {})
+
+        try:
+            entry_schedule = parse_crontab(expr)
+        except ValueError:
+            logger.error("Некорректный crontab для %s: %r, используем значение по умолчанию", name, expr)
+            entry_schedule = parse_crontab(default["crontab"])
+
+        schedule[name] = {
+            "task": default["task"],
+            "schedule": entry_schedule,
+            "kwargs": kwargs,
+        }
+
+    return schedule
+
+
+async def load_schedule_overrides() -> list:
+    """Прочитать переопределения расписания из таблицы periodic_tasks."""
+    from sqlalchemy import select
+
+    from app.database import async_session
+    from app.models.periodic_task import PeriodicTaskConfig
+
+    async with async_session() as db:
+        result = await db.execute(select(PeriodicTaskConfig))
+        return list(result.scalars().all())
+
+
+class DatabaseScheduler(Scheduler):
+    """Планировщик Beat, перечитывающий расписание из БД раз в refresh_interval секунд.
+
+    При недоступной БД продолжает работать по последнему загруженному расписанию.
+    """
+
+    # Как часто перечитывать таблицу periodic_tasks, секунд
+    refresh_interval = 60
+
+    def setup_schedule(self) -> None:
+        self._last_refresh = 0.0
+        self._refresh()
+
+    def _refresh(self) -> None:
+        from celery_app.runtime import run_async
+
+        # Отметку ставим до merge_inplace: он сам обращается к self.schedule
+        self._last_refresh = time.monotonic()
+        try:
+            overrides = run_async(load_schedule_overrides)
+        except Exception:
+            logger.exception("Не удалось загрузить расписание из БД")
+            if self.data:
+                return
+            overrides = []
+
+        self.merge_inplace(build_beat_schedule(overrides))
+
+    @property
+    def schedule(self) -> dict:
+        if time.monotonic() - self._last_refresh > self.refresh_interval:
+            self._refresh()
+        return self.data
@@ -0,0 +1,28 @@
+"""Массовые Celery-задачи (очередь bulk): рассылки администратора."""
+
+import logging
+
+from celery_app.runtime import async_task
+
+logger = logging.getLogger(__name__)
+
+# Сколько получателей обрабатывает одна подзадача рассылки
+BROADCAST_CHUNK_SIZE = 500
+
+
+@async_task(ignore_result=True)
+async def send_broadcast_batch(telegram_ids: list[int], text: str) -> int:
+    """Отправить сообщение рассылки пачке получателей.
+
+    Args:
+        telegram_ids: Telegram ID получателей.
+        text: Текст сообщения.
+
+    Returns:
+        Количество отправленных сообщений.
+    """
+    from app.services.telegram_sender import Priority, send_many
+
+    sent = await send_many([(tg_id, text, None) for tg_id in telegram_ids], priority=Priority.MARKETING)
+    logger.info("Рассылка: отправлено %d из %d", sent, len(telegram_ids))
+    return sent
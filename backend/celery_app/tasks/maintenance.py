@@ -0,0 +1,89 @@
+"""Задачи обслуживания данных (очередь maintenance)."""
+
+import logging
+
+from celery_app.locks import periodic_singleton
+from celery_app.runtime import async_task
+
+logger = logging.getLogger(__name__)
+
+
+@async_task(ignore_result=True)
+@periodic_singleton(slot_seconds=60 * 60)
+async def deactivate_expired_subscriptions() -> int | None:
+    """Деактивировать абонементы с истёкшим сроком действия.
+
+    Returns:
+        Количество деактивированных абонементов.
+    """
+    from app.database import async_session
+    from app.services.subscription_deactivation import (
+        deactivate_expired_subscriptions as deactivate,
+    )
+
+    async with async_session() as db:
+        count = await deactivate(db)
+
+    logger.info("Деактивировано просроченных абонементов: %d", count)
+    return count
+
+
+@async_task(ignore_result=True)
+@periodic_singleton(slot_seconds=60 * 60)
+async def snapshot_balances() -> int | None:
+    """Снимки баланса на начало текущего месяца (журнал transactions).
+
+    Returns:
+        Количество новых снимков.
+    """
+    from app.database import async_session
+    from app.services.ledger import take_balance_snapshots
+
+    async with async_session() as db:
+        count = await take_balance_snapshots(db)
+
+    logger.info("Снимков баланса: %d", count)
+    return count
+
+
+@async_task(ignore_result=True)
+@periodic_singleton(slot_seconds=60 * 60)
+async def reconcile_ledger() -> int | None:
+    """Сверить балансы пользователей с журналом от последнего снимка.
+
+    Returns:
+        Количество пользователей с расхождением.
+    """
+    from app.database import async_session
+    from app.services.ledger import reconcile_ledger as reconcile
+
+    async with async_session() as db:
+        report = await reconcile(db)
+
+    logger.info(
+        "Сверка журнала: пользователей %d, записей %d, расхождений %d, ошибок цепочки %d",
+        report.users_checked,
+        report.entries_checked,
+        len(report.mismatches),
+        len(report.broken_entries),
+    )
+    return len(report.mismatches)
+
+
+@async_task(ignore_result=True)
+@periodic_singleton(slot_seconds=60)
+async def relay_domain_events() -> int | None:
+    """Опубликовать доменные события, оставшиеся в outbox после остановки процесса.
+
+    Returns:
+        Количество опубликованных событий.
+    """
+    from app.database import async_session
+    from app.services.domain_events import relay_outbox
+
+    async with async_session() as db:
+        count = await relay_outbox(db)
+
+    if count:
+        logger.warning("Из outbox опубликовано зависших событий: %d", count)
+    return count
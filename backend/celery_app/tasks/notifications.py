@@ -1,84 +1,137 @@
-"""Celery-задачи для отправки уведомлений через Telegram Bot API."""
+"""Celery-задачи для отправки уведомлений через Telegram Bot API.
+
+Задачи объявлены через async_task и выполняются в долгоживущем event loop
+процесса воркера — сессия бота и пул БД переиспользуются между задачами.
+Все задачи fire-and-forget: результат не сохраняется в Redis (ignore_result).
+"""
 
 import logging
+from datetime import date
 
-from celery_app import celery_app
+from celery_app.runtime import async_task
 
 logger = logging.getLogger(__name__)
 
 
-@celery_app.task
-def send_lesson_reminder(
-    telegram_id: int, lesson_name: str, time: str, room: str
-) -> None:
+@async_task(ignore_result=True)
+async def send_lesson_reminder(
+    telegram_id: int,
+    lesson_name: str,
+    time: str,
+    room: str,
+    lesson_id: int | None = None,
+    lesson_date: str | None = None,
+) -> bool:
     """Отправить напоминание о занятии через Telegram Bot.
 
-    В MVP: логируем.
-    В проде: отправляем сообщение через Bot API с inline-клавиатурой.
+    Массовые напоминания отправляет check_lesson_reminders пачками;
+    эта задача — для точечной (ручной) отправки одного напоминания.
 
     Args:
         telegram_id: Telegram ID пользователя.
         lesson_name: Название занятия.
         time: Время начала.
         room: Зал проведения.
+        lesson_id: ID занятия для кнопки «Подробнее» (опционально).
+        lesson_date: Дата занятия в ISO-формате (по умолчанию — сегодня).
+
+    Returns:
+        True если сообщение отправлено.
     """
-    logger.info(
-        "Напоминание для %d: %s в %s, зал %s",
-        telegram_id,
-        lesson_name,
-        time,
-        room,
-    )
+    from app.services.reminders import build_lesson_reminder_text, studio_now
+    from app.services.telegram_sender import send_message
+    from bot.keyboards.inline import lesson_reminder_keyboard
+
+    day = date.fromisoformat(lesson_date) if lesson_date else studio_now().date()
+    text = build_lesson_reminder_text(lesson_name, day, time, room)
+    markup = lesson_reminder_keyboard(lesson_id) if lesson_id is not None else None
+
+    sent = await send_message(telegram_id, text, markup)
+    logger.info("Напоминание для %d: %s в %s, зал %s", telegram_id, lesson_name, time, room)
+    return sent
 
 
-@celery_app.task
-def send_subscription_expiring(telegram_id: int, lessons_left: int) -> None:
+async def _send_subscription_expiring(items: list[list[int]]) -> int:
+    """Отправить уведомления об истечении абонементов пачкой."""
+    from app.services.reminders import build_subscription_expiring_text
+    from app.services.telegram_sender import Priority, send_many
+    from bot.keyboards.inline import subscription_keyboard
+
+    markup = subscription_keyboard()
+    messages = [
+        (telegram_id, build_subscription_expiring_text(lessons_left, days_left), markup)
+        for telegram_id, lessons_left, days_left in items
+    ]
+    return await send_many(messages, priority=Priority.MARKETING)
+
+
+@async_task(ignore_result=True)
+async def send_subscription_expiring(telegram_id: int, lessons_left: int, days_left: int = 1) -> bool:
     """Уведомление об истечении абонемента.
 
     Args:
         telegram_id: Telegram ID пользователя.
         lessons_left: Количество оставшихся занятий.
+        days_left: Через сколько дней истекает абонемент.
+
+    Returns:
+        True если сообщение отправлено.
     """
-    logger.info(
-        "Абонемент заканчивается у %d: осталось %d занятий",
-        telegram_id,
-        lessons_left,
-    )
+    return await _send_subscription_expiring([[telegram_id, lessons_left, days_left]]) == 1
 
 
-@celery_app.task
-def send_lesson_cancelled(
-    telegram_id: int, lesson_name: str, date: str
-) -> None:
+@async_task(ignore_result=True)
+async def send_subscription_expiring_batch(items: list[list[int]]) -> int:
+    """Пачка уведомлений об истечении абонементов (подзадача check_expiring_subscriptions).
+
+    Args:
+        items: Список [telegram_id, lessons_left, days_left].
+
+    Returns:
+        Количество отправленных сообщений.
+    """
+    sent = await _send_subscription_expiring(items)
+    logger.info("Уведомления об истечении абонементов: %d из %d", sent, len(items))
+    return sent
+
+
+@async_task(ignore_result=True)
+async def send_lesson_cancelled(
+    telegram_id: int,
+    lesson_name: str,
+    date: str,
+    reason: str = "отменено администратором",
+) -> bool:
     """Уведомление об отмене занятия.
 
     Args:
         telegram_id: Telegram ID пользователя.
         lesson_name: Название занятия.
         date: Дата занятия.
+        reason: Причина отмены.
+
+    Returns:
+        True если сообщение отправлено.
     """
-    logger.info(
-        "Занятие отменено для %d: %s %s",
-        telegram_id,
-        lesson_name,
-        date,
-    )
+    from app.services.notification import notify_lesson_cancelled
+
+    return await notify_lesson_cancelled(telegram_id, f"{lesson_name}, {date}", reason)
 
 
-@celery_app.task
-def send_booking_confirmation(
+@async_task(ignore_result=True)
+async def send_booking_confirmation(
     telegram_id: int, lesson_name: str, time: str
-) -> None:
+) -> bool:
     """Подтверждение записи на занятие.
 
     Args:
         telegram_id: Telegram ID пользователя.
         lesson_name: Название занятия.
         time: Время начала.
+
+    Returns:
+        True если сообщение отправлено.
     """
-    logger.info(
-        "Подтверждение записи для %d: %s в %s",
-        telegram_id,
-        lesson_name,
-        time,
-    )
+    from app.services.notification import notify_booking_created
+
+    return await notify_booking_created(telegram_id, f"{lesson_name} в {time}")
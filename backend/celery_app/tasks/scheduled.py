@@ -2,45 +2,87 @@
 
 import logging
 
-from celery.schedules import crontab
+from datetime import timedelta
+
+from celery import group
 
 from celery_app import celery_app
+from celery_app.locks import periodic_singleton
+from celery_app.runtime import async_task
+from celery_app.schedule import build_beat_schedule
 
 logger = logging.getLogger(__name__)
 
-# Настройка периодических задач (Celery Beat)
-celery_app.conf.beat_schedule = {
-    "check-lesson-reminders": {
-        "task": "celery_app.tasks.scheduled.check_lesson_reminders",
-        "schedule": crontab(minute="*/30"),  # каждые 30 минут
-    },
-    "check-expiring-subscriptions": {
-        "task": "celery_app.tasks.scheduled.check_expiring_subscriptions",
-        "schedule": crontab(hour=10, minute=0),  # каждый день в 10:00 МСК
-    },
-}
-
-
-@celery_app.task
-def check_lesson_reminders() -> None:
-    """Проверить занятия, которые начнутся через 2 часа, и отправить напоминания.
-
-    В проде:
-    1. Запрос к БД за занятиями, начинающимися через ~2 часа
-    2. Для каждого забронированного пользователя — отправка напоминания
-    3. Пометка отправленных напоминаний, чтобы не дублировать
+# Сколько уведомлений об истекающих абонементах отправляет одна подзадача
+EXPIRING_SUBSCRIPTIONS_CHUNK_SIZE = 500
+
+# Расписание по умолчанию; переопределения из БД применяет DatabaseScheduler
+celery_app.conf.beat_schedule = build_beat_schedule()
+
+
+@async_task(ignore_result=True)
+@periodic_singleton(slot_seconds=5 * 60)
+async def check_lesson_reminders(window_minutes: int | None = None) -> int | None:
+    """Отправить напоминания о занятиях, которые начнутся в ближайшие 2 часа.
+
+    1. Один оконный запрос за занятиями с активными записями и пользователями
+    2. Пакетная фиксация ключей в reminders_sent (ON CONFLICT DO NOTHING)
+    3. Отправка пачками с ограничением скорости
+
+    Окно (2 часа) шире интервала запуска (30 минут) — каждое занятие попадает
+    в несколько запусков, а дедупликация гарантирует одно напоминание.
+
+    Args:
+        window_minutes: Окно в минутах (переопределяется из админки через
+            расписание; по умолчанию LESSON_REMINDER_WINDOW_MINUTES).
+
+    Returns:
+        Количество отправленных напоминаний (None — запуск пропущен,
+        слот уже занят другой копией задачи).
     """
-    logger.info("Проверка напоминаний о занятиях...")
-    # В проде: query lessons starting in ~2 hours, send reminders to booked users
+    from app.database import async_session
+    from app.services.reminders import dispatch_lesson_reminders
+
+    async with async_session() as db:
+        window = timedelta(minutes=window_minutes) if window_minutes else None
+        sent = await dispatch_lesson_reminders(db, window=window)
+    logger.info("Проверка напоминаний о занятиях: отправлено %d", sent)
+    return sent
+
 
+@async_task(ignore_result=True)
+@periodic_singleton(slot_seconds=60 * 60)
+async def check_expiring_subscriptions() -> int | None:
+    """Уведомить пользователей, чьи абонементы заканчиваются через 3 дня или 1 день.
 
-@celery_app.task
-def check_expiring_subscriptions() -> None:
-    """Проверить абонементы, которые заканчиваются через 3 дня или 1 день.
+    1. Один агрегирующий запрос по пользователям (несколько истекающих
+       абонементов — одно уведомление)
+    2. Пакетная фиксация ключей в reminders_sent — повторный запуск
+       в тот же день ничего не отправит
+    3. Рассылка группой подзадач, по EXPIRING_SUBSCRIPTIONS_CHUNK_SIZE
+       уведомлений в каждой
 
-    В проде:
-    1. Запрос к БД за подписками, истекающими через 3 дня и 1 день
-    2. Отправка уведомлений пользователям о необходимости продления
+    Returns:
+        Количество поставленных в очередь уведомлений.
     """
-    logger.info("Проверка истекающих абонементов...")
-    # В проде: query subscriptions expiring soon, send notifications
+    from app.database import async_session
+    from app.services.reminders import collect_expiring_subscriptions, studio_now
+    from celery_app.tasks.notifications import send_subscription_expiring_batch
+
+    today = studio_now().date()
+    async with async_session() as db:
+        rows = await collect_expiring_subscriptions(db, today)
+        await db.commit()
+
+    items = [
+        [row.telegram_id, int(row.lessons_left), (row.expires_at - today).days]
+        for row in rows
+    ]
+    if items:
+        group(
+            send_subscription_expiring_batch.s(items[start:start + EXPIRING_SUBSCRIPTIONS_CHUNK_SIZE])
+            for start in range(0, len(items), EXPIRING_SUBSCRIPTIONS_CHUNK_SIZE)
+        ).apply_async()
+
+    logger.info("Проверка истекающих абонементов: в очереди %d уведомлений", len(items))
+    return len(items)
@@ -1,11 +1,20 @@
 """Воркер Celery — импортирует все задачи для регистрации.
 
-Запуск: celery -A celery_app.worker worker --loglevel=info
-Для Celery Beat: celery -A celery_app.worker beat --loglevel=info
+Запуск: celery -A celery_app.worker worker -Q notifications --loglevel=info
+(отдельный воркер на каждую очередь: notifications, bulk, maintenance)
+Для Celery Beat: celery -A celery_app.worker beat -S celery_app.schedule:DatabaseScheduler --loglevel=info
 """
 
 from celery_app import celery_app  # noqa: F401
 
+# Async runtime: event loop процесса, сессия бота и пул БД (сигналы воркера)
+import celery_app.runtime  # noqa: F401
+
+# Метрики Prometheus: длительность задач, HTTP-сервер метрик (CELERY_METRICS_PORT)
+import celery_app.metrics  # noqa: F401
+
 # Импортируем задачи, чтобы Celery их зарегистрировал
+import celery_app.tasks.bulk  # noqa: F401
+import celery_app.tasks.maintenance  # noqa: F401
 import celery_app.tasks.notifications  # noqa: F401
 import celery_app.tasks.scheduled  # noqa: F401
@@ -0,0 +1,117 @@
+"""
+Служебные команды DanceMax.
+
+Настройка webhook Telegram вынесена из старта приложения: на Vercel
+каждый холодный старт функции иначе делал бы setWebhook и setChatMenuButton
+(и удалял webhook при остановке инстанса). Команду запускают один раз
+после деплоя или смены BACKEND_URL.
+
+Запуск:
+  cd backend && python manage.py set-webhook
+  cd backend && python manage.py delete-webhook
+  cd backend && python manage.py consume-events [--group notifications]
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+
+from app.core.bot import close_bot, get_bot
+from app.core.config import settings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def set_webhook(drop_pending_updates: bool) -> None:
+    """Установить webhook бота и кнопку Web App в меню."""
+    from aiogram.types import MenuButtonWebApp, WebAppInfo
+
+    bot = get_bot()
+    webhook_url = f"{settings.BACKEND_URL}/api/bot/webhook"
+    try:
+        await bot.set_webhook(
+            url=webhook_url,
+            drop_pending_updates=drop_pending_updates,
+            secret_token=settings.TELEGRAM_WEBHOOK_SECRET or None,
+        )
+        logger.info("Telegram webhook установлен: %s", webhook_url)
+
+        await bot.set_chat_menu_button(
+            menu_button=MenuButtonWebApp(
+                text="Открыть приложение",
+                web_app=WebAppInfo(url=settings.TELEGRAM_WEBAPP_URL),
+            )
+        )
+        logger.info("Menu button установлена")
+    finally:
+        await close_bot()
+
+
+async def delete_webhook(drop_pending_updates: bool) -> None:
+    """Удалить webhook бота (например, перед запуском polling)."""
+    try:
+        await get_bot().delete_webhook(drop_pending_updates=drop_pending_updates)
+        logger.info("Telegram webhook удалён")
+    finally:
+        await close_bot()
+
+
+async def consume_events(groups: list[str], consumer_name: str, metrics_port: int | None) -> None:
+    """Потребители доменных событий до SIGTERM / SIGINT."""
+    from app.services.event_runner import run_consumers
+
+    if metrics_port:
+        from prometheus_client import start_http_server
+
+        start_http_server(metrics_port)
+        logger.info("Метрики потребителей на порту %d", metrics_port)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+    await run_consumers(groups, consumer_name, stop)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Служебные команды DanceMax")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (
+        ("set-webhook", "установить webhook Telegram и кнопку меню"),
+        ("delete-webhook", "удалить webhook Telegram"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument(
+            "--drop-pending-updates",
+            action="store_true",
+            help="отбросить накопленные у Telegram обновления",
+        )
+
+    from app.services.domain_events import consumer_groups
+    from app.services.event_runner import default_consumer_name
+
+    groups = sorted(consumer_groups())
+    command = commands.add_parser("consume-events", help="обрабатывать доменные события из Redis Stream")
+    command.add_argument(
+        "--group",
+        action="append",
+        choices=groups,
+        help="группа потребителей (можно несколько; по умолчанию — все)",
+    )
+    command.add_argument("--consumer", default=default_consumer_name(), help="имя экземпляра в группе")
+    command.add_argument("--metrics-port", type=int, help="порт HTTP-сервера метрик Prometheus")
+
+    args = parser.parse_args()
+    if args.command == "set-webhook":
+        asyncio.run(set_webhook(args.drop_pending_updates))
+    elif args.command == "delete-webhook":
+        asyncio.run(delete_webhook(args.drop_pending_updates))
+    else:
+        asyncio.run(consume_events(args.group or groups, args.consumer, args.metrics_port))
+
+
+if __name__ == "__main__":
+    main()
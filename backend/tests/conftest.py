@@ -8,14 +8,17 @@
   занятий и тарифных планов
 """
 
+import re
 from datetime import date, time, timedelta
 
 import pytest
-from httpx import ASGITransport, AsyncClient
+from httpx import ASGITransport, AsyncClient, Response
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from app.core.config import settings
+from app.core.rate_limit import limiter
 from app.core.security import create_access_token
-from app.database import Base, get_db
+from app.database import Base, get_db, get_session_factory
 from app.main import app
 from app.models.direction import Direction
 from app.models.lesson import Lesson
@@ -23,6 +26,9 @@ from app.models.promotion import Promotion
 from app.models.subscription import SubscriptionPlan
 from app.models.teacher import Teacher
 from app.models.user import User
+from app.services.catalog_cache import clear_local_cache
+from app.services.domain_events import drain_events
+from app.services.lesson_projection import invalidate_catalog_snapshot
 
 # Асинхронный движок SQLite in-memory для тестов
 # connect_args={"check_same_thread": False} необходим для SQLite + async
@@ -55,6 +61,10 @@ async def override_get_db():
 
 # Переопределяем зависимость get_db на тестовую
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_session_factory] = lambda: async_session_test
+
+# Тесты работают без Redis: распределённые блокировки и кеш отключены
+settings.REDIS_URL = ""
 
 
 @pytest.fixture(autouse=True)
@@ -66,8 +76,37 @@ async def setup_database():
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
+    # Обработчики доменных событий (без Redis — в этом процессе) завершаются до удаления таблиц
+    await drain_events()
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
+    # У каждого теста свой event loop, а единственное соединение in-memory
+    # SQLite привязывает к нему блокировку при параллельных запросах
+    # (например, в /bootstrap) — следующий тест получает новое соединение
+    await engine_test.dispose()
+
+
+@pytest.fixture(autouse=True)
+def reset_api_rate_limits():
+    """Лимиты запросов к API живут в памяти процесса — сбрасываем между тестами."""
+    limiter.reset()
+
+
+@pytest.fixture(autouse=True)
+def reset_catalog_caches():
+    """Кеш каталога и снимок для расписания живут в памяти процесса, а ID в тестовых БД повторяются."""
+    clear_local_cache()
+    invalidate_catalog_snapshot()
+
+
+@pytest.fixture(autouse=True)
+def reset_telegram_rate_limits(monkeypatch):
+    """Свежий лимитер отправки на каждый тест, без интервала между сообщениями в чат."""
+    from app.services import telegram_sender
+
+    monkeypatch.setattr(
+        telegram_sender, "_local_limiter", telegram_sender.LocalRateLimiter(chat_interval=0)
+    )
 
 
 @pytest.fixture
@@ -77,11 +116,37 @@ async def db_session() -> AsyncSession:
         yield session
 
 
+def _query_count(response: Response) -> int:
+    """Число SQL-запросов из заголовка Server-Timing (db;dur=...;desc="N queries")."""
+    match = re.search(r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers.get("Server-Timing", ""))
+    assert match is not None, "нет заголовка Server-Timing с числом SQL-запросов"
+    return int(match.group(1))
+
+
 @pytest.fixture
-async def client() -> AsyncClient:
-    """HTTP-клиент для тестирования FastAPI через ASGI."""
+async def client(request: pytest.FixtureRequest) -> AsyncClient:
+    """
+    HTTP-клиент для тестирования FastAPI через ASGI.
+
+    С маркером @pytest.mark.max_queries(N) каждый запрос клиента
+    должен выполнить не больше N SQL-запросов.
+    """
+    event_hooks = {}
+    marker = request.node.get_closest_marker("max_queries")
+    if marker is not None:
+        budget = marker.args[0]
+
+        async def check_budget(response: Response) -> None:
+            count = _query_count(response)
+            assert count <= budget, (
+                f"{response.request.method} {response.request.url.path}: "
+                f"{count} SQL-запросов, бюджет {budget}"
+            )
+
+        event_hooks["response"] = [check_budget]
+
     transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+    async with AsyncClient(transport=transport, base_url="http://test", event_hooks=event_hooks) as ac:
         yield ac
 
 
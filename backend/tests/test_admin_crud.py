@@ -8,14 +8,20 @@
 - CRUD акций
 - CRUD тарифных планов
 - Деактивация просроченных подписок
+- Постановка рассылки в очередь
+- Расписание периодических задач
 - Проверка прав доступа (только администратор)
 - Валидация данных и граничные случаи
 """
 
+import threading
 from datetime import date, timedelta
+from unittest.mock import patch
 
 import pytest
+from celery.canvas import group
 from httpx import AsyncClient
+from kombu.exceptions import OperationalError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.direction import Direction
@@ -573,6 +579,71 @@ class TestAdminPromotionsCRUD:
         assert response.json()["message"] == "Акция деактивирована"
 
 
+class TestAdminPromoCodeBatches:
+    """Тесты выпуска и выгрузки одноразовых промокодов."""
+
+    async def test_create_batch_and_export(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+        test_promo: Promotion,
+    ):
+        """Партия выпускается одной операцией и выгружается в CSV."""
+        response = await client.post(
+            f"/api/admin/promos/{test_promo.id}/codes",
+            json={"count": 50, "prefix": "partner"},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert data["size"] == 50
+
+        export = await client.get(
+            f"/api/admin/promos/{test_promo.id}/codes/export",
+            params={"batch_id": data["batch_id"]},
+            headers=admin_headers,
+        )
+
+        assert export.status_code == 200
+        assert export.headers["content-type"].startswith("text/csv")
+        lines = export.text.strip().splitlines()
+        assert lines[0] == "code,batch_id,used_at"
+        codes = [line.split(",")[0] for line in lines[1:]]
+        assert len(codes) == 50
+        assert len(set(codes)) == 50
+        assert all(code.startswith("PARTNER") for code in codes)
+
+    async def test_create_batch_invalid_count(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+        test_promo: Promotion,
+    ):
+        """Ошибка при недопустимом размере партии."""
+        response = await client.post(
+            f"/api/admin/promos/{test_promo.id}/codes",
+            json={"count": 0},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 400
+
+    async def test_create_batch_promotion_not_found(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+    ):
+        """Ошибка при выпуске кодов для несуществующей акции."""
+        response = await client.post(
+            "/api/admin/promos/99999/codes",
+            json={"count": 10},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 404
+
+
 # =====================================================================
 # Тесты: Тарифные планы (Subscription Plans)
 # =====================================================================
@@ -746,6 +817,178 @@ class TestDeactivateExpiredSubscriptions:
         assert response.status_code == 403
 
 
+# =====================================================================
+# Тесты: Рассылка
+# =====================================================================
+
+
+class TestAdminBroadcast:
+    """Тесты постановки рассылки в очередь."""
+
+    async def test_broadcast_without_recipients(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+        test_direction: Direction,
+    ):
+        """Рассылка без получателей не ставит задач, но возвращает статус."""
+        response = await client.post(
+            "/api/admin/broadcast",
+            json={
+                "message": "Привет!",
+                "target": "by_direction",
+                "direction_id": test_direction.id,
+            },
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "queued"
+        assert data["total_users"] == 0
+
+    async def test_broadcast_published_off_loop(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+        test_user: User,
+    ):
+        """Пачки публикуются в брокер из пула потоков, а не в event loop."""
+        threads = []
+
+        def fake_apply_async(self, *args, **kwargs):
+            threads.append(threading.current_thread())
+
+        with patch.object(group, "apply_async", fake_apply_async):
+            response = await client.post(
+                "/api/admin/broadcast",
+                json={"message": "Привет!", "target": "all"},
+                headers=admin_headers,
+            )
+
+        assert response.status_code == 200
+        assert response.json()["total_users"] >= 1
+        assert len(threads) == 1
+        assert threads[0] is not threading.main_thread()
+
+    async def test_broadcast_broker_unavailable(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+        test_user: User,
+    ):
+        """Брокер недоступен — 503 вместо 500."""
+        def fail(self, *args, **kwargs):
+            raise OperationalError("Connection refused")
+
+        with patch.object(group, "apply_async", fail):
+            response = await client.post(
+                "/api/admin/broadcast",
+                json={"message": "Привет!", "target": "all"},
+                headers=admin_headers,
+            )
+
+        assert response.status_code == 503
+
+    async def test_broadcast_invalid_schedule(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+    ):
+        """Некорректный schedule_at — 400."""
+        response = await client.post(
+            "/api/admin/broadcast",
+            json={"message": "Привет!", "schedule_at": "завтра"},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 400
+
+
+# =====================================================================
+# Тесты: Расписание периодических задач
+# =====================================================================
+
+
+class TestAdminSchedule:
+    """Тесты управления расписанием периодических задач."""
+
+    async def test_update_reminder_window(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+    ):
+        """Окно напоминаний меняется и видно в списке расписания."""
+        response = await client.put(
+            "/api/admin/schedule/check-lesson-reminders",
+            json={"crontab": "*/15 * * * *", "kwargs": {"window_minutes": 90}},
+            headers=admin_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.json()["kwargs"] == {"window_minutes": 90}
+
+        response = await client.get("/api/admin/schedule", headers=admin_headers)
+        tasks = {task["name"]: task for task in response.json()}
+        assert tasks["check-lesson-reminders"]["crontab"] == "*/15 * * * *"
+        assert tasks["check-lesson-reminders"]["is_default"] is False
+        assert tasks["check-expiring-subscriptions"]["is_default"] is True
+
+    async def test_update_validation(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+    ):
+        """Некорректный crontab, неизвестный параметр и задача — ошибки."""
+        response = await client.put(
+            "/api/admin/schedule/check-lesson-reminders",
+            json={"crontab": "каждый час"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+        response = await client.put(
+            "/api/admin/schedule/check-lesson-reminders",
+            json={"kwargs": {"batch": 10}},
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+        response = await client.put(
+            "/api/admin/schedule/unknown",
+            json={"enabled": False},
+            headers=admin_headers,
+        )
+        assert response.status_code == 404
+
+    async def test_update_interval_shorter_than_slot(
+        self,
+        client: AsyncClient,
+        admin_headers: dict,
+    ):
+        """Crontab чаще слота блокировки задачи отклоняется — запуски не пропадают молча."""
+        response = await client.put(
+            "/api/admin/schedule/check-lesson-reminders",
+            json={"crontab": "*/2 * * * *"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+        response = await client.put(
+            "/api/admin/schedule/reconcile-ledger",
+            json={"crontab": "0,30 4 * * *"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+        response = await client.put(
+            "/api/admin/schedule/check-lesson-reminders",
+            json={"crontab": "*/5 * * * *"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+
+
 # =====================================================================
 # Тесты: Проверка прав доступа (общие)
 # =====================================================================
@@ -81,6 +81,27 @@ class TestTelegramAuth:
         # Баланс сохраняется при повторной авторизации
         assert data["user"]["balance"] == test_user.balance
 
+    async def test_auth_restores_telegram_reachable(
+        self, client: AsyncClient, db_session: AsyncSession, test_user: User
+    ):
+        """Открытие Mini App снимает отметку недоступности в Telegram."""
+        test_user.telegram_reachable = False
+        await db_session.commit()
+
+        with patch(
+            "app.api.routes.auth.validate_init_data",
+            return_value={"id": test_user.telegram_id, "first_name": test_user.first_name},
+        ):
+            response = await client.post(
+                "/api/auth/telegram",
+                json={"init_data": "mock_init_data_reachable"},
+            )
+
+        assert response.status_code == 200
+        await db_session.refresh(test_user)
+        assert test_user.telegram_reachable is True
+        assert test_user.telegram_unreachable_at is None
+
     async def test_auth_invalid_init_data(self, client: AsyncClient):
         """Отказ авторизации при невалидных данных initData от Telegram."""
         with patch(
@@ -0,0 +1,77 @@
+"""
+Тесты эндпоинта GET /api/bootstrap.
+
+Проверяет:
+- Профиль, баланс, абонементы, расписание и записи в одном ответе
+- Отметки записи в расписании на сегодня
+- 304 при повторном запуске без изменений
+- Требование авторизации
+"""
+
+from httpx import AsyncClient
+
+from app.models.lesson import Lesson
+from app.models.subscription import SubscriptionPlan
+from app.models.user import User
+from tests.conftest import _query_count
+
+
+class TestBootstrap:
+    """Тесты стартовых данных Mini App."""
+
+    async def test_bootstrap_contents(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_plan: SubscriptionPlan,
+        test_lesson: Lesson,
+        test_lesson_tomorrow: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """После покупки и записи ответ содержит абонемент, запись и отметку в расписании."""
+        await client.post("/api/payments/create", json={"plan_id": test_plan.id}, headers=auth_headers)
+        await client.post("/api/bookings", json={"lesson_id": test_lesson_tomorrow.id}, headers=auth_headers)
+
+        response = await client.get("/api/bootstrap", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        me = (await client.get("/api/auth/me", headers=auth_headers)).json()
+        assert data["profile"] == me
+        assert data["balance"] == me["balance"]
+
+        assert [s["plan"]["id"] for s in data["active_subscriptions"]] == [test_plan.id]
+
+        # Сегодня — только test_lesson, записи на него нет
+        assert [lesson["id"] for lesson in data["today_lessons"]] == [test_lesson.id]
+        assert data["today_lessons"][0]["is_booked"] is False
+
+        assert [b["lesson"]["id"] for b in data["upcoming_bookings"]] == [test_lesson_tomorrow.id]
+        assert data["upcoming_bookings"][0]["lesson"]["is_booked"] is True
+        assert data["catalog_version"]
+
+    async def test_bootstrap_not_modified(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """Повторный запуск без изменений — 304 без запросов сверх загрузки пользователя."""
+        response = await client.get("/api/bootstrap", headers=auth_headers)
+        etag = response.headers["ETag"]
+
+        response = await client.get("/api/bootstrap", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 304
+        assert _query_count(response) == 1
+
+        # Запись меняет расписание — ответ собирается заново
+        await client.post("/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers)
+        response = await client.get("/api/bootstrap", headers={**auth_headers, "If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["today_lessons"][0]["is_booked"] is True
+
+    async def test_bootstrap_unauthorized(self, client: AsyncClient):
+        """Без токена — 401."""
+        response = await client.get("/api/bootstrap")
+        assert response.status_code == 401
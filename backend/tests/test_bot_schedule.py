@@ -0,0 +1,114 @@
+"""
+Тесты расписания дня для команды бота /schedule.
+
+Проверяет:
+- Рендер расписания со свободными местами
+- Повторное использование кеша без обращения к БД
+- Сброс кеша при записи через API
+- Устаревание кеша при переименовании направления
+"""
+
+from datetime import date, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking
+from app.models.lesson import Lesson
+from app.models.user import User
+from app.services import bot_schedule
+
+
+@pytest.fixture(autouse=True)
+def clear_schedule_cache():
+    """Кеш расписания живёт на уровне модуля — очищаем между тестами."""
+    bot_schedule._local_cache.clear()
+    yield
+    bot_schedule._local_cache.clear()
+
+
+class TestDaySchedule:
+    """Тесты get_day_schedule / invalidate_day_schedule."""
+
+    async def test_render_shows_free_spots(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_admin: User,
+        test_lesson: Lesson,
+    ):
+        """В тексте — направление, преподаватель и число свободных мест."""
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        db_session.add(Booking(user_id=test_admin.id, lesson_id=test_lesson.id, status="cancelled"))
+        await db_session.commit()
+
+        text = await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+
+        assert "18:00–19:30" in text
+        assert "Хип-хоп" in text
+        assert "Анна Иванова" in text
+        assert "свободно 9 из 10" in text
+
+    async def test_empty_day(self, db_session: AsyncSession):
+        """День без занятий."""
+        text = await bot_schedule.get_day_schedule(db_session, date.today() + timedelta(days=30))
+
+        assert "Занятий нет" in text
+
+    async def test_cached_until_invalidated(
+        self, db_session: AsyncSession, test_user: User, test_lesson: Lesson
+    ):
+        """Повторный запрос берётся из кеша; после сброса — пересчитывается."""
+        first = await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+        assert "свободно 10 из 10" in first
+
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        await db_session.commit()
+
+        assert await bot_schedule.get_day_schedule(db_session, test_lesson.date) == first
+
+        await bot_schedule.invalidate_day_schedule(test_lesson.date)
+        refreshed = await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+        assert "свободно 9 из 10" in refreshed
+
+    async def test_booking_via_api_invalidates(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict,
+    ):
+        """Запись через API сбрасывает кеш расписания на дату занятия."""
+        await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+
+        response = await client.post(
+            "/api/bookings",
+            json={"lesson_id": test_lesson.id},
+            headers=auth_headers,
+        )
+        assert response.status_code == 201
+
+        text = await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+        assert "свободно 9 из 10" in text
+
+    async def test_direction_rename_invalidates(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_lesson: Lesson,
+        admin_headers: dict,
+    ):
+        """Новое название направления сразу попадает в текст расписания."""
+        await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+
+        response = await client.put(
+            f"/api/admin/directions/{test_lesson.direction_id}",
+            json={"name": "Переименованное"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+
+        text = await bot_schedule.get_day_schedule(db_session, test_lesson.date)
+        assert "Переименованное" in text
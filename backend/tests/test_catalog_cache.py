@@ -0,0 +1,112 @@
+"""
+Тесты кеша каталога (app.services.catalog_cache).
+
+Проверяет:
+- Повторный запрос каталога отдаётся из кеша без обращения к БД
+- ETag и ответ 304 на If-None-Match
+- Изменение в админке увеличивает версию тега и сбрасывает зависимые ответы
+- Без Redis ETag расписания устаревает через LOCAL_TTL_SECONDS
+"""
+
+from unittest.mock import patch
+
+from httpx import AsyncClient
+
+from app.models.direction import Direction
+from app.models.subscription import SubscriptionPlan
+from app.models.lesson import Lesson
+from app.models.teacher import Teacher
+from app.services.catalog_cache import LOCAL_TTL_SECONDS
+from tests.conftest import _query_count
+
+
+class TestCatalogCache:
+    """Тесты кеша каталога."""
+
+    async def test_repeated_request_served_from_cache(
+        self,
+        client: AsyncClient,
+        test_plan: SubscriptionPlan,
+    ):
+        """Второй GET /api/payments/plans не обращается к БД."""
+        first = await client.get("/api/payments/plans")
+        second = await client.get("/api/payments/plans")
+
+        assert second.json() == first.json()
+        assert _query_count(first) > 0
+        assert _query_count(second) == 0
+
+    async def test_etag_not_modified(
+        self,
+        client: AsyncClient,
+        test_direction: Direction,
+    ):
+        """Клиент с актуальным ETag получает 304 без тела."""
+        response = await client.get("/api/directions")
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "no-cache"
+
+        response = await client.get("/api/directions", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+
+    async def test_admin_update_bumps_version(
+        self,
+        client: AsyncClient,
+        test_direction: Direction,
+        admin_headers: dict[str, str],
+    ):
+        """После изменения направления ETag меняется, а старый больше не даёт 304."""
+        etag = (await client.get("/api/directions")).headers["ETag"]
+
+        response = await client.put(
+            f"/api/admin/directions/{test_direction.id}",
+            json={"name": "Хип-хоп Pro"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+
+        response = await client.get("/api/directions", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.json()[0]["name"] == "Хип-хоп Pro"
+
+    async def test_dependent_tag_invalidated(
+        self,
+        client: AsyncClient,
+        test_teacher: Teacher,
+        test_direction: Direction,
+        admin_headers: dict[str, str],
+    ):
+        """Список преподавателей зависит от тега directions — специализации обновляются."""
+        teachers = (await client.get("/api/teachers")).json()
+        assert teachers[0]["specializations"] == ["Хип-хоп"]
+
+        await client.put(
+            f"/api/admin/directions/{test_direction.id}",
+            json={"name": "Брейк-данс"},
+            headers=admin_headers,
+        )
+
+        teachers = (await client.get("/api/teachers")).json()
+        assert teachers[0]["specializations"] == ["Брейк-данс"]
+
+    async def test_local_versions_expire(
+        self,
+        client: AsyncClient,
+        test_lesson: Lesson,
+    ):
+        """Без Redis изменение в другом процессе не видно — ETag меняется со сменой интервала."""
+        now = 1_800_000_000.0
+        with patch("app.services.catalog_cache.time.time", return_value=now):
+            etag = (await client.get("/api/lessons")).headers["ETag"]
+            response = await client.get("/api/lessons", headers={"If-None-Match": etag})
+            assert response.status_code == 304
+
+        with patch(
+            "app.services.catalog_cache.time.time", return_value=now + LOCAL_TTL_SECONDS
+        ):
+            response = await client.get("/api/lessons", headers={"If-None-Match": etag})
+        assert response.status_code == 200
@@ -0,0 +1,60 @@
+"""
+Тесты async runtime Celery-воркеров.
+
+Проверяет:
+- Выполнение async-задач в одном долгоживущем event loop
+- Остановку loop с закрытием ресурсов
+- Ошибку вместо взаимоблокировки при вызове из потока loop
+"""
+
+import asyncio
+
+import pytest
+
+from celery_app import runtime
+
+
+class TestAsyncRuntime:
+    """Тесты run_async и async_task."""
+
+    def test_tasks_share_persistent_loop(self):
+        """Несколько вызовов задачи выполняются в одном и том же loop."""
+
+        @runtime.async_task(name="tests.current_loop")
+        async def current_loop(value: int) -> tuple[int, int]:
+            await asyncio.sleep(0)
+            return value * 2, id(asyncio.get_running_loop())
+
+        try:
+            first, first_loop = current_loop(1)
+            second, second_loop = current_loop.apply(args=(2,)).get()
+
+            assert (first, second) == (2, 4)
+            assert first_loop == second_loop
+        finally:
+            runtime.shutdown_loop()
+
+    def test_shutdown_is_idempotent(self):
+        """Повторная остановка без запущенного loop ничего не делает."""
+        runtime.start_loop()
+        runtime.shutdown_loop()
+        runtime.shutdown_loop()
+
+        assert runtime._loop is None
+
+    def test_nested_call_raises(self):
+        """Синхронный вызов задачи из корутины в loop — ошибка, а не зависание."""
+
+        @runtime.async_task(name="tests.inner")
+        async def inner() -> int:
+            return 1
+
+        @runtime.async_task(name="tests.outer")
+        async def outer() -> int:
+            return inner()
+
+        try:
+            with pytest.raises(RuntimeError):
+                outer()
+        finally:
+            runtime.shutdown_loop()
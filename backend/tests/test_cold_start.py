@@ -0,0 +1,70 @@
+"""Тесты холодного старта точки входа Vercel (api/index.py)."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Модули, которые не должны загружаться при импорте приложения
+HEAVY_MODULES = ("aiogram", "yookassa", "sentry_sdk", "celery", "kombu", "billiard")
+
+# Бюджет на импорт api.index (суммарное время по -X importtime, мкс).
+# С запасом на медленные CI-машины; тяжёлые модули проверяются отдельно по списку
+IMPORT_BUDGET_US = 1_500_000
+
+
+def _run_import(*args: str) -> subprocess.CompletedProcess:
+    """Импортировать api.index в чистом интерпретаторе."""
+    env = {**os.environ, "TELEGRAM_BOT_TOKEN": "123456:ABC-DEF", "SENTRY_DSN": ""}
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _imported_modules() -> set[str]:
+    """Модули в sys.modules после импорта api.index."""
+    result = _run_import("-c", "import sys, api.index; print('\\n'.join(sys.modules))")
+    return set(result.stdout.split())
+
+
+def _import_times() -> dict[str, int]:
+    """Суммарное время импорта (мкс) каждого модуля по выводу -X importtime."""
+    result = _run_import("-X", "importtime", "-c", "import api.index")
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestColdStart:
+    """Импорт приложения без тяжёлых интеграций."""
+
+    def test_heavy_integrations_not_imported(self):
+        """aiogram, ЮКасса и Sentry загружаются лениво — при первом использовании."""
+        modules = _imported_modules()
+        loaded = [
+            name for name in modules
+            if name.split(".")[0] in HEAVY_MODULES
+        ]
+        assert loaded == []
+
+    def test_import_within_budget(self):
+        """Импорт точки входа укладывается в бюджет холодного старта."""
+        times = _import_times()
+        heavy = sorted(
+            name for name in times if name.split(".")[0] in HEAVY_MODULES
+        )
+        assert heavy == []
+        assert times["api.index"] < IMPORT_BUDGET_US
@@ -0,0 +1,105 @@
+"""
+Тесты условных GET-запросов (ETag / If-None-Match).
+
+Проверяет:
+- 304 без обращения к БД сверх загрузки пользователя
+- Cache-Control: private и Vary: Authorization для персональных ответов
+- ETag меняется после записи на занятие (баланс, заполненность, записи)
+- Запись другого пользователя не меняет личные ETag
+"""
+
+from httpx import AsyncClient
+
+from app.models.lesson import Lesson
+from app.models.user import User
+from tests.conftest import _query_count
+
+
+class TestConditionalGet:
+    """Тесты ETag и 304."""
+
+    async def test_balance_not_modified(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        auth_headers: dict[str, str],
+    ):
+        """Повторный запрос баланса с ETag — 304, только запрос пользователя."""
+        response = await client.get("/api/users/balance", headers=auth_headers)
+        etag = response.headers["ETag"]
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        assert "Authorization" in response.headers["Vary"]
+
+        response = await client.get(
+            "/api/users/balance", headers={**auth_headers, "If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert _query_count(response) == 1
+
+    async def test_booking_changes_etags(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """После записи баланс, расписание и список записей отдаются заново."""
+        urls = ("/api/users/balance", "/api/lessons", "/api/bookings/my", "/api/auth/me")
+        etags = {}
+        for url in urls:
+            etags[url] = (await client.get(url, headers=auth_headers)).headers["ETag"]
+
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+        )
+        assert response.status_code == 201
+
+        for url in urls:
+            response = await client.get(url, headers={**auth_headers, "If-None-Match": etags[url]})
+            assert response.status_code == 200, url
+            assert response.headers["ETag"] != etags[url]
+
+        lessons = (await client.get("/api/lessons", headers=auth_headers)).json()
+        assert lessons[0]["is_booked"] is True
+
+    async def test_other_user_booking_keeps_private_etags(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict[str, str],
+        admin_headers: dict[str, str],
+    ):
+        """Запись другого пользователя меняет только публичное расписание."""
+        private_urls = ("/api/bookings/my", "/api/bootstrap")
+        etags = {}
+        for url in (*private_urls, "/api/lessons"):
+            etags[url] = (await client.get(url, headers=auth_headers)).headers["ETag"]
+
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=admin_headers
+        )
+        assert response.status_code == 201
+
+        for url in private_urls:
+            response = await client.get(url, headers={**auth_headers, "If-None-Match": etags[url]})
+            assert response.status_code == 304, url
+        response = await client.get(
+            "/api/lessons", headers={**auth_headers, "If-None-Match": etags["/api/lessons"]}
+        )
+        assert response.status_code == 200
+
+    async def test_schedule_etag_depends_on_user(
+        self,
+        client: AsyncClient,
+        test_lesson: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """Анонимный и авторизованный запрос расписания — разные ETag."""
+        anonymous = await client.get("/api/lessons")
+        authorized = await client.get("/api/lessons", headers=auth_headers)
+
+        assert anonymous.headers["ETag"] != authorized.headers["ETag"]
+        assert "Authorization" in anonymous.headers["Vary"]
@@ -0,0 +1,194 @@
+"""
+Тесты доменных событий.
+
+Проверяет:
+- Событие публикуется только после commit, rollback его отбрасывает
+- Событие пишется в outbox и удаляется после публикации; зависшие публикует relay
+- Запрос к API отвечает после публикации своих событий
+- Без Redis потребители обрабатывают событие в этом же процессе
+- Отмена занятия уведомляет всех записанных через потребителя
+- Повторная доставка события не отправляет уведомление второй раз
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking
+from app.models.lesson import Lesson
+from app.models.outbox import OutboxEvent
+from app.models.user import User
+from app.services import domain_events, event_consumers
+from app.services.domain_events import (
+    RELAY_DELAY_SECONDS,
+    DomainEvent,
+    drain_events,
+    record_event,
+    relay_outbox,
+)
+
+
+class _SetNxRedis:
+    """Минимальный Redis для дедупликации: SET NX и DELETE."""
+
+    def __init__(self):
+        self.keys: set[str] = set()
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys.add(key)
+        return True
+
+    async def delete(self, key):
+        self.keys.discard(key)
+
+
+class TestDomainEvents:
+    """Тесты публикации и обработки событий."""
+
+    async def test_published_after_commit_only(self, monkeypatch, db_session: AsyncSession):
+        """Rollback отбрасывает события транзакции, commit — публикует."""
+        published = []
+
+        async def fake_publish(events):
+            published.extend(events)
+
+        monkeypatch.setattr(domain_events, "publish_events", fake_publish)
+
+        await db_session.execute(select(1))
+        record_event(db_session, "subscription.expired", subscription_id=1, user_id=1)
+        await db_session.rollback()
+        await drain_events()
+        assert published == []
+
+        await db_session.execute(select(1))
+        record_event(db_session, "subscription.expired", subscription_id=2, user_id=1)
+        assert published == []
+        await db_session.commit()
+        await drain_events()
+        assert [e.payload["subscription_id"] for e in published] == [2]
+
+    async def test_outbox_relay(self, monkeypatch, db_session: AsyncSession):
+        """Опубликованное событие удаляется из outbox; оставшееся после сбоя публикует relay."""
+        published = []
+
+        async def fake_publish(events):
+            published.extend(events)
+
+        monkeypatch.setattr(domain_events, "publish_events", fake_publish)
+
+        record_event(db_session, "subscription.expired", subscription_id=1, user_id=1)
+        await db_session.commit()
+        await drain_events()
+        assert await db_session.scalar(select(OutboxEvent.id)) is None
+
+        # Процесс остановился между commit и публикацией: строка осталась
+        stale = datetime.utcnow() - timedelta(seconds=RELAY_DELAY_SECONDS + 1)
+        db_session.add_all([
+            OutboxEvent(type="subscription.expired", payload={"subscription_id": 2},
+                        occurred_at=stale),
+            OutboxEvent(type="subscription.expired", payload={"subscription_id": 3},
+                        occurred_at=datetime.utcnow()),
+        ])
+        await db_session.commit()
+        published.clear()
+
+        assert await relay_outbox(db_session) == 1
+        assert [e.payload["subscription_id"] for e in published] == [2]
+        # Свежая строка ещё публикуется записавшим её процессом — relay её не трогает
+        remaining = (await db_session.scalars(select(OutboxEvent.payload))).all()
+        assert remaining == [{"subscription_id": 3}]
+
+    async def test_unknown_event_type(self, db_session: AsyncSession):
+        """Неизвестный тип события — ошибка в месте вызова."""
+        with pytest.raises(ValueError):
+            record_event(db_session, "booking.moved")
+
+    async def test_booking_notification_via_consumer(
+        self,
+        monkeypatch,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """Запись на занятие уведомляет пользователя через группу notifications."""
+        sent = []
+
+        async def fake_notify(**kwargs):
+            sent.append(kwargs)
+            return True
+
+        monkeypatch.setattr(event_consumers, "notify_booking_created", fake_notify)
+
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+        )
+        assert response.status_code == 201
+        # Событие обработано до ответа — без drain_events()
+        assert sent == [{
+            "user_telegram_id": test_user.telegram_id,
+            "lesson_info": f"Хип-хоп\n{date.today().isoformat()} 18:00",
+        }]
+
+    async def test_lesson_cancelled_notifies_booked_users(
+        self,
+        monkeypatch,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        test_admin: User,
+        test_lesson: Lesson,
+        admin_headers: dict[str, str],
+    ):
+        """Событие lesson.cancelled содержит всех записанных — каждому уходит уведомление."""
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        await db_session.commit()
+
+        notified = []
+
+        async def fake_notify(**kwargs):
+            notified.append(kwargs["user_telegram_id"])
+            return True
+
+        monkeypatch.setattr(event_consumers, "notify_lesson_cancelled", fake_notify)
+
+        response = await client.delete(f"/api/admin/lessons/{test_lesson.id}", headers=admin_headers)
+        assert response.status_code == 200
+        await drain_events()
+
+        assert notified == [test_user.telegram_id]
+
+    async def test_outbox_id_survives_stream(self):
+        """ID строки outbox передаётся через поток и задаёт ключ события."""
+        event = DomainEvent(type="subscription.expired", payload={"subscription_id": 1}, outbox_id=7)
+        received = DomainEvent.from_fields("1-0", event.to_fields())
+        assert received.outbox_id == 7
+        assert received.key == "outbox:7"
+        assert DomainEvent.from_fields("1-0", DomainEvent("subscription.expired", {}).to_fields()).key == "stream:1-0"
+
+    async def test_redelivered_event_notifies_once(self, monkeypatch):
+        """Повтор события (XCLAIM, повторная публикация relay) не дублирует уведомление."""
+        redis = _SetNxRedis()
+        monkeypatch.setattr(event_consumers, "get_redis", lambda: redis)
+        results = [False, True, True]
+        sent = []
+
+        async def fake_notify(**kwargs):
+            sent.append(kwargs["user_telegram_id"])
+            return results.pop(0)
+
+        monkeypatch.setattr(event_consumers, "notify_payment_succeeded", fake_notify)
+        payload = {"telegram_id": 100, "plan_name": "8 занятий", "balance": 8}
+        first = DomainEvent(type="payment.succeeded", payload=payload, id="1-0", outbox_id=5)
+        republished = DomainEvent(type="payment.succeeded", payload=payload, id="2-0", outbox_id=5)
+
+        # Первая отправка не удалась — отметка снята, повтор отправляет снова
+        await event_consumers.notify_on_payment_succeeded(first)
+        await event_consumers.notify_on_payment_succeeded(first)
+        await event_consumers.notify_on_payment_succeeded(republished)
+        assert sent == [100, 100]
@@ -0,0 +1,177 @@
+"""
+Тесты журнала баланса (transactions).
+
+Проверяет:
+- Запись и отмена пишут в журнал нарастающий итог и ID бронирования
+- Списание больше баланса отклоняется, баланс не меняется
+- Записи журнала нельзя изменить
+- Снимки на начало месяца и сверка только по записям после снимка
+- Граница снимка — один ID: запись с поздним created_at не выпадает из сверки
+- Баланс на произвольный момент
+"""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lesson import Lesson
+from app.models.transaction import Transaction
+from app.models.user import User
+from app.services.ledger import balance_at, post_entry, reconcile_ledger, take_balance_snapshots
+
+
+async def _entries(db: AsyncSession, user_id: int) -> list[Transaction]:
+    result = await db.execute(
+        select(Transaction).where(Transaction.user_id == user_id).order_by(Transaction.id)
+    )
+    return list(result.scalars().all())
+
+
+async def _new_user(db: AsyncSession) -> User:
+    user = User(telegram_id=700_001, first_name="Журнал", balance=0)
+    db.add(user)
+    await db.commit()
+    return user
+
+
+class TestLedgerEntries:
+    """Тесты записей журнала."""
+
+    async def test_booking_and_cancel_write_running_total(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict,
+    ):
+        """Списание и возврат: balance_after совпадает с балансом, бронирование связано."""
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+        )
+        assert response.status_code == 201
+        booking_id = response.json()["id"]
+
+        response = await client.delete(f"/api/bookings/{booking_id}", headers=auth_headers)
+        assert response.status_code == 200
+
+        entries = await _entries(db_session, test_user.id)
+        assert [(e.type, e.amount, e.balance_after) for e in entries] == [
+            ("deduction", -1, 4),
+            ("refund", 1, 5),
+        ]
+        assert {e.booking_id for e in entries} == {booking_id}
+
+    async def test_overdraft_rejected(self, db_session: AsyncSession):
+        """Списание больше баланса — 400, журнал и баланс не меняются."""
+        user = await _new_user(db_session)
+        user_id = user.id
+        await post_entry(db_session, user, "purchase", 2, "Покупка")
+        await db_session.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            await post_entry(db_session, user, "manual", -3, "Списание")
+        await db_session.rollback()
+
+        assert exc_info.value.status_code == 400
+        assert await db_session.scalar(select(User.balance).where(User.id == user_id)) == 2
+        assert len(await _entries(db_session, user_id)) == 1
+
+    async def test_entries_are_append_only(self, db_session: AsyncSession):
+        """Изменение записи журнала запрещено."""
+        user = await _new_user(db_session)
+        entry = await post_entry(db_session, user, "purchase", 4, "Покупка")
+        await db_session.commit()
+
+        entry.amount = 40
+        with pytest.raises(RuntimeError):
+            await db_session.flush()
+        await db_session.rollback()
+
+
+class TestSnapshotsAndReconciliation:
+    """Тесты снимков и сверки."""
+
+    async def test_reconcile_from_last_snapshot(self, db_session: AsyncSession):
+        """Сверка читает только записи после снимка и находит расхождение."""
+        user = await _new_user(db_session)
+        await post_entry(db_session, user, "purchase", 8, "Покупка")
+        await post_entry(db_session, user, "deduction", -1, "Запись")
+        await db_session.commit()
+
+        next_month = (date.today().replace(day=1) + timedelta(days=32)).replace(day=1)
+        assert await take_balance_snapshots(db_session, next_month) == 1
+        # Повторный запуск за тот же месяц ничего не добавляет
+        assert await take_balance_snapshots(db_session, next_month) == 0
+
+        await post_entry(db_session, user, "deduction", -1, "Запись")
+        await db_session.commit()
+
+        report = await reconcile_ledger(db_session)
+        assert report.ok
+        assert report.users_checked == 1
+        assert report.entries_checked == 1
+
+        # Баланс изменён в обход журнала
+        await db_session.execute(update(User).where(User.id == user.id).values(balance=10))
+        await db_session.commit()
+
+        report = await reconcile_ledger(db_session)
+        assert [(m.user_id, m.balance, m.expected) for m in report.mismatches] == [
+            (user.id, 10, 6)
+        ]
+        assert report.broken_entries == []
+
+    async def test_snapshot_cut_by_single_id(self, db_session: AsyncSession):
+        """Запись с меньшим ID, но created_at после начала месяца, входит в снимок."""
+        first = await _new_user(db_session)
+        second = User(telegram_id=700_002, first_name="Второй", balance=0)
+        db_session.add(second)
+        await db_session.commit()
+
+        period = date.today().replace(day=1)
+        before = datetime(period.year, period.month, 1) - timedelta(hours=1)
+        entries = [
+            await post_entry(db_session, first, "purchase", 8, "Покупка"),
+            # Часы другого инстанса: запись после границы, хотя ID меньше
+            await post_entry(db_session, second, "purchase", 4, "Покупка"),
+            await post_entry(db_session, first, "deduction", -1, "Запись"),
+        ]
+        await db_session.commit()
+        early_ids = [entries[0].id, entries[2].id]
+        await db_session.execute(
+            update(Transaction).where(Transaction.id.in_(early_ids)).values(created_at=before)
+        )
+        await db_session.commit()
+
+        assert await take_balance_snapshots(db_session, period) == 2
+
+        report = await reconcile_ledger(db_session)
+        assert report.ok
+        assert report.entries_checked == 0
+
+    async def test_balance_at(self, db_session: AsyncSession):
+        """Баланс на момент — итог последней записи до него."""
+        user = await _new_user(db_session)
+        before = datetime.utcnow() - timedelta(minutes=1)
+        await post_entry(db_session, user, "purchase", 8, "Покупка")
+        await post_entry(db_session, user, "deduction", -1, "Запись")
+        await db_session.commit()
+
+        assert await balance_at(db_session, user.id, before) == 0
+        assert await balance_at(db_session, user.id, datetime.utcnow() + timedelta(minutes=1)) == 7
+
+    async def test_balance_at_by_last_id(self, db_session: AsyncSession):
+        """Последняя запись до момента — по ID, а не по created_at (как граница снимков)."""
+        user = await _new_user(db_session)
+        await post_entry(db_session, user, "purchase", 8, "Покупка")
+        deduction = await post_entry(db_session, user, "deduction", -1, "Запись")
+        # Параллельная транзакция: запись с большим ID получила более ранний created_at
+        deduction.created_at = datetime.utcnow() - timedelta(seconds=30)
+        await db_session.commit()
+
+        assert await balance_at(db_session, user.id, datetime.utcnow() + timedelta(minutes=1)) == 7
@@ -0,0 +1,117 @@
+"""
+Тесты проекции занятий (app.services.lesson_projection).
+
+Проверяет:
+- Снимок направлений и преподавателей переиспользуется между запросами
+- Изменение преподавателя в админке сбрасывает снимок
+- Занятие с преподавателем, которого нет в снимке, перезагружает снимок
+- Занятость и запись текущего пользователя считаются в SQL
+"""
+
+from datetime import date, time
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking
+from app.models.direction import Direction
+from app.models.lesson import Lesson
+from app.models.teacher import Teacher
+from app.models.user import User
+from tests.conftest import _query_count
+
+
+class TestLessonProjection:
+    """Тесты проекции занятий."""
+
+    async def test_snapshot_reused_between_requests(
+        self,
+        client: AsyncClient,
+        test_lesson: Lesson,
+    ):
+        """Повторный запрос расписания — один SQL-запрос, без загрузки каталога."""
+        first = await client.get("/api/lessons")
+        second = await client.get("/api/lessons")
+
+        assert first.json() == second.json()
+        assert _query_count(second) == 1
+        assert _query_count(first) > _query_count(second)
+
+    async def test_admin_update_invalidates_snapshot(
+        self,
+        client: AsyncClient,
+        test_lesson: Lesson,
+        test_teacher: Teacher,
+        admin_headers: dict[str, str],
+    ):
+        """После переименования преподавателя расписание показывает новое имя."""
+        await client.get("/api/lessons")
+
+        response = await client.put(
+            f"/api/admin/teachers/{test_teacher.id}",
+            json={"name": "Анна Петрова"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+
+        lessons = (await client.get("/api/lessons")).json()
+        assert lessons[0]["teacher"]["name"] == "Анна Петрова"
+
+    async def test_unknown_teacher_reloads_snapshot(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_lesson: Lesson,
+        test_direction: Direction,
+    ):
+        """Новый преподаватель появляется в расписании без ожидания TTL."""
+        await client.get("/api/lessons")
+
+        teacher = Teacher(
+            name="Олег Смирнов", slug="oleg-smirnov", bio="Хип-хоп",
+            experience_years=3, is_active=True,
+        )
+        teacher.directions.append(test_direction)
+        db_session.add(teacher)
+        await db_session.flush()
+        db_session.add(Lesson(
+            direction_id=test_direction.id,
+            teacher_id=teacher.id,
+            date=date.today(),
+            start_time=time(21, 0),
+            end_time=time(22, 0),
+            room="Зал 2",
+            max_spots=10,
+            level="all",
+            is_cancelled=False,
+        ))
+        await db_session.commit()
+
+        lessons = (await client.get("/api/lessons")).json()
+        assert lessons[-1]["teacher"]["name"] == "Олег Смирнов"
+        assert lessons[-1]["teacher"]["specializations"] == ["Хип-хоп"]
+
+    async def test_occupancy_and_own_booking(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_lesson: Lesson,
+        test_user: User,
+        test_admin: User,
+        auth_headers: dict[str, str],
+    ):
+        """current_spots считает только активные записи, booking_id — запись пользователя."""
+        own = Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active")
+        db_session.add_all([
+            own,
+            Booking(user_id=test_admin.id, lesson_id=test_lesson.id, status="cancelled"),
+        ])
+        await db_session.commit()
+
+        response = await client.get(f"/api/lessons/{test_lesson.id}", headers=auth_headers)
+
+        data = response.json()
+        assert data["current_spots"] == 1
+        assert data["is_booked"] is True
+        assert data["booking_id"] == own.id
+        assert data["teacher"]["bio"]
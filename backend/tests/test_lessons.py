@@ -38,6 +38,7 @@ class TestGetLessons:
         for lesson in data:
             assert lesson["date"] == today_str
 
+    @pytest.mark.max_queries(5)
     async def test_get_lessons_structure(
         self,
         client: AsyncClient,
@@ -187,6 +188,7 @@ class TestGetLessons:
 class TestGetLessonDetail:
     """Тесты эндпоинта GET /api/lessons/{lesson_id}"""
 
+    @pytest.mark.max_queries(5)
     async def test_lesson_detail_success(
         self,
         client: AsyncClient,
@@ -242,6 +244,7 @@ class TestGetLessonDetail:
 class TestGetTodayLessons:
     """Тесты эндпоинта GET /api/lessons/today"""
 
+    @pytest.mark.max_queries(5)
     async def test_today_lessons(
         self,
         client: AsyncClient,
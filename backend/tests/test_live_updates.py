@@ -0,0 +1,122 @@
+"""
+Тесты живых обновлений заполненности занятий (SSE).
+
+Проверяет:
+- Запись на занятие публикует новую заполненность подписчикам даты
+- Отмена занятия в админке доходит до подписчика набора занятий
+- Отставший клиент получает resync вместо переполнения очереди
+- Формат потока Server-Sent Events
+- Лимит одновременных потоков одного клиента
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from httpx import AsyncClient
+from starlette.requests import Request
+
+from app.api.routes.lessons import stream_lesson_updates
+from app.core.config import settings
+from app.models.lesson import Lesson
+from app.models.user import User
+from app.services.live_updates import QUEUE_SIZE, get_hub
+
+
+def _request(host: str = "203.0.113.7") -> Request:
+    """Анонимный запрос с адреса host."""
+    return Request({"type": "http", "method": "GET", "headers": [], "client": (host, 40000)})
+
+
+class TestLiveUpdates:
+    """Тесты раздачи событий клиентам процесса (без Redis)."""
+
+    async def test_booking_publishes_occupancy(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """Подписчик сегодняшней даты получает current_spots, подписчик другой даты — ничего."""
+        hub = get_hub()
+        async with (
+            hub.subscribe(day=date.today()) as today_queue,
+            hub.subscribe(day=date.today() + timedelta(days=1)) as other_queue,
+        ):
+            response = await client.post(
+                "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+            )
+            assert response.status_code == 201
+
+            event = await asyncio.wait_for(today_queue.get(), 1)
+            assert event["type"] == "lesson"
+            assert event["lesson_id"] == test_lesson.id
+            assert event["current_spots"] == 1
+            assert other_queue.empty()
+
+        assert hub.subscriber_count == 0
+
+    async def test_admin_cancel_publishes_to_lesson_subscribers(
+        self,
+        client: AsyncClient,
+        test_admin: User,
+        test_lesson: Lesson,
+        admin_headers: dict[str, str],
+    ):
+        """Отмена занятия доходит до подписчика по ID занятия."""
+        async with get_hub().subscribe(lesson_ids=[test_lesson.id]) as queue:
+            response = await client.delete(
+                f"/api/admin/lessons/{test_lesson.id}", headers=admin_headers
+            )
+            assert response.status_code == 200
+
+            event = await asyncio.wait_for(queue.get(), 1)
+            assert event["is_cancelled"] is True
+
+    async def test_slow_client_gets_resync(self):
+        """Переполненная очередь заменяется одним событием resync."""
+        hub = get_hub()
+        today = date.today().isoformat()
+        async with hub.subscribe(day=date.today()) as queue:
+            for lesson_id in range(QUEUE_SIZE + 1):
+                hub.dispatch({"type": "lesson", "lesson_id": lesson_id, "date": today})
+
+            assert queue.qsize() == 1
+            assert queue.get_nowait() == {"type": "resync"}
+
+    async def test_event_stream_format(self):
+        """Поток начинается с retry, события идут в формате SSE."""
+        response = await stream_lesson_updates(_request(), date_filter=date.today(), lesson_ids=[])
+        assert response.media_type == "text/event-stream"
+
+        chunks = response.body_iterator
+        assert await anext(chunks) == "retry: 5000\n\n"
+
+        next_chunk = asyncio.ensure_future(anext(chunks))
+        await asyncio.sleep(0)
+        get_hub().dispatch({"type": "resync"})
+        assert await asyncio.wait_for(next_chunk, 1) == 'event: resync\ndata: {"type": "resync"}\n\n'
+        await chunks.aclose()
+
+    async def test_streams_per_client_limited(self):
+        """Сверх LIVE_STREAMS_PER_CLIENT потоков с одного IP — 429; другие клиенты не затронуты."""
+        responses = [
+            await stream_lesson_updates(_request(), date_filter=date.today(), lesson_ids=[])
+            for _ in range(settings.LIVE_STREAMS_PER_CLIENT)
+        ]
+
+        with pytest.raises(HTTPException) as exc_info:
+            await stream_lesson_updates(_request(), date_filter=date.today(), lesson_ids=[])
+        assert exc_info.value.status_code == 429
+
+        other = await stream_lesson_updates(
+            _request("198.51.100.1"), date_filter=date.today(), lesson_ids=[]
+        )
+        assert get_hub().subscriber_count == settings.LIVE_STREAMS_PER_CLIENT + 1
+
+        # Закрытие потока освобождает место
+        for response in [*responses, other]:
+            await response.background()
+        assert get_hub().subscriber_count == 0
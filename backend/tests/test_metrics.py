@@ -0,0 +1,91 @@
+"""
+Тесты метрик Prometheus.
+
+Проверяет:
+- Эндпоинт /api/metrics и метки по шаблону маршрута
+- Счётчик записей на занятия
+- Проверку токена доступа к метрикам (без токена эндпоинт закрыт)
+- Метрики пула отдельно для основной БД и реплики
+"""
+
+import pytest
+from httpx import AsyncClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.metrics import observe_pool
+from app.models.lesson import Lesson
+from app.models.user import User
+
+METRICS_HEADERS = {"Authorization": "Bearer scrape-secret"}
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture(autouse=True)
+def metrics_token(monkeypatch):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+
+
+class TestMetrics:
+    """Тесты GET /api/metrics."""
+
+    async def test_route_template_label(self, client: AsyncClient, test_lesson: Lesson):
+        """Длительность запроса учитывается по шаблону маршрута, а не по пути."""
+        await client.get(f"/api/lessons/{test_lesson.id}")
+
+        response = await client.get("/api/metrics", headers=METRICS_HEADERS)
+
+        assert response.status_code == 200
+        assert 'route="/api/lessons/{lesson_id}"' in response.text
+        assert f'route="/api/lessons/{test_lesson.id}"' not in response.text
+
+    async def test_booking_counter(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict,
+    ):
+        """Успешная запись увеличивает dancemax_bookings_total{action="created"}."""
+        before = sample("dancemax_bookings_total", action="created")
+
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert sample("dancemax_bookings_total", action="created") == before + 1
+
+    async def test_token_required(self, client: AsyncClient):
+        """Без токена или с неверным токеном — 403."""
+        assert (await client.get("/api/metrics")).status_code == 403
+        response = await client.get(
+            "/api/metrics", headers={"Authorization": "Bearer wrong"}
+        )
+        assert response.status_code == 403
+
+    async def test_disabled_without_token(self, client: AsyncClient, monkeypatch):
+        """Без настроенного METRICS_TOKEN эндпоинт закрыт."""
+        monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+
+        assert (await client.get("/api/metrics")).status_code == 404
+
+    async def test_pool_label(self):
+        """Пул реплики учитывается с меткой pool="replica", не смешиваясь с основной БД."""
+        replica = create_async_engine("sqlite+aiosqlite://", poolclass=AsyncAdaptedQueuePool)
+        observe_pool(replica, "replica")
+        primary_before = sample("dancemax_db_pool_checked_out", pool="primary")
+
+        async with replica.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+            assert sample("dancemax_db_pool_checked_out", pool="replica") == 1
+        await replica.dispose()
+
+        assert sample("dancemax_db_pool_checked_out", pool="replica") == 0
+        assert sample("dancemax_db_pool_checked_out", pool="primary") == primary_before
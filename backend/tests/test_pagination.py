@@ -0,0 +1,159 @@
+"""
+Тесты курсорной пагинации (X-Next-Cursor).
+
+Проверяет:
+- Обход истории транзакций курсором без дублей и пропусков
+- Новые записи между страницами не сдвигают следующую страницу
+- Offset продолжает работать
+- Ошибки некорректного курсора и cursor вместе с offset
+- Постраничные записи пользователя и список учеников в админке
+"""
+
+from datetime import datetime, timedelta
+
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.lesson import Lesson
+from app.models.transaction import Transaction
+from app.models.user import User
+
+
+async def _add_transactions(db: AsyncSession, user: User, count: int) -> list[int]:
+    """Транзакции пользователя; у пар — одинаковое created_at (порядок решает id)."""
+    base = datetime(2026, 1, 1, 12, 0)
+    transactions = [
+        Transaction(
+            user_id=user.id,
+            type="manual",
+            amount=1,
+            balance_after=index + 1,
+            description=f"Корректировка {index}",
+            created_at=base + timedelta(minutes=index // 2),
+        )
+        for index in range(count)
+    ]
+    db.add_all(transactions)
+    await db.commit()
+    # От новых к старым: по created_at, при равенстве — по id
+    ordered = sorted(transactions, key=lambda t: (t.created_at, t.id), reverse=True)
+    return [t.id for t in ordered]
+
+
+async def _walk(client: AsyncClient, url: str, headers: dict[str, str]) -> list[list[int]]:
+    """ID по страницам, пока есть X-Next-Cursor."""
+    pages = []
+    cursor = None
+    while True:
+        params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+        response = await client.get(url, params=params, headers=headers)
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return pages
+
+
+class TestKeysetPagination:
+    """Тесты курсоров истории, записей и учеников."""
+
+    async def test_history_cursor_walk(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        auth_headers: dict[str, str],
+    ):
+        """Курсор проходит все транзакции по порядку; offset даёт те же страницы."""
+        expected = await _add_transactions(db_session, test_user, 5)
+
+        pages = await _walk(client, "/api/users/history", auth_headers)
+        assert pages == [expected[0:2], expected[2:4], expected[4:5]]
+
+        response = await client.get(
+            "/api/users/history", params={"limit": 2, "offset": 2}, headers=auth_headers
+        )
+        assert [t["id"] for t in response.json()] == expected[2:4]
+
+    async def test_insert_between_pages(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        auth_headers: dict[str, str],
+    ):
+        """Новая транзакция после первой страницы не сдвигает вторую."""
+        expected = await _add_transactions(db_session, test_user, 4)
+
+        response = await client.get("/api/users/history", params={"limit": 2}, headers=auth_headers)
+        cursor = response.headers["X-Next-Cursor"]
+
+        db_session.add(Transaction(user_id=test_user.id, type="manual", amount=1, balance_after=5, description="Новая"))
+        await db_session.commit()
+
+        response = await client.get(
+            "/api/users/history", params={"limit": 2, "cursor": cursor}, headers=auth_headers
+        )
+        assert [t["id"] for t in response.json()] == expected[2:4]
+        assert "X-Next-Cursor" not in response.headers
+
+    async def test_invalid_cursor(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        auth_headers: dict[str, str],
+    ):
+        """Мусорный курсор и cursor вместе с offset — 400."""
+        response = await client.get(
+            "/api/users/history", params={"cursor": "не-курсор"}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/api/users/history", params={"cursor": "abc", "offset": 5}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    async def test_my_bookings_pages(
+        self,
+        client: AsyncClient,
+        test_user: User,
+        test_lesson: Lesson,
+        test_lesson_tomorrow: Lesson,
+        auth_headers: dict[str, str],
+    ):
+        """Без limit — все записи; с limit — страницы по курсору."""
+        for lesson in (test_lesson, test_lesson_tomorrow):
+            await client.post("/api/bookings", json={"lesson_id": lesson.id}, headers=auth_headers)
+
+        everything = (await client.get("/api/bookings/my", headers=auth_headers)).json()
+        assert len(everything) == 2
+
+        first = await client.get("/api/bookings/my", params={"limit": 1}, headers=auth_headers)
+        second = await client.get(
+            "/api/bookings/my",
+            params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]},
+            headers=auth_headers,
+        )
+        assert [b["id"] for b in first.json() + second.json()] == [b["id"] for b in everything]
+        assert "X-Next-Cursor" not in second.headers
+
+    async def test_students_cursor_walk(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_admin: User,
+        admin_headers: dict[str, str],
+    ):
+        """Список учеников проходится курсором без дублей."""
+        created_at = datetime(2026, 1, 1)
+        db_session.add_all(
+            User(telegram_id=700_000 + index, first_name="Ученик", created_at=created_at)
+            for index in range(5)
+        )
+        await db_session.commit()
+
+        pages = await _walk(client, "/api/admin/students", admin_headers)
+        ids = [student_id for page in pages for student_id in page]
+        assert [len(page) for page in pages] == [2, 2, 1]
+        assert ids == sorted(ids, reverse=True)
@@ -5,18 +5,20 @@
 - Получение списка тарифных планов
 - Покупка абонемента (начисление занятий на баланс)
 - Покупка с промокодом (применение скидки)
-- Валидация промокода (корректный, истёкший, исчерпанный, несуществующий)
+- Валидация промокода (корректный, истёкший, исчерпанный, несуществующий, одноразовый)
 """
 
 from datetime import date, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.promotion import Promotion
+from app.models.promotion import PromoCode, Promotion
 from app.models.subscription import SubscriptionPlan
 from app.models.user import User
+from app.services.promo_codes import create_code_batch, redeem_batch_code
 
 
 class TestGetPlans:
@@ -298,3 +300,39 @@ class TestValidatePromoCode:
         data = response.json()
         assert data["valid"] is False
         assert "исчерпан" in data["message"]
+
+    async def test_validate_batch_code(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_user: User,
+        test_promo: Promotion,
+        test_plan: SubscriptionPlan,
+    ):
+        """Одноразовый код из партии валиден до погашения (ввод без учёта регистра и дефисов)."""
+        batch = await create_code_batch(db_session, test_promo, 3, "VIP")
+        await db_session.commit()
+        code = (await db_session.execute(
+            select(PromoCode.code).where(PromoCode.batch_id == batch.id).limit(1)
+        )).scalar_one()
+
+        typed = f"{code[:5].lower()}-{code[5:]}"
+        response = await client.post(
+            "/api/promos/validate",
+            json={"code": typed, "plan_id": test_plan.id},
+        )
+        assert response.json()["valid"] is True
+        assert response.json()["discount_percent"] == 20
+
+        # Гасим код — повторная валидация должна отказать
+        assert await redeem_batch_code(db_session, typed, user_id=test_user.id) is not None
+        await db_session.commit()
+        assert await redeem_batch_code(db_session, code, user_id=test_user.id) is None
+
+        response = await client.post(
+            "/api/promos/validate",
+            json={"code": code, "plan_id": test_plan.id},
+        )
+        data = response.json()
+        assert data["valid"] is False
+        assert "использован" in data["message"]
@@ -0,0 +1,110 @@
+"""
+Тесты расписания периодических задач.
+
+Проверяет:
+- Разбор crontab-выражений
+- Применение переопределений из БД к расписанию по умолчанию
+- Слоты распределённой блокировки
+"""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+import celery_app.tasks.maintenance  # noqa: F401  (регистрирует задачи под periodic_singleton)
+from celery_app.locks import SCHEDULED_AT_HEADER, _stamp_scheduled_at, acquire_slot_lock, slot_key
+from celery_app.schedule import (
+    DEFAULT_SCHEDULE,
+    build_beat_schedule,
+    min_interval_seconds,
+    parse_crontab,
+    task_slot_seconds,
+)
+
+
+class TestSchedule:
+    """Тесты parse_crontab и build_beat_schedule."""
+
+    def test_parse_crontab(self):
+        """Поля разбираются в стандартном порядке cron."""
+        schedule = parse_crontab("15 10 * * 1")
+
+        assert schedule.minute == {15}
+        assert schedule.hour == {10}
+        assert schedule.day_of_week == {1}
+
+    def test_parse_crontab_invalid(self):
+        """Неверное число полей или значение — ValueError."""
+        with pytest.raises(ValueError):
+            parse_crontab("*/30 * *")
+        with pytest.raises(ValueError):
+            parse_crontab("99 * * * *")
+
+    def test_overrides_applied(self):
+        """Переопределение меняет параметры, отключённая задача исключается."""
+        overrides = [
+            SimpleNamespace(
+                name="check-lesson-reminders",
+                crontab="*/15 * * * *",
+                kwargs={"window_minutes": 90},
+                enabled=True,
+            ),
+            SimpleNamespace(
+                name="check-expiring-subscriptions",
+                crontab="0 10 * * *",
+                kwargs={},
+                enabled=False,
+            ),
+        ]
+
+        schedule = build_beat_schedule(overrides)
+
+        assert schedule["check-lesson-reminders"]["kwargs"] == {"window_minutes": 90}
+        assert schedule["check-lesson-reminders"]["schedule"].minute == {0, 15, 30, 45}
+        assert "check-expiring-subscriptions" not in schedule
+        assert set(schedule) == set(DEFAULT_SCHEDULE) - {"check-expiring-subscriptions"}
+
+    def test_min_interval(self):
+        """Наименьший интервал между запусками, включая переход через полночь."""
+        assert min_interval_seconds(parse_crontab("*/2 * * * *")) == 120
+        assert min_interval_seconds(parse_crontab("0 4 * * *")) == 24 * 3600
+        assert min_interval_seconds(parse_crontab("0 0,23 * * *")) == 3600
+
+    def test_defaults_not_shorter_than_slot(self):
+        """Расписание по умолчанию не пропускает запуски из-за слота блокировки."""
+        for name, entry in DEFAULT_SCHEDULE.items():
+            slot_seconds = task_slot_seconds(entry["task"])
+            if slot_seconds is not None:
+                assert min_interval_seconds(parse_crontab(entry["crontab"])) >= slot_seconds, name
+
+
+class TestSlotLock:
+    """Тесты ключей и захвата блокировки."""
+
+    def test_slot_follows_scheduled_time(self):
+        """Копии запуска на границе слота (отправлены в одну минуту) получают один ключ."""
+        boundary = 1_800_000_000 // 3600 * 3600
+        name = "celery_app.tasks.maintenance.reconcile_ledger"
+        stamped = []
+        for sent_at in (boundary + 0.1, boundary + 40.9):
+            headers: dict = {}
+            with patch("celery_app.locks.time.time", return_value=sent_at):
+                _stamp_scheduled_at(sender=name, headers=headers)
+            stamped.append(headers[SCHEDULED_AT_HEADER])
+
+        assert stamped == [boundary, boundary]
+        assert slot_key(name, 3600, stamped[0]) == slot_key(name, 3600, boundary + 1800)
+        assert slot_key(name, 3600, boundary) != slot_key(name, 3600, boundary - 60)
+
+    def test_only_singleton_tasks_are_stamped(self):
+        """Обычным задачам заголовок scheduled_at не добавляется."""
+        headers: dict = {}
+        _stamp_scheduled_at(sender="celery_app.tasks.notifications.send_message", headers=headers)
+
+        assert SCHEDULED_AT_HEADER not in headers
+
+    async def test_without_redis_lock_is_granted(self):
+        """Без Redis задача выполняется (защита — таблица дедупликации)."""
+        assert await acquire_slot_lock("task", 300, time.time()) is True
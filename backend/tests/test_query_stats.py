@@ -0,0 +1,90 @@
+"""
+Тесты учёта SQL-запросов.
+
+Проверяет:
+- Заголовок Server-Timing с числом запросов и временем в БД
+- Поиск повторяющихся SQL (признак N+1)
+- Отмена занятия не выполняет SELECT пользователя на каждую запись
+"""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services import event_consumers
+from app.core.query_stats import QueryStats
+from app.models.booking import Booking
+from app.models.lesson import Lesson
+from app.models.user import User
+from tests.conftest import _query_count
+
+
+class TestQueryStats:
+    """Тесты QueryStats и middleware."""
+
+    async def test_server_timing_header(self, client: AsyncClient, test_lesson: Lesson):
+        """Ответ содержит Server-Timing с числом SQL-запросов."""
+        response = await client.get("/api/lessons")
+
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert _query_count(response) > 0
+
+    def test_repeated_statements(self):
+        """Повторяющийся SQL попадает в кандидаты N+1."""
+        stats = QueryStats()
+        stats.statements.update(["SELECT users"] * 3 + ["SELECT lessons"] + ["UPDATE users"] * 3)
+
+        assert stats.repeated() == {"SELECT users": 3}
+
+    @pytest.mark.max_queries(6)
+    async def test_lessons_budget(
+        self, client: AsyncClient, test_lesson: Lesson, auth_headers: dict
+    ):
+        """Расписание с авторизацией укладывается в бюджет запросов."""
+        response = await client.get("/api/lessons", headers=auth_headers)
+
+        assert response.status_code == 200
+
+
+class TestCancelLessonQueries:
+    """Отмена занятия без N+1 по пользователям."""
+
+    async def _cancel_with_bookings(
+        self,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        lesson: Lesson,
+        admin_headers: dict,
+        bookings: int,
+    ) -> None:
+        for index in range(bookings):
+            user = User(telegram_id=500_000 + lesson.id * 100 + index, first_name="Ученик", balance=0)
+            db_session.add(user)
+            await db_session.flush()
+            db_session.add(Booking(user_id=user.id, lesson_id=lesson.id, status="active"))
+        await db_session.commit()
+
+        response = await client.delete(f"/api/admin/lessons/{lesson.id}", headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json()["refunded_bookings"] == bookings
+
+    async def test_no_repeated_selects(
+        self,
+        monkeypatch,
+        caplog,
+        client: AsyncClient,
+        db_session: AsyncSession,
+        test_admin: User,
+        test_lesson: Lesson,
+        admin_headers: dict,
+    ):
+        """Пользователи записей загружаются одним запросом, а не по одному."""
+        async def fake_notify(**kwargs):
+            return True
+
+        monkeypatch.setattr(event_consumers, "notify_lesson_cancelled", fake_notify)
+
+        await self._cancel_with_bookings(client, db_session, test_lesson, admin_headers, 5)
+
+        assert "Возможный N+1" not in caplog.text
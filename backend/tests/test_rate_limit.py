@@ -0,0 +1,93 @@
+"""
+Тесты лимита частоты запросов к API.
+
+Проверяет:
+- Разбор лимитов и алгоритм скользящего окна
+- 429 с Retry-After при превышении общего лимита
+- Раздельные счётчики для авторизованного пользователя и IP
+- Вес дорогих маршрутов и исключённые маршруты
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.rate_limit import LocalSlidingWindow, RateLimit, limiter
+from app.models.lesson import Lesson
+from app.models.user import User
+
+
+@pytest.fixture
+def small_default(monkeypatch):
+    """Общий лимит 6 единиц в минуту."""
+    monkeypatch.setattr(limiter, "default", RateLimit(6, 60))
+
+
+class TestSlidingWindow:
+    """Тесты RateLimit и LocalSlidingWindow."""
+
+    def test_parse(self):
+        assert RateLimit.parse("100/minute") == RateLimit(100, 60)
+        assert RateLimit.parse("10/hours") == RateLimit(10, 3600)
+        with pytest.raises(ValueError):
+            RateLimit.parse("10/fortnight")
+
+    def test_previous_window_weighted(self):
+        """Вклад предыдущего окна убывает по мере прохождения текущего."""
+        window = LocalSlidingWindow()
+        limit = RateLimit(10, 60)
+        checks = [("user", limit, 10)]
+
+        assert window.hit(checks, now=59.0) == 0
+        # Начало следующего окна: предыдущие 10 ещё почти полностью учитываются
+        assert window.hit([("user", limit, 1)], now=61.0) > 0
+        # Середина окна: учитывается половина — 5 + 5 <= 10
+        assert window.hit([("user", limit, 5)], now=90.0) == 0
+
+
+class TestEnforceRateLimit:
+    """Тесты зависимости enforce_rate_limit."""
+
+    async def test_429_after_limit(self, client: AsyncClient, small_default):
+        """Седьмой запрос за минуту — 429 с Retry-After."""
+        for _ in range(6):
+            assert (await client.get("/api/directions")).status_code == 200
+
+        response = await client.get("/api/directions")
+
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    async def test_user_keyed_separately_from_ip(
+        self, client: AsyncClient, small_default, test_user: User, auth_headers: dict
+    ):
+        """Исчерпанный лимит IP не мешает авторизованному пользователю."""
+        for _ in range(6):
+            await client.get("/api/directions")
+
+        response = await client.get("/api/directions", headers=auth_headers)
+
+        assert response.status_code == 200
+
+    async def test_booking_costs_more(
+        self,
+        client: AsyncClient,
+        small_default,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict,
+    ):
+        """Запись на занятие расходует 5 единиц: после неё осталась одна."""
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+        )
+        assert response.status_code == 201
+
+        assert (await client.get("/api/directions", headers=auth_headers)).status_code == 200
+        assert (await client.get("/api/directions", headers=auth_headers)).status_code == 429
+
+    async def test_exempt_route(self, client: AsyncClient, small_default):
+        """Health-check не ограничивается и не расходует лимит."""
+        for _ in range(10):
+            assert (await client.get("/api/health")).status_code == 200
+
+        assert (await client.get("/api/directions")).status_code == 200
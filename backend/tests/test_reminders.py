@@ -0,0 +1,201 @@
+"""
+Тесты периодических напоминаний.
+
+Проверяет:
+- Оконный отбор занятий с активными записями
+- Дедупликацию через reminders_sent (повторный запуск ничего не отправляет)
+- Исключение отменённых занятий и записей
+- Исключение пользователей, недоступных в Telegram
+- Занятие после полуночи — "завтра", отправка в транзакционной полосе
+- Группировку истекающих абонементов по пользователю
+"""
+
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.booking import Booking
+from app.models.lesson import Lesson
+from app.models.subscription import Subscription, SubscriptionPlan
+from app.models.user import User
+from app.services import reminders
+from app.services.telegram_sender import Priority
+
+
+@pytest.fixture
+def sent_messages(monkeypatch) -> list:
+    """Подменяет отправщик: сообщения складываются в список вместо Telegram."""
+    sent: list = []
+
+    async def fake_send(messages, priority=None):
+        sent.extend(messages)
+        return len(messages)
+
+    monkeypatch.setattr(reminders, "send_many", fake_send)
+    return sent
+
+
+class TestLessonReminders:
+    """Тесты dispatch_lesson_reminders."""
+
+    async def test_reminder_sent_once(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+        sent_messages: list,
+    ):
+        """Напоминание уходит один раз, повторный запуск дедуплицируется."""
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        await db_session.commit()
+
+        # Занятие в 18:00, окно 16:30–18:30
+        now = datetime.combine(test_lesson.date, test_lesson.start_time) - timedelta(minutes=90)
+
+        assert await reminders.dispatch_lesson_reminders(db_session, now=now) == 1
+        assert sent_messages[0][0] == test_user.telegram_id
+        assert "18:00" in sent_messages[0][1]
+
+        assert await reminders.dispatch_lesson_reminders(db_session, now=now) == 0
+        assert len(sent_messages) == 1
+
+    async def test_unreachable_user_skipped(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+        sent_messages: list,
+    ):
+        """Пользователь, заблокировавший бота, не получает напоминаний."""
+        test_user.telegram_reachable = False
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        await db_session.commit()
+
+        now = datetime.combine(test_lesson.date, test_lesson.start_time) - timedelta(minutes=30)
+
+        assert await reminders.dispatch_lesson_reminders(db_session, now=now) == 0
+        assert sent_messages == []
+
+    async def test_lesson_outside_window_skipped(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+        sent_messages: list,
+    ):
+        """Занятие за пределами окна не попадает в рассылку."""
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        await db_session.commit()
+
+        now = datetime.combine(test_lesson.date, test_lesson.start_time) - timedelta(hours=3)
+
+        assert await reminders.dispatch_lesson_reminders(db_session, now=now) == 0
+        assert sent_messages == []
+
+    async def test_cancelled_booking_skipped(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+        sent_messages: list,
+    ):
+        """Отменённые записи не получают напоминаний."""
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="cancelled"))
+        await db_session.commit()
+
+        now = datetime.combine(test_lesson.date, test_lesson.start_time) - timedelta(minutes=30)
+
+        assert await reminders.dispatch_lesson_reminders(db_session, now=now) == 0
+        assert sent_messages == []
+
+    async def test_after_midnight_lesson_is_tomorrow(
+        self,
+        monkeypatch,
+        db_session: AsyncSession,
+        test_user: User,
+        test_lesson: Lesson,
+    ):
+        """Окно через полночь: занятие в 00:30 — "завтра"; полоса транзакционная."""
+        calls = []
+
+        async def fake_send(messages, priority=None):
+            calls.append((messages, priority))
+            return len(messages)
+
+        monkeypatch.setattr(reminders, "send_many", fake_send)
+
+        test_lesson.date = date.today() + timedelta(days=1)
+        test_lesson.start_time = time(0, 30)
+        db_session.add(Booking(user_id=test_user.id, lesson_id=test_lesson.id, status="active"))
+        await db_session.commit()
+
+        now = datetime.combine(date.today(), time(23, 0))
+
+        assert await reminders.dispatch_lesson_reminders(db_session, now=now) == 1
+        [(messages, priority)] = calls
+        assert "завтра в 00:30" in messages[0][1]
+        assert priority == Priority.TRANSACTIONAL
+
+
+class TestExpiringSubscriptions:
+    """Тесты collect_expiring_subscriptions."""
+
+    async def test_grouped_by_user_and_deduplicated(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_plan: SubscriptionPlan,
+    ):
+        """Два истекающих абонемента — одна строка; повтор в тот же день пуст."""
+        today = date(2026, 10, 19)
+        for days, lessons in ((1, 2), (3, 5)):
+            db_session.add(Subscription(
+                user_id=test_user.id,
+                plan_id=test_plan.id,
+                lessons_remaining=lessons,
+                starts_at=today - timedelta(days=30),
+                expires_at=today + timedelta(days=days),
+                is_active=True,
+            ))
+        await db_session.commit()
+
+        rows = await reminders.collect_expiring_subscriptions(db_session, today)
+        await db_session.commit()
+
+        assert len(rows) == 1
+        assert rows[0].telegram_id == test_user.telegram_id
+        assert rows[0].lessons_left == 7
+        assert rows[0].expires_at == today + timedelta(days=1)
+
+        assert await reminders.collect_expiring_subscriptions(db_session, today) == []
+
+    async def test_used_up_and_other_dates_skipped(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_plan: SubscriptionPlan,
+    ):
+        """Абонементы без занятий и с другой датой окончания не учитываются."""
+        today = date(2026, 10, 19)
+        db_session.add_all([
+            Subscription(
+                user_id=test_user.id,
+                plan_id=test_plan.id,
+                lessons_remaining=0,
+                starts_at=today,
+                expires_at=today + timedelta(days=1),
+                is_active=True,
+            ),
+            Subscription(
+                user_id=test_user.id,
+                plan_id=test_plan.id,
+                lessons_remaining=4,
+                starts_at=today,
+                expires_at=today + timedelta(days=2),
+                is_active=True,
+            ),
+        ])
+        await db_session.commit()
+
+        assert await reminders.collect_expiring_subscriptions(db_session, today) == []
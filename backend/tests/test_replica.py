@@ -0,0 +1,89 @@
+"""
+Тесты маршрутизации чтения на реплику.
+
+Проверяет:
+- Публичные GET-эндпоинты читают с реплики
+- После успешной записи пользователь читает из основной БД
+- Закрепление за основной БД истекает
+"""
+
+import pytest
+from httpx import AsyncClient
+
+from app import database
+from app.core import replica
+from app.core.config import settings
+from app.models.lesson import Lesson
+from app.models.user import User
+from tests.conftest import async_session_test
+
+
+@pytest.fixture
+def replica_calls(monkeypatch) -> list:
+    """Подключает «реплику» (та же тестовая БД) и считает открытые на ней сессии."""
+    calls: list = []
+
+    def replica_session():
+        calls.append(1)
+        return async_session_test()
+
+    monkeypatch.setattr(settings, "DATABASE_REPLICA_URL", "postgresql+asyncpg://replica/dancemax")
+    monkeypatch.setattr(database, "replica_session", replica_session)
+    monkeypatch.setattr(replica, "_local_pins", {})
+    return calls
+
+
+class TestReadRouting:
+    """Тесты get_read_db и закрепления за основной БД."""
+
+    async def test_public_reads_use_replica(
+        self, client: AsyncClient, replica_calls: list, test_lesson: Lesson
+    ):
+        """Анонимный GET расписания обслуживается репликой."""
+        response = await client.get("/api/lessons")
+
+        assert response.status_code == 200
+        assert len(response.json()) == 1
+        assert replica_calls == [1]
+
+    async def test_writer_pinned_to_primary(
+        self,
+        client: AsyncClient,
+        replica_calls: list,
+        test_user: User,
+        test_lesson: Lesson,
+        auth_headers: dict,
+    ):
+        """После записи на занятие пользователь читает из основной БД."""
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": test_lesson.id}, headers=auth_headers
+        )
+        assert response.status_code == 201
+
+        response = await client.get("/api/lessons", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()[0]["is_booked"] is True
+        assert replica_calls == []
+
+    async def test_failed_write_does_not_pin(
+        self, client: AsyncClient, replica_calls: list, test_user: User, auth_headers: dict
+    ):
+        """Неуспешный запрос не закрепляет пользователя."""
+        response = await client.post(
+            "/api/bookings", json={"lesson_id": 99999}, headers=auth_headers
+        )
+        assert response.status_code == 404
+
+        await client.get("/api/lessons", headers=auth_headers)
+
+        assert replica_calls == [1]
+
+    async def test_pin_expires(self, monkeypatch):
+        """Закрепление действует REPLICA_PIN_SECONDS."""
+        monkeypatch.setattr(replica, "_local_pins", {})
+        monkeypatch.setattr(settings, "REPLICA_PIN_SECONDS", 0)
+
+        await replica.pin_to_primary("123")
+
+        assert await replica.is_pinned("123") is False
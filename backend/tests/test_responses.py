@@ -0,0 +1,102 @@
+"""
+Тесты быстрой сериализации ответов (app.core.responses).
+
+Проверяет:
+- dict с вложенными ORM-объектами сериализуется так же, как собранные вручную модели
+- Ответ по-прежнему проверяется схемой
+- Страницы направления и преподавателя отдают занятия в формате LessonResponse
+"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+from pydantic import ValidationError
+
+from app.core.responses import dump_json
+from app.models.lesson import Lesson
+from app.schemas.direction import DirectionListResponse
+from app.schemas.lesson import LessonResponse
+from app.schemas.teacher import TeacherListResponse
+
+
+def _lesson_fields() -> dict:
+    return {
+        "id": 1,
+        "date": "2026-10-19",
+        "start_time": "19:00",
+        "end_time": "20:00",
+        "room": "Зал 1",
+        "max_spots": 10,
+        "current_spots": 3,
+        "level": "all",
+        "is_cancelled": False,
+        "cancel_reason": None,
+    }
+
+
+class TestDumpJson:
+    """Тесты dump_json / model_response."""
+
+    def test_matches_manually_built_models(self):
+        """Dict с ORM-подобным направлением даёт тот же JSON, что и модели."""
+        direction = SimpleNamespace(
+            id=1, name="Бачата", slug="bachata",
+            short_description="Парный танец", color="#E91E63", icon="heart",
+        )
+        teacher = {
+            "id": 2, "name": "Анна", "slug": "anna", "photo_url": None,
+            "experience_years": 5, "specializations": ["Бачата"],
+        }
+
+        fast = dump_json(
+            list[LessonResponse],
+            [{**_lesson_fields(), "direction": direction, "teacher": teacher}],
+        )
+        models = [
+            LessonResponse(
+                **_lesson_fields(),
+                direction=DirectionListResponse.model_validate(direction),
+                teacher=TeacherListResponse(**teacher),
+            )
+        ]
+
+        assert json.loads(fast) == [m.model_dump() for m in models]
+
+    def test_invalid_payload_rejected(self):
+        """Ответ валидируется один раз, но валидируется."""
+        with pytest.raises(ValidationError):
+            dump_json(list[LessonResponse], [{"id": "не число"}])
+
+
+class TestDetailPages:
+    """Страницы направления и преподавателя."""
+
+    async def test_direction_detail(
+        self,
+        client: AsyncClient,
+        test_lesson_tomorrow: Lesson,
+    ):
+        """GET /api/directions/{slug} — описание и ближайшие занятия."""
+        response = await client.get("/api/directions/hip-hop")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["direction"]["description"]
+        assert data["upcoming_lessons"][0]["id"] == test_lesson_tomorrow.id
+        assert data["upcoming_lessons"][0]["teacher"]["specializations"] == ["Хип-хоп"]
+
+    async def test_teacher_detail(
+        self,
+        client: AsyncClient,
+        test_lesson_tomorrow: Lesson,
+    ):
+        """GET /api/teachers/{slug} — профиль с направлениями и расписание."""
+        response = await client.get("/api/teachers/anna-ivanova")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["teacher"]["bio"]
+        assert [d["slug"] for d in data["teacher"]["directions"]] == ["hip-hop"]
+        assert data["schedule"][0]["id"] == test_lesson_tomorrow.id
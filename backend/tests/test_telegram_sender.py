@@ -0,0 +1,80 @@
+"""
+Тесты общего отправщика Telegram.
+
+Проверяет:
+- Глобальный и поканальный лимиты локального лимитера
+- Резерв токенов за транзакционными сообщениями
+- Обработку ошибок доставки и отметку недоступных пользователей
+"""
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import SendMessage
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.bot import bot
+from app.models.user import User
+from app.services import telegram_reachability, telegram_sender
+from app.services.telegram_sender import LocalRateLimiter, Priority
+
+
+class TestLocalRateLimiter:
+    """Тесты LocalRateLimiter (без Redis)."""
+
+    def test_per_chat_interval(self):
+        """Второе сообщение в тот же чат ждёт интервал, в другой — нет."""
+        limiter = LocalRateLimiter(rate=30, chat_interval=1.0)
+
+        assert limiter.try_acquire(1, Priority.TRANSACTIONAL, now=100.0) == 0
+        assert limiter.try_acquire(1, Priority.TRANSACTIONAL, now=100.2) == pytest.approx(0.8)
+        assert limiter.try_acquire(2, Priority.TRANSACTIONAL, now=100.2) == 0
+
+    def test_marketing_leaves_reserve_for_transactional(self):
+        """Массовые сообщения не выбирают резерв, транзакционные — проходят."""
+        limiter = LocalRateLimiter(rate=30, chat_interval=1.0)
+        granted = sum(
+            limiter.try_acquire(chat_id, Priority.MARKETING, now=100.0) == 0
+            for chat_id in range(100)
+        )
+
+        assert granted == 30 - 5
+        assert limiter.try_acquire(1000, Priority.MARKETING, now=100.0) > 0
+        assert limiter.try_acquire(1000, Priority.TRANSACTIONAL, now=100.0) == 0
+
+    def test_pause_blocks_all_chats(self):
+        """После 429 отправка приостановлена для всех чатов."""
+        limiter = LocalRateLimiter(rate=30, chat_interval=1.0)
+        limiter.pause(5)
+
+        assert limiter.try_acquire(1, Priority.TRANSACTIONAL) > 4
+
+
+class TestSendMessage:
+    """Тесты send_message."""
+
+    async def test_blocked_user_marked_unreachable(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        monkeypatch,
+    ):
+        """Бот заблокирован — False без исключения, пользователь помечен недоступным."""
+
+        async def fake_send_message(**kwargs):
+            raise TelegramForbiddenError(
+                method=SendMessage(chat_id=kwargs["chat_id"], text=kwargs["text"]),
+                message="Forbidden: bot was blocked by the user",
+            )
+
+        monkeypatch.setattr(bot, "send_message", fake_send_message)
+        monkeypatch.setattr(
+            telegram_reachability,
+            "get_session_factory",
+            lambda: async_sessionmaker(db_session.bind, expire_on_commit=False),
+        )
+
+        assert await telegram_sender.send_message(test_user.telegram_id, "Привет") is False
+
+        await db_session.refresh(test_user)
+        assert test_user.telegram_reachable is False
+        assert test_user.telegram_unreachable_at is not None
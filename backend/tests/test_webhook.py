@@ -0,0 +1,82 @@
+"""
+Тесты приёма Telegram webhook.
+
+Проверяет:
+- Проверку секретного токена
+- Дедупликацию повторной доставки update_id
+- Отклонение Update при переполненной очереди
+"""
+
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.services.webhook_ingestion import UpdateIngestion, ingestion
+
+
+def make_update(update_id: int) -> dict:
+    """Минимальный Update с текстовым сообщением."""
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": 1,
+            "date": 0,
+            "chat": {"id": 1, "type": "private"},
+            "text": "привет",
+        },
+    }
+
+
+class TestTelegramWebhook:
+    """Тесты эндпоинта POST /api/bot/webhook"""
+
+    async def test_invalid_secret_rejected(
+        self,
+        client: AsyncClient,
+        monkeypatch,
+    ):
+        """Запрос без верного секретного токена — 403."""
+        monkeypatch.setattr(settings, "TELEGRAM_WEBHOOK_SECRET", "s3cret")
+
+        response = await client.post(
+            "/api/bot/webhook",
+            json=make_update(900001),
+            headers={"X-Telegram-Bot-Api-Secret-Token": "wrong"},
+        )
+        assert response.status_code == 403
+
+        response = await client.post(
+            "/api/bot/webhook",
+            json=make_update(900001),
+            headers={"X-Telegram-Bot-Api-Secret-Token": "s3cret"},
+        )
+        assert response.status_code == 200
+
+    async def test_redelivery_deduplicated(self, client: AsyncClient):
+        """Повторная доставка того же update_id не обрабатывается."""
+        before = ingestion.stats()
+
+        for _ in range(2):
+            response = await client.post("/api/bot/webhook", json=make_update(900002))
+            assert response.status_code == 200
+
+        after = ingestion.stats()
+        assert after["duplicates"] - before["duplicates"] == 1
+        assert after["processed"] - before["processed"] == 1
+
+
+class TestUpdateIngestion:
+    """Тесты очереди UpdateIngestion."""
+
+    async def test_full_queue_rejects_and_releases_update_id(self):
+        """При переполнении Update отклоняется, а повторная доставка принимается."""
+        queue = UpdateIngestion()
+        queue.start(workers=1, maxsize=1)
+        try:
+            assert await queue.submit(make_update(1)) == "queued"
+            assert await queue.submit(make_update(2)) == "rejected"
+            assert queue.stats()["rejected"] == 1
+        finally:
+            await queue.stop()
+
+        # Отклонённый update_id не считается дубликатом
+        assert await queue.submit(make_update(2)) == "processed"